@@ -0,0 +1,285 @@
+"""Baseline schema
+
+Revision ID: 23d79552b69b
+Revises: 
+Create Date: 2026-10-18 11:14:17.331010
+
+Databases created by Base.metadata.create_all before migrations existed are
+adopted rather than rejected: tables and indexes that already exist are
+skipped, the ones added since (content_changes, login_attempts,
+revoked_tokens and the lesson/exercise indexes) are created, and the
+revision is recorded as usual. `alembic upgrade head` therefore works on
+both empty and create_all-built databases; no manual stamp is needed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import pgvector.sqlalchemy
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23d79552b69b'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Enum types are created up front (if missing) rather than with the first
+# table using them, since a create_all-built database may already have them
+CHANGETYPE = postgresql.ENUM('CREATED', 'UPDATED', 'PUBLISHED', 'UNPUBLISHED', 'DELETED', name='changetype', create_type=False)
+EXERCISETYPE = postgresql.ENUM('CONVERSATION', 'VOCABULARY', 'MULTIPLE_CHOICE', 'LISTENING', 'TYPING', 'TRANSLATION', 'MATCHING', 'FILL_BLANK', 'SPEAKING', name='exercisetype', create_type=False)
+LANGUAGEPAIR = postgresql.ENUM('EN_AM', 'ZH_AM', 'FR_AM', 'DE_AM', 'ES_AM', 'AR_AM', 'PT_AM', 'RU_AM', 'JA_AM', 'IT_AM', 'HI_AM', name='languagepair', create_type=False)
+LESSONLEVEL = postgresql.ENUM('BEGINNER', 'ELEMENTARY', 'INTERMEDIATE', 'ADVANCED', 'EXPERT', name='lessonlevel', create_type=False)
+LESSONSTATUS = postgresql.ENUM('DRAFT', 'PUBLISHED', 'ARCHIVED', name='lessonstatus', create_type=False)
+PAYMENTPROVIDER = postgresql.ENUM('TELEBIRR', 'CBE', 'MANUAL', 'STRIPE', name='paymentprovider', create_type=False)
+PAYMENTSTATUS = postgresql.ENUM('PENDING', 'COMPLETED', 'FAILED', 'REFUNDED', 'CANCELLED', name='paymentstatus', create_type=False)
+USERROLE = postgresql.ENUM('USER', 'ADMIN', 'MODERATOR', name='userrole', create_type=False)
+USERSTATUS = postgresql.ENUM('ACTIVE', 'INACTIVE', 'BANNED', name='userstatus', create_type=False)
+ENUM_TYPES = (CHANGETYPE, EXERCISETYPE, LANGUAGEPAIR, LESSONLEVEL, LESSONSTATUS, PAYMENTPROVIDER, PAYMENTSTATUS, USERROLE, USERSTATUS)
+
+
+def _create_table(name: str, *elements, **kwargs) -> None:
+    """op.create_table, skipped if a create_all-built schema already has the table."""
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *elements, **kwargs)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    for enum_type in ENUM_TYPES:
+        enum_type.create(op.get_bind(), checkfirst=True)
+    _create_table('content_changes',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=False),
+    sa.Column('language_pair', LANGUAGEPAIR, nullable=False),
+    sa.Column('change_type', CHANGETYPE, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_content_changes_language_pair_id', 'content_changes', ['language_pair', 'id'], unique=False, if_not_exists=True)
+    _create_table('login_attempts',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('key', sa.String(length=320), nullable=False),
+    sa.Column('attempted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_login_attempts_attempted_at', 'login_attempts', ['attempted_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_login_attempts_key_attempted_at', 'login_attempts', ['key', 'attempted_at'], unique=False, if_not_exists=True)
+    _create_table('revoked_tokens',
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'], unique=False, if_not_exists=True)
+    _create_table('skills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('icon', sa.String(length=50), nullable=True),
+    sa.Column('color', sa.String(length=20), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.Column('language_pair', LANGUAGEPAIR, nullable=False),
+    sa.Column('level', LESSONLEVEL, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skills_id'), 'skills', ['id'], unique=False, if_not_exists=True)
+    _create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=True),
+    sa.Column('phone_number', sa.String(length=20), nullable=True),
+    sa.Column('role', USERROLE, nullable=False),
+    sa.Column('status', USERSTATUS, nullable=False),
+    sa.Column('is_subscribed', sa.Boolean(), nullable=False),
+    sa.Column('subscription_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('subscription_expires', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False, if_not_exists=True)
+    _create_table('kb_sources',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('tags', sa.String(length=500), nullable=True),
+    sa.Column('language', sa.String(length=5), nullable=False),
+    sa.Column('source_type', sa.String(length=50), nullable=False),
+    sa.Column('source_url', sa.String(length=1000), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('is_indexed', sa.Boolean(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_kb_sources_category'), 'kb_sources', ['category'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_kb_sources_id'), 'kb_sources', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_kb_sources_language'), 'kb_sources', ['language'], unique=False, if_not_exists=True)
+    _create_table('lessons',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('language_pair', LANGUAGEPAIR, nullable=False),
+    sa.Column('level', LESSONLEVEL, nullable=False),
+    sa.Column('unit_number', sa.Integer(), nullable=False),
+    sa.Column('lesson_number', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.Column('xp_reward', sa.Integer(), nullable=False),
+    sa.Column('estimated_minutes', sa.Integer(), nullable=False),
+    sa.Column('status', LESSONSTATUS, nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('updated_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('metadata', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_lessons_created_at_id', 'lessons', ['created_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_lessons_id'), 'lessons', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_lessons_slug'), 'lessons', ['slug'], unique=True, if_not_exists=True)
+    op.create_index('ix_lessons_slug_pattern', 'lessons', ['slug'], unique=False, postgresql_ops={'slug': 'text_pattern_ops'}, if_not_exists=True)
+    op.create_index('ix_lessons_status_pair_level_created_at_id', 'lessons', ['status', 'language_pair', 'level', 'created_at', 'id'], unique=False, if_not_exists=True)
+    _create_table('rag_queries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('query_text', sa.Text(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('response_text', sa.Text(), nullable=False),
+    sa.Column('sources_used', sa.Text(), nullable=True),
+    sa.Column('response_time_ms', sa.Integer(), nullable=True),
+    sa.Column('tokens_used', sa.Integer(), nullable=True),
+    sa.Column('is_flagged', sa.Boolean(), nullable=False),
+    sa.Column('flag_reason', sa.Text(), nullable=True),
+    sa.Column('user_feedback', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rag_queries_created_at'), 'rag_queries', ['created_at'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_rag_queries_id'), 'rag_queries', ['id'], unique=False, if_not_exists=True)
+    _create_table('subscriptions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('provider', PAYMENTPROVIDER, nullable=False),
+    sa.Column('provider_transaction_id', sa.String(length=255), nullable=True),
+    sa.Column('provider_reference', sa.String(length=255), nullable=True),
+    sa.Column('status', PAYMENTSTATUS, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('paid_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('metadata', sa.String(), nullable=True),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_subscriptions_id'), 'subscriptions', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_subscriptions_provider_transaction_id'), 'subscriptions', ['provider_transaction_id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_subscriptions_user_id'), 'subscriptions', ['user_id'], unique=False, if_not_exists=True)
+    _create_table('exercises',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=False),
+    sa.Column('type', EXERCISETYPE, nullable=False),
+    sa.Column('question', sa.Text(), nullable=False),
+    sa.Column('question_audio_url', sa.String(length=500), nullable=True),
+    sa.Column('question_image_url', sa.String(length=500), nullable=True),
+    sa.Column('answer_data', sa.JSON(), nullable=False),
+    sa.Column('hint', sa.Text(), nullable=True),
+    sa.Column('explanation', sa.Text(), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exercises_id'), 'exercises', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_exercises_lesson_id_order', 'exercises', ['lesson_id', 'order'], unique=False, if_not_exists=True)
+    _create_table('kb_embeddings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('chunk_text', sa.Text(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.Vector(dim=1536), nullable=False),
+    sa.Column('model_name', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['source_id'], ['kb_sources.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_kb_embeddings_id'), 'kb_embeddings', ['id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_kb_embeddings_source_id'), 'kb_embeddings', ['source_id'], unique=False, if_not_exists=True)
+    _create_table('conversation_dialogs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.Column('speaker', sa.String(length=100), nullable=False),
+    sa.Column('speaker_avatar', sa.String(length=200), nullable=True),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('translation', sa.Text(), nullable=True),
+    sa.Column('audio_url', sa.String(length=500), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_conversation_dialogs_exercise_id_order', 'conversation_dialogs', ['exercise_id', 'order'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_conversation_dialogs_id'), 'conversation_dialogs', ['id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_conversation_dialogs_id'), table_name='conversation_dialogs')
+    op.drop_index('ix_conversation_dialogs_exercise_id_order', table_name='conversation_dialogs')
+    op.drop_table('conversation_dialogs')
+    op.drop_index(op.f('ix_kb_embeddings_source_id'), table_name='kb_embeddings')
+    op.drop_index(op.f('ix_kb_embeddings_id'), table_name='kb_embeddings')
+    op.drop_table('kb_embeddings')
+    op.drop_index('ix_exercises_lesson_id_order', table_name='exercises')
+    op.drop_index(op.f('ix_exercises_id'), table_name='exercises')
+    op.drop_table('exercises')
+    op.drop_index(op.f('ix_subscriptions_user_id'), table_name='subscriptions')
+    op.drop_index(op.f('ix_subscriptions_provider_transaction_id'), table_name='subscriptions')
+    op.drop_index(op.f('ix_subscriptions_id'), table_name='subscriptions')
+    op.drop_table('subscriptions')
+    op.drop_index(op.f('ix_rag_queries_id'), table_name='rag_queries')
+    op.drop_index(op.f('ix_rag_queries_created_at'), table_name='rag_queries')
+    op.drop_table('rag_queries')
+    op.drop_index('ix_lessons_status_pair_level_created_at_id', table_name='lessons')
+    op.drop_index('ix_lessons_slug_pattern', table_name='lessons', postgresql_ops={'slug': 'text_pattern_ops'})
+    op.drop_index(op.f('ix_lessons_slug'), table_name='lessons')
+    op.drop_index(op.f('ix_lessons_id'), table_name='lessons')
+    op.drop_index('ix_lessons_created_at_id', table_name='lessons')
+    op.drop_table('lessons')
+    op.drop_index(op.f('ix_kb_sources_language'), table_name='kb_sources')
+    op.drop_index(op.f('ix_kb_sources_id'), table_name='kb_sources')
+    op.drop_index(op.f('ix_kb_sources_category'), table_name='kb_sources')
+    op.drop_table('kb_sources')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_skills_id'), table_name='skills')
+    op.drop_table('skills')
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_index('ix_login_attempts_key_attempted_at', table_name='login_attempts')
+    op.drop_index('ix_login_attempts_attempted_at', table_name='login_attempts')
+    op.drop_table('login_attempts')
+    op.drop_index('ix_content_changes_language_pair_id', table_name='content_changes')
+    op.drop_table('content_changes')
+    for enum_type in ENUM_TYPES:
+        enum_type.drop(op.get_bind(), checkfirst=True)
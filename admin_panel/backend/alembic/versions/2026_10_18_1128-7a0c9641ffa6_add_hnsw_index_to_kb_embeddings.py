@@ -0,0 +1,28 @@
+"""Add HNSW index to kb embeddings
+
+Revision ID: 7a0c9641ffa6
+Revises: 8489405e1a2a
+Create Date: 2026-10-18 11:28:21.354624
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a0c9641ffa6'
+down_revision: Union[str, None] = '8489405e1a2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so indexing and search keep working meanwhile; on
+    # a large table raise maintenance_work_mem first so the graph fits in memory
+    with op.get_context().autocommit_block():
+        op.create_index('ix_kb_embeddings_embedding_hnsw', 'kb_embeddings', ['embedding'], unique=False, postgresql_using='hnsw', postgresql_with={'m': 16, 'ef_construction': 64}, postgresql_ops={'embedding': 'vector_cosine_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kb_embeddings_embedding_hnsw', table_name='kb_embeddings')
@@ -0,0 +1,28 @@
+"""Add full-text index to kb embeddings
+
+Revision ID: af8cc236379a
+Revises: 7a0c9641ffa6
+Create Date: 2026-10-18 11:46:31.538011
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'af8cc236379a'
+down_revision: Union[str, None] = '7a0c9641ffa6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently, like the HNSW index, so writes carry on meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index('ix_kb_embeddings_chunk_text_fts', 'kb_embeddings', [sa.text("to_tsvector('simple', chunk_text)")], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kb_embeddings_chunk_text_fts', table_name='kb_embeddings', postgresql_using='gin')
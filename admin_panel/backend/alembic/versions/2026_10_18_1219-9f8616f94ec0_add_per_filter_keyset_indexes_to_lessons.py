@@ -0,0 +1,29 @@
+"""Add per-filter keyset indexes to lessons
+
+Revision ID: 9f8616f94ec0
+Revises: af8cc236379a
+Create Date: 2026-10-18 12:19:32.840456
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f8616f94ec0'
+down_revision: Union[str, None] = 'af8cc236379a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so lesson writes carry on meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index('ix_lessons_language_pair_created_at_id', 'lessons', ['language_pair', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_lessons_status_created_at_id', 'lessons', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lessons_status_created_at_id', table_name='lessons')
+    op.drop_index('ix_lessons_language_pair_created_at_id', table_name='lessons')
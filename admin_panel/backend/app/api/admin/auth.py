@@ -1,21 +1,25 @@
 """
 Admin authentication endpoints.
 """
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, EmailStr
 
 from app.core.database import get_db
 from app.core.security import (
-    verify_password,
-    hash_password,
+    REFRESH_TOKEN_TYPE,
     create_access_token,
     create_refresh_token,
+    decode_token,
     verify_admin_token,
 )
 from app.models.user import User, UserRole
+from app.services.login_throttle import login_keys, login_throttle
+from app.services.password_hashing import password_hasher
+from app.services.token_revocation import revocation_store
+from app.services.user_profiles import user_profiles
 
 
 router = APIRouter(prefix="/admin/auth", tags=["Admin Auth"])
@@ -36,6 +40,18 @@ class LoginResponse(BaseModel):
     user: dict
 
 
+class RefreshRequest(BaseModel):
+    """Token refresh request"""
+    refresh_token: str
+
+
+class TokenResponse(BaseModel):
+    """Rotated token pair"""
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
 class ChangePasswordRequest(BaseModel):
     """Change password request"""
     current_password: str
@@ -51,13 +67,24 @@ class MessageResponse(BaseModel):
 @router.post("/login", response_model=LoginResponse)
 async def admin_login(
     credentials: LoginRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Admin login endpoint.
     
     Validates credentials and returns JWT tokens if user is admin.
+    Attempts are throttled per email and per client IP before any lookup.
     """
+    throttle_keys = login_keys(credentials.email, request.client.host if request.client else None)
+    retry_after = await login_throttle.acquire(throttle_keys)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+    
     # Find user by email
     result = await db.execute(
         select(User).where(User.email == credentials.email)
@@ -71,7 +98,7 @@ async def admin_login(
         )
     
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    if not await password_hasher.verify(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -94,6 +121,9 @@ async def admin_login(
     # Update last login
     user.last_login = datetime.utcnow()
     await db.commit()
+    # Only the account's count is cleared: other clients behind the same IP
+    # (a NAT or proxy) keep theirs
+    await login_throttle.reset([key for key in throttle_keys if key.startswith("email:")])
     
     # Create tokens
     token_data = {
@@ -118,6 +148,58 @@ async def admin_login(
     )
 
 
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh_tokens(request: RefreshRequest):
+    """
+    Exchange a refresh token for a new access and refresh token.
+    
+    The presented refresh token is revoked as part of the exchange, so each
+    one can be used once; a replayed or concurrently reused token is rejected.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = decode_token(request.refresh_token)
+    jti = payload.get("jti")
+    if payload.get("type") != REFRESH_TOKEN_TYPE or not jti:
+        raise invalid
+    
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise invalid from e
+    
+    profile = await user_profiles.get(user_id)
+    if profile is None or not profile.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    if not profile.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    if not await revocation_store.revoke(jti, expires_at):
+        raise invalid
+    
+    token_data = {
+        "sub": str(profile.id),
+        "email": profile.email,
+        "role": profile.role.value
+    }
+    
+    return TokenResponse(
+        access_token=create_access_token(token_data),
+        refresh_token=create_refresh_token(token_data),
+    )
+
+
 @router.post("/change-password", response_model=MessageResponse)
 async def change_password(
     request: ChangePasswordRequest,
@@ -157,14 +239,14 @@ async def change_password(
         )
     
     # Verify current password
-    if not verify_password(request.current_password, user.hashed_password):
+    if not await password_hasher.verify(request.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
         )
     
     # Hash and update new password
-    user.hashed_password = hash_password(request.new_password)
+    user.hashed_password = await password_hasher.hash(request.new_password)
     user.updated_at = datetime.utcnow()
     
     await db.commit()
@@ -174,31 +256,28 @@ async def change_password(
 
 @router.get("/me")
 async def get_current_user(
-    token_data: dict = Depends(verify_admin_token),
-    db: AsyncSession = Depends(get_db)
+    token_data: dict = Depends(verify_admin_token)
 ):
     """
     Get current admin user information.
+    
+    Served from the user profile cache that verify_admin_token just filled.
     """
-    user_id = int(token_data["sub"])
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    profile = await user_profiles.get(int(token_data["sub"]))
     
-    if not user:
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
     return {
-        "id": user.id,
-        "email": user.email,
-        "full_name": user.full_name,
-        "role": user.role.value,
-        "status": user.status.value,
-        "is_subscribed": user.is_subscribed,
-        "created_at": user.created_at.isoformat(),
-        "last_login": user.last_login.isoformat() if user.last_login else None,
+        "id": profile.id,
+        "email": profile.email,
+        "full_name": profile.full_name,
+        "role": profile.role.value,
+        "status": profile.status.value,
+        "is_subscribed": profile.is_subscribed,
+        "created_at": profile.created_at.isoformat(),
+        "last_login": profile.last_login.isoformat() if profile.last_login else None,
     }
@@ -0,0 +1,153 @@
+"""
+Admin knowledge base endpoints.
+"""
+import time
+from functools import lru_cache
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+
+from app.core.database import get_db
+from app.core.security import verify_admin_token
+from app.services.embeddings import Embedder, create_embedder
+from app.services.hybrid_search import hybrid_search
+from app.services.knowledge_search import vector_search
+
+
+router = APIRouter(prefix="/admin/knowledge", tags=["Admin Knowledge"])
+
+
+@lru_cache(maxsize=1)
+def query_embedder() -> Embedder:
+    """Embedder for search queries, created on first use"""
+    return create_embedder()
+
+
+# Schemas
+class SearchRequest(BaseModel):
+    """Knowledge base search request"""
+    query: str = Field(min_length=1, max_length=2000)
+    k: int = Field(10, ge=1, le=100)
+    category: Optional[str] = None
+    language: Optional[str] = None
+    include_inactive: bool = False
+    # Per-request recall/latency trade-off: HNSW candidate list size and
+    # IVFFlat lists probed
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)
+    probes: Optional[int] = Field(None, ge=1, le=10000)
+
+
+class SearchHitResponse(BaseModel):
+    embedding_id: int
+    source_id: int
+    title: str
+    chunk_index: int
+    chunk_text: str
+    distance: float
+
+
+class SearchResponse(BaseModel):
+    hits: List[SearchHitResponse]
+    strategy: str
+    ef_search: Optional[int]
+    embed_ms: float
+    search_ms: float
+
+
+class HybridSearchRequest(BaseModel):
+    """Hybrid (full-text + vector) knowledge base search request"""
+    query: str = Field(min_length=1, max_length=2000)
+    k: int = Field(10, ge=1, le=100)
+    category: Optional[str] = None
+    language: Optional[str] = None
+    include_inactive: bool = False
+
+
+class HybridHitResponse(BaseModel):
+    embedding_id: int
+    source_id: int
+    title: str
+    chunk_index: int
+    chunk_text: str
+    score: float
+    vector_rank: Optional[int]
+    lexical_rank: Optional[int]
+    distance: Optional[float]
+
+
+class HybridSearchResponse(BaseModel):
+    hits: List[HybridHitResponse]
+    vector_strategy: str
+    embed_ms: float
+    vector_ms: float
+    lexical_ms: float
+    search_ms: float
+
+
+@router.post("/search", response_model=SearchResponse)
+async def search_knowledge(
+    request: SearchRequest,
+    db: AsyncSession = Depends(get_db),
+    token_data: dict = Depends(verify_admin_token)
+):
+    """
+    Top-k knowledge base chunks nearest to the query by cosine distance.
+    
+    strategy is "exact" when the filters matched too few chunks for the
+    index scan and the matching chunks were ranked exactly instead, and
+    "memory" when the in-process vector index answered (if it is enabled
+    and no inactive sources or index tuning were requested).
+    """
+    started = time.perf_counter()
+    embedder = query_embedder()
+    vector = (await embedder.embed([request.query]))[0]
+    embed_ms = (time.perf_counter() - started) * 1000
+    
+    result = await vector_search(
+        db,
+        vector,
+        k=request.k,
+        category=request.category,
+        language=request.language,
+        include_inactive=request.include_inactive,
+        ef_search=request.ef_search,
+        probes=request.probes,
+    )
+    return SearchResponse(
+        hits=[SearchHitResponse(**hit.__dict__) for hit in result.hits],
+        strategy=result.strategy,
+        ef_search=result.ef_search,
+        embed_ms=round(embed_ms, 3),
+        search_ms=round(result.elapsed_ms, 3),
+    )
+
+
+@router.post("/hybrid-search", response_model=HybridSearchResponse)
+async def hybrid_search_knowledge(
+    request: HybridSearchRequest,
+    token_data: dict = Depends(verify_admin_token)
+):
+    """
+    Top-k knowledge base chunks by full-text and vector search, fused by
+    reciprocal rank.
+    
+    The legs run concurrently: lexical_ms and embed_ms + vector_ms time
+    each leg, search_ms the whole search.
+    """
+    result = await hybrid_search(
+        request.query,
+        query_embedder(),
+        k=request.k,
+        category=request.category,
+        language=request.language,
+        include_inactive=request.include_inactive,
+    )
+    return HybridSearchResponse(
+        hits=[HybridHitResponse(**hit.__dict__) for hit in result.hits],
+        vector_strategy=result.vector_strategy,
+        embed_ms=round(result.embed_ms, 3),
+        vector_ms=round(result.vector_ms, 3),
+        lexical_ms=round(result.lexical_ms, 3),
+        search_ms=round(result.elapsed_ms, 3),
+    )
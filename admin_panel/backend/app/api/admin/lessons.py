@@ -1,23 +1,98 @@
 """
 Admin lesson management endpoints.
 """
-from typing import List, Optional
+import base64
+import binascii
+import json
+import re
+import zlib
+from collections import Counter
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from pydantic import BaseModel
+from sqlalchemy import (
+    Integer, String, select, func, insert, delete, update, literal, any_, or_, tuple_,
+    bindparam, text, exists,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from pydantic import BaseModel, ValidationError, model_validator
+from slugify import slugify
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db, get_read_db
 from app.core.security import verify_admin_token
 from app.models.lesson import (
     Lesson, Exercise, Skill, ConversationDialog,
-    LanguagePair, LessonLevel, LessonStatus, ExerciseType
+    LanguagePair, LessonLevel, LessonStatus, ExerciseType, ChangeType
 )
+from app.services.catalog import catalog_store
+from app.services.content_changes import record_lesson_changes
+from app.services.lesson_content import load_lesson_documents
 
 
 router = APIRouter(prefix="/admin/lessons", tags=["Admin Lessons"])
 
+# Attempts at allocating a free slug when creating a lesson. Each conflict
+# means a concurrent creator committed, so every round makes progress.
+CREATE_SLUG_ATTEMPTS = 10
+
+# Longest numeric slug suffix counted when picking the next one
+SLUG_SUFFIX_DIGITS = 18
+
+# Insert a draft lesson under the next free slug: the base if it is free,
+# otherwise base-N with N one more than the highest suffix in use (at least
+# 2). The prefix LIKE narrows via the text_pattern_ops index and the regex
+# keeps only numeric suffixes of up to SLUG_SUFFIX_DIGITS digits, so a title
+# ending in a long number can't overflow the bigint. On a conflict with a
+# concurrent insert nothing is written and no row is returned, so the caller
+# retries. Written as text because SQLAlchemy does not cache compiled
+# ON CONFLICT inserts.
+CREATE_LESSON_SQL = text("""
+    INSERT INTO lessons (
+        title, description, language_pair, level, unit_number, lesson_number,
+        skill_id, "order", xp_reward, estimated_minutes, status, created_by,
+        version, slug
+    )
+    SELECT
+        :title, :description, :language_pair, :level, :unit_number, :lesson_number,
+        :skill_id, :order, :xp_reward, :estimated_minutes, :status, :created_by,
+        :version,
+        CASE
+            WHEN NOT EXISTS (SELECT 1 FROM lessons WHERE slug = :base_slug) THEN :base_slug
+            ELSE :base_slug || '-' || (
+                SELECT coalesce(max(substring(slug FROM :slug_pattern)::bigint), 1) + 1
+                FROM lessons
+                WHERE slug LIKE :slug_prefix AND slug ~ :slug_pattern
+            )
+        END
+    ON CONFLICT (slug) DO NOTHING
+    RETURNING id, slug, created_at
+""").bindparams(
+    *(
+        bindparam(name, type_=Lesson.__table__.c[name].type)
+        for name in (
+            "title", "description", "language_pair", "level", "unit_number",
+            "lesson_number", "skill_id", "order", "xp_reward", "estimated_minutes",
+            "status", "created_by", "version",
+        )
+    ),
+    bindparam("base_slug", type_=String),
+    bindparam("slug_prefix", type_=String),
+    bindparam("slug_pattern", type_=String),
+)
+
+# Lessons per bulk import transaction
+BULK_LESSON_BATCH_SIZE = 500
+# Longest NDJSON line accepted by the bulk import; the rest of a longer
+# line is discarded as it arrives rather than buffered
+BULK_MAX_LINE_BYTES = 1024 * 1024
+
+# Lessons fetched per server-side cursor batch during export
+EXPORT_BATCH_SIZE = 200
+
 
 # Schemas
 class ExerciseCreate(BaseModel):
@@ -67,56 +142,582 @@ class LessonResponse(BaseModel):
     published_at: Optional[str]
 
 
-@router.get("/", response_model=List[LessonResponse])
-async def list_lessons(
-    skip: int = 0,
-    limit: int = 50,
+class LessonPage(BaseModel):
+    items: List[LessonResponse]
+    next_cursor: Optional[str]
+
+
+class DialogResponse(BaseModel):
+    id: int
+    speaker: str
+    speaker_avatar: Optional[str]
+    text: str
+    translation: Optional[str]
+    audio_url: Optional[str]
+    order: int
+
+
+class ExerciseResponse(BaseModel):
+    id: int
+    type: str
+    question: str
+    question_audio_url: Optional[str]
+    question_image_url: Optional[str]
+    answer_data: dict
+    hint: Optional[str]
+    explanation: Optional[str]
+    order: int
+    dialogs: List[DialogResponse]
+
+
+class LessonDetailResponse(LessonResponse):
+    unit_number: int
+    lesson_number: int
+    skill_id: Optional[int]
+    order: int
+    version: int
+    updated_at: str
+    exercises: List[ExerciseResponse]
+
+
+class LessonFilter(BaseModel):
+    status: Optional[LessonStatus] = None
+    language_pair: Optional[LanguagePair] = None
+    level: Optional[LessonLevel] = None
+    
+    @property
+    def is_empty(self) -> bool:
+        return self.status is None and self.language_pair is None and self.level is None
+
+
+class BatchLessonRequest(BaseModel):
+    """Target lessons either by id or by filter"""
+    ids: Optional[List[int]] = None
+    filter: Optional[LessonFilter] = None
+    
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of ids or filter")
+        if self.ids is not None and not self.ids:
+            raise ValueError("ids must not be empty")
+        if self.filter is not None and self.filter.is_empty:
+            raise ValueError("filter must set at least one field")
+        return self
+
+
+class BatchLessonResult(BaseModel):
+    lesson_id: int
+    outcome: str
+
+
+class BatchLessonResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchLessonResult]
+
+
+class BulkImportLine(BaseModel):
+    line: int
+    lesson_id: Optional[int] = None
+    slug: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkImportResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkImportLine]
+
+
+def _lesson_response(lesson: Lesson, exercise_count: int) -> LessonResponse:
+    """Build the API representation of a lesson."""
+    return LessonResponse(
+        id=lesson.id,
+        title=lesson.title,
+        description=lesson.description,
+        slug=lesson.slug,
+        language_pair=lesson.language_pair.value,
+        level=lesson.level.value,
+        status=lesson.status.value,
+        xp_reward=lesson.xp_reward,
+        estimated_minutes=lesson.estimated_minutes,
+        exercise_count=exercise_count,
+        created_at=lesson.created_at.isoformat(),
+        published_at=lesson.published_at.isoformat() if lesson.published_at else None
+    )
+
+
+def _exercise_count_column():
+    """Correlated exercise count so listings stay a single round trip."""
+    return (
+        select(func.count(Exercise.id))
+        .where(Exercise.lesson_id == Lesson.id)
+        .correlate(Lesson)
+        .scalar_subquery()
+        .label("exercise_count")
+    )
+
+
+def _filter_lessons(
+    query,
     status: Optional[LessonStatus] = None,
     language_pair: Optional[LanguagePair] = None,
     level: Optional[LessonLevel] = None,
-    token_data: dict = Depends(verify_admin_token),
-    db: AsyncSession = Depends(get_db)
 ):
-    """List all lessons with filtering options."""
-    query = select(Lesson)
-    
+    """Apply the optional listing filters to a lesson query."""
     if status:
         query = query.where(Lesson.status == status)
     if language_pair:
         query = query.where(Lesson.language_pair == language_pair)
     if level:
         query = query.where(Lesson.level == level)
+    return query
+
+
+def _encode_cursor(lesson: Lesson) -> str:
+    """Encode the (created_at, id) position of a lesson as an opaque cursor."""
+    raw = json.dumps([lesson.created_at.isoformat(), lesson.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, lesson_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(lesson_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from e
+
+
+def _lesson_row(data: LessonCreate, slug: str, user_id: int) -> dict:
+    """Column values for inserting a new draft lesson."""
+    return {
+        "title": data.title,
+        "description": data.description,
+        "slug": slug,
+        "language_pair": data.language_pair,
+        "level": data.level,
+        "unit_number": data.unit_number,
+        "lesson_number": data.lesson_number,
+        "skill_id": data.skill_id,
+        "order": 0,
+        "xp_reward": data.xp_reward,
+        "estimated_minutes": data.estimated_minutes,
+        "status": LessonStatus.DRAFT,
+        "created_by": user_id,
+        "version": 1,
+    }
+
+
+def _exercise_row(exercise: ExerciseCreate, lesson_id: int) -> dict:
+    """Column values for inserting an exercise."""
+    return {
+        "lesson_id": lesson_id,
+        "type": exercise.type,
+        "question": exercise.question,
+        "question_audio_url": exercise.question_audio_url,
+        "question_image_url": exercise.question_image_url,
+        "answer_data": exercise.answer_data,
+        "hint": exercise.hint,
+        "explanation": exercise.explanation,
+        "order": exercise.order,
+    }
+
+
+def _create_lesson_params(data: LessonCreate, base_slug: str, user_id: int) -> dict:
+    """Bind parameters for CREATE_LESSON_SQL."""
+    params = _lesson_row(data, base_slug, user_id)
+    del params["slug"]
+    params.update(
+        base_slug=base_slug,
+        slug_prefix=f"{base_slug}-%",
+        slug_pattern=f"^{base_slug}-([0-9]{{1,{SLUG_SUFFIX_DIGITS}}})$",
+    )
+    return params
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, Optional[str], Optional[str]]]:
+    """
+    Yield (line_number, text, error) for each non-blank line of a streamed NDJSON body.
+    
+    Lines that aren't valid UTF-8 or are longer than BULK_MAX_LINE_BYTES
+    come with text None and the error to report for them.
+    """
+    too_long = f"Line longer than {BULK_MAX_LINE_BYTES} bytes"
+    
+    def decode(line: bytes) -> Tuple[Optional[str], Optional[str]]:
+        if len(line) > BULK_MAX_LINE_BYTES:
+            return None, too_long
+        try:
+            return line.decode("utf-8"), None
+        except UnicodeDecodeError:
+            return None, "invalid UTF-8"
+    
+    buffer = b""
+    line_number = 0
+    # Set while discarding the rest of an oversize line
+    oversize = False
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            if oversize:
+                oversize = False
+                yield line_number, None, too_long
+            elif line.strip():
+                yield line_number, *decode(line)
+        if oversize or len(buffer) > BULK_MAX_LINE_BYTES:
+            oversize, buffer = True, b""
+    if oversize:
+        yield line_number + 1, None, too_long
+    elif buffer.strip():
+        yield line_number + 1, *decode(buffer)
+
+
+SLUG_SUFFIX_PATTERN = re.compile(rf"^(.+)-([0-9]{{1,{SLUG_SUFFIX_DIGITS}}})$")
+
+
+async def _allocate_slugs(
+    db: AsyncSession,
+    titles: Iterable[str],
+    reserved: Set[str],
+) -> List[str]:
+    """
+    Allocate unique slugs for a batch of titles in one set-based pass.
+    
+    Follows the same rule as CREATE_LESSON_SQL: the base if it is free,
+    otherwise base-N, N being one more than the highest suffix in use.
+    Candidates already handed out in this import are skipped, so every
+    slug returned is distinct. Allocated slugs are added to reserved.
+    """
+    bases = [slugify(title) or "lesson" for title in titles]
+    unique_bases = set(bases)
+    
+    existing = await db.execute(select(Lesson.slug).where(Lesson.slug.in_(unique_bases)))
+    taken = set(existing.scalars().all())
+    
+    # Only bases that collide (with the database, earlier batches or each
+    # other) need their suffixed variants looked up
+    repeated = Counter(bases)
+    colliding = {
+        base for base in unique_bases
+        if base in taken or base in reserved or repeated[base] > 1
+    }
+    if colliding:
+        suffixed = await db.execute(
+            select(Lesson.slug).where(
+                or_(*(Lesson.slug.like(f"{base}-%") for base in colliding))
+            )
+        )
+        taken.update(suffixed.scalars().all())
     
+    used = taken | reserved
+    highest: Dict[str, int] = {}
+    for slug in used:
+        # A slug can be both a base ("unit-2") and a suffixed variant of
+        # another base ("unit")
+        match = SLUG_SUFFIX_PATTERN.match(slug)
+        if match and match.group(1) in unique_bases:
+            base, suffix = match.group(1), int(match.group(2))
+            highest[base] = max(highest.get(base, 1), suffix)
+    
+    slugs = []
+    for base in bases:
+        slug = base
+        if slug in used:
+            suffix = highest.get(base, 1) + 1
+            while f"{base}-{suffix}" in used:
+                suffix += 1
+            highest[base] = suffix
+            slug = f"{base}-{suffix}"
+        used.add(slug)
+        reserved.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+async def _insert_lesson_batch(
+    db: AsyncSession,
+    batch: List[Tuple[int, LessonCreate]],
+    user_id: int,
+    reserved_slugs: Set[str],
+) -> List[BulkImportLine]:
+    """Insert a batch of validated lessons and their exercises."""
+    if not batch:
+        return []
+    
+    slugs = await _allocate_slugs(db, (data.title for _, data in batch), reserved_slugs)
+    
+    lesson_rows = [
+        _lesson_row(data, slug, user_id) for (_, data), slug in zip(batch, slugs)
+    ]
+    
+    # A concurrent writer may claim a slug between allocation and insert;
+    # those rows are skipped and reported instead of failing the batch.
+    # Slugs are distinct within the batch, so each returned slug identifies
+    # exactly one import line.
+    line_by_slug = {slug: line for (line, _), slug in zip(batch, slugs)}
+    result = await db.execute(
+        pg_insert(Lesson)
+        .on_conflict_do_nothing(index_elements=[Lesson.slug])
+        .returning(Lesson.id, Lesson.slug),
+        lesson_rows,
+    )
+    ids_by_line: Dict[int, int] = {line_by_slug[slug]: lesson_id for lesson_id, slug in result.all()}
+    
+    exercise_rows = [
+        _exercise_row(exercise, ids_by_line[line])
+        for line, data in batch
+        if line in ids_by_line
+        for exercise in data.exercises
+    ]
+    if exercise_rows:
+        await db.execute(insert(Exercise), exercise_rows)
+    
+    await record_lesson_changes(
+        db,
+        (
+            (ids_by_line[line], data.language_pair)
+            for line, data in batch
+            if line in ids_by_line
+        ),
+        ChangeType.CREATED,
+    )
+    await db.commit()
+    
+    return [
+        BulkImportLine(line=line, lesson_id=ids_by_line[line], slug=slug)
+        if line in ids_by_line
+        else BulkImportLine(line=line, error=f"Slug '{slug}' was taken concurrently")
+        for (line, _), slug in zip(batch, slugs)
+    ]
+
+
+async def _import_lesson_batch(
+    db: AsyncSession,
+    batch: List[Tuple[int, LessonCreate]],
+    user_id: int,
+    reserved_slugs: Set[str],
+) -> List[BulkImportLine]:
+    """
+    Check a batch's skill references with one query, then insert it.
+    
+    If the insert still violates a constraint, fall back to line-by-line
+    inserts so only the offending lines fail.
+    """
+    results = []
+    skill_ids = {data.skill_id for _, data in batch if data.skill_id is not None}
+    if skill_ids:
+        known = await db.execute(select(Skill.id).where(Skill.id.in_(skill_ids)))
+        unknown = skill_ids - set(known.scalars().all())
+        results.extend(
+            BulkImportLine(line=line, error=f"Unknown skill_id {data.skill_id}")
+            for line, data in batch if data.skill_id in unknown
+        )
+        batch = [(line, data) for line, data in batch if data.skill_id not in unknown]
+    
+    snapshot = set(reserved_slugs)
+    try:
+        return results + await _insert_lesson_batch(db, batch, user_id, reserved_slugs)
+    except IntegrityError:
+        await db.rollback()
+        reserved_slugs.clear()
+        reserved_slugs.update(snapshot)
+    
+    for item in batch:
+        try:
+            results.extend(await _insert_lesson_batch(db, [item], user_id, reserved_slugs))
+        except IntegrityError:
+            await db.rollback()
+            results.append(BulkImportLine(
+                line=item[0],
+                error="Rejected by a database constraint"
+            ))
+    return results
+
+
+async def _export_lessons(
+    status: Optional[LessonStatus],
+    language_pair: Optional[LanguagePair],
+    level: Optional[LessonLevel],
+    compress: bool,
+) -> AsyncIterator[bytes]:
+    """
+    Stream lessons as NDJSON from a server-side cursor.
+    
+    Uses its own session because request-scoped dependencies are closed
+    before a streaming response body is sent.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    
+    async with AsyncSessionLocal() as db:
+        query = _filter_lessons(select(Lesson), status, language_pair, level)
+        result = await db.stream(
+            query.order_by(Lesson.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for lessons in result.scalars().partitions():
+            chunk = b"".join(
+                json.dumps(document, ensure_ascii=False).encode("utf-8") + b"\n"
+                for document in await load_lesson_documents(db, lessons)
+            )
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    
+    if compressor:
+        yield compressor.flush()
+
+
+@router.get("/", response_model=List[LessonResponse])
+async def list_lessons(
+    skip: int = 0,
+    limit: int = 50,
+    status: Optional[LessonStatus] = None,
+    language_pair: Optional[LanguagePair] = None,
+    level: Optional[LessonLevel] = None,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List all lessons with filtering options."""
+    query = _filter_lessons(
+        select(Lesson, _exercise_count_column()), status, language_pair, level
+    )
     query = query.offset(skip).limit(limit).order_by(Lesson.created_at.desc())
     
     result = await db.execute(query)
-    lessons = result.scalars().all()
     
-    response = []
-    for lesson in lessons:
-        # Count exercises
-        exercise_count_query = select(func.count(Exercise.id)).where(
-            Exercise.lesson_id == lesson.id
+    return [
+        _lesson_response(lesson, exercise_count)
+        for lesson, exercise_count in result.all()
+    ]
+
+
+@router.get("/page", response_model=LessonPage)
+async def list_lessons_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[LessonStatus] = None,
+    language_pair: Optional[LanguagePair] = None,
+    level: Optional[LessonLevel] = None,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List lessons with keyset pagination.
+    
+    Pass the returned next_cursor back as cursor to fetch the following page;
+    next_cursor is null on the last page.
+    """
+    query = _filter_lessons(
+        select(Lesson, _exercise_count_column()), status, language_pair, level
+    )
+    if cursor:
+        query = query.where(
+            tuple_(Lesson.created_at, Lesson.id) < tuple_(*_decode_cursor(cursor))
         )
-        exercise_count_result = await db.execute(exercise_count_query)
-        exercise_count = exercise_count_result.scalar()
-        
-        response.append(LessonResponse(
-            id=lesson.id,
-            title=lesson.title,
-            description=lesson.description,
-            slug=lesson.slug,
-            language_pair=lesson.language_pair.value,
-            level=lesson.level.value,
-            status=lesson.status.value,
-            xp_reward=lesson.xp_reward,
-            estimated_minutes=lesson.estimated_minutes,
-            exercise_count=exercise_count,
-            created_at=lesson.created_at.isoformat(),
-            published_at=lesson.published_at.isoformat() if lesson.published_at else None
-        ))
-    
-    return response
+    query = query.order_by(Lesson.created_at.desc(), Lesson.id.desc()).limit(limit + 1)
+    
+    result = await db.execute(query)
+    rows = result.all()
+    
+    next_cursor = _encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+    
+    return LessonPage(
+        items=[
+            _lesson_response(lesson, exercise_count)
+            for lesson, exercise_count in rows[:limit]
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/export")
+async def export_lessons(
+    status: Optional[LessonStatus] = None,
+    language_pair: Optional[LanguagePair] = None,
+    level: Optional[LessonLevel] = None,
+    gzip: bool = False,
+    token_data: dict = Depends(verify_admin_token),
+):
+    """
+    Export lessons with their exercises and conversation dialogs.
+    
+    Streams one JSON document per lesson (NDJSON), gzip-compressed when
+    gzip=true. Exported lines can be fed back to POST /admin/lessons/bulk.
+    """
+    filename = "lessons.ndjson.gz" if gzip else "lessons.ndjson"
+    return StreamingResponse(
+        _export_lessons(status, language_pair, level, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/{lesson_id}", response_model=LessonDetailResponse)
+async def get_lesson(
+    lesson_id: int,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a lesson with its exercises and conversation dialogs.
+    
+    Loads in three queries: the lesson, its exercises and their dialogs.
+    """
+    result = await db.execute(
+        select(Lesson)
+        .where(Lesson.id == lesson_id)
+        .options(selectinload(Lesson.exercises).selectinload(Exercise.dialogs))
+    )
+    lesson = result.scalar_one_or_none()
+    
+    if not lesson:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson not found"
+        )
+    
+    return LessonDetailResponse(
+        **_lesson_response(lesson, len(lesson.exercises)).model_dump(),
+        unit_number=lesson.unit_number,
+        lesson_number=lesson.lesson_number,
+        skill_id=lesson.skill_id,
+        order=lesson.order,
+        version=lesson.version,
+        updated_at=lesson.updated_at.isoformat(),
+        exercises=[
+            ExerciseResponse(
+                id=exercise.id,
+                type=exercise.type.value,
+                question=exercise.question,
+                question_audio_url=exercise.question_audio_url,
+                question_image_url=exercise.question_image_url,
+                answer_data=exercise.answer_data,
+                hint=exercise.hint,
+                explanation=exercise.explanation,
+                order=exercise.order,
+                dialogs=[
+                    DialogResponse(
+                        id=dialog.id,
+                        speaker=dialog.speaker,
+                        speaker_avatar=dialog.speaker_avatar,
+                        text=dialog.text,
+                        translation=dialog.translation,
+                        audio_url=dialog.audio_url,
+                        order=dialog.order,
+                    )
+                    for dialog in exercise.dialogs
+                ],
+            )
+            for exercise in lesson.exercises
+        ],
+    )
 
 
 @router.post("/", response_model=LessonResponse)
@@ -125,75 +726,244 @@ async def create_lesson(
     token_data: dict = Depends(verify_admin_token),
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new lesson with exercises."""
-    from slugify import slugify
+    """
+    Create a new lesson with exercises.
     
+    The slug is allocated by the insert itself, so concurrent editors
+    creating lessons with the same title get distinct -2, -3, ... slugs
+    instead of racing. Exercises follow in one multi-row insert.
+    """
     user_id = int(token_data["sub"])
+    base_slug = slugify(lesson_data.title) or "lesson"
     
-    # Generate slug
-    slug = slugify(lesson_data.title)
+    for _ in range(CREATE_SLUG_ATTEMPTS):
+        result = await db.execute(
+            CREATE_LESSON_SQL, _create_lesson_params(lesson_data, base_slug, user_id)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            break
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Could not allocate a unique slug, please retry"
+        )
     
-    # Check if slug exists
-    existing = await db.execute(
-        select(Lesson).where(Lesson.slug == slug)
-    )
-    if existing.scalar_one_or_none():
-        slug = f"{slug}-{datetime.now().timestamp()}"
+    if lesson_data.exercises:
+        await db.execute(
+            insert(Exercise),
+            [_exercise_row(exercise, row.id) for exercise in lesson_data.exercises],
+        )
     
-    # Create lesson
     lesson = Lesson(
-        title=lesson_data.title,
-        description=lesson_data.description,
-        slug=slug,
-        language_pair=lesson_data.language_pair,
-        level=lesson_data.level,
-        unit_number=lesson_data.unit_number,
-        lesson_number=lesson_data.lesson_number,
-        skill_id=lesson_data.skill_id,
-        xp_reward=lesson_data.xp_reward,
-        estimated_minutes=lesson_data.estimated_minutes,
-        status=LessonStatus.DRAFT,
-        created_by=user_id,
-        version=1
+        **_lesson_row(lesson_data, row.slug, user_id),
+        id=row.id,
+        created_at=row.created_at,
     )
     
-    db.add(lesson)
-    await db.flush()  # Get lesson ID
-    
-    # Create exercises
-    for exercise_data in lesson_data.exercises:
-        exercise = Exercise(
-            lesson_id=lesson.id,
-            type=exercise_data.type,
-            question=exercise_data.question,
-            question_audio_url=exercise_data.question_audio_url,
-            question_image_url=exercise_data.question_image_url,
-            answer_data=exercise_data.answer_data,
-            hint=exercise_data.hint,
-            explanation=exercise_data.explanation,
-            order=exercise_data.order
-        )
-        db.add(exercise)
+    await record_lesson_changes(db, [(lesson.id, lesson.language_pair)], ChangeType.CREATED)
+    await db.commit()
     
+    return _lesson_response(lesson, len(lesson_data.exercises))
+
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_import_lessons(
+    request: Request,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import lessons from a streamed NDJSON body.
+    
+    Each line is a LessonCreate document. Lines are validated as they
+    arrive and written in batches of multi-row inserts, one transaction per
+    batch. Lines that fail validation are reported and do not affect the
+    rest of the import.
+    """
+    user_id = int(token_data["sub"])
+    reserved_slugs: Set[str] = set()
+    results: List[BulkImportLine] = []
+    batch: List[Tuple[int, LessonCreate]] = []
+    
+    async for line_number, line, error in _iter_ndjson_lines(request):
+        if error is not None:
+            results.append(BulkImportLine(line=line_number, error=error))
+            continue
+        try:
+            batch.append((line_number, LessonCreate.model_validate_json(line)))
+        except ValidationError as e:
+            results.append(BulkImportLine(
+                line=line_number,
+                error="; ".join(
+                    ".".join(str(loc) for loc in err["loc"]) + ": " + err["msg"]
+                    if err["loc"] else err["msg"]
+                    for err in e.errors()
+                )
+            ))
+            continue
+        
+        if len(batch) >= BULK_LESSON_BATCH_SIZE:
+            results.extend(await _import_lesson_batch(db, batch, user_id, reserved_slugs))
+            batch = []
+    
+    if batch:
+        results.extend(await _import_lesson_batch(db, batch, user_id, reserved_slugs))
+    
+    results.sort(key=lambda item: item.line)
+    created = sum(1 for item in results if item.error is None)
+    
+    return BulkImportResponse(
+        created=created,
+        failed=len(results) - created,
+        results=results,
+    )
+
+
+def _lesson_id_in(ids: List[int]):
+    """Lesson.id = ANY(:ids), bound as one array parameter."""
+    return Lesson.id == any_(literal(ids, ARRAY(Integer)))
+
+
+def _batch_target(statement, batch: BatchLessonRequest):
+    """Restrict a select/update/delete to the lessons a batch request targets."""
+    if batch.ids is not None:
+        return statement.where(_lesson_id_in(batch.ids))
+    # An empty filter would target every lesson
+    if batch.filter is None or batch.filter.is_empty:
+        raise ValueError("Batch request targets no lessons")
+    return _filter_lessons(
+        statement,
+        batch.filter.status,
+        batch.filter.language_pair,
+        batch.filter.level,
+    )
+
+
+async def _finish_batch(
+    db: AsyncSession,
+    batch: BatchLessonRequest,
+    changed: List[Tuple[int, LanguagePair]],
+    change_type: ChangeType,
+    outcome: str,
+    failures: Optional[Dict[int, str]] = None,
+    unchanged: Optional[str] = None,
+) -> BatchLessonResponse:
+    """
+    Log and commit a batch operation, refresh catalogs and report per-id outcomes.
+    
+    Requested ids that weren't changed are reported as `unchanged` if the
+    lesson exists (when given), otherwise as not_found.
+    """
+    await record_lesson_changes(db, changed, change_type)
     await db.commit()
-    await db.refresh(lesson)
+    for language_pair in {language_pair for _, language_pair in changed}:
+        await catalog_store.refresh(db, language_pair)
     
-    return LessonResponse(
-        id=lesson.id,
-        title=lesson.title,
-        description=lesson.description,
-        slug=lesson.slug,
-        language_pair=lesson.language_pair.value,
-        level=lesson.level.value,
-        status=lesson.status.value,
-        xp_reward=lesson.xp_reward,
-        estimated_minutes=lesson.estimated_minutes,
-        exercise_count=len(lesson_data.exercises),
-        created_at=lesson.created_at.isoformat(),
-        published_at=None
+    outcomes = dict(failures or {})
+    outcomes.update((lesson_id, outcome) for lesson_id, _ in changed)
+    missing = [lesson_id for lesson_id in batch.ids or [] if lesson_id not in outcomes]
+    if missing and unchanged:
+        found = await db.scalars(select(Lesson.id).where(_lesson_id_in(missing)))
+        outcomes.update((lesson_id, unchanged) for lesson_id in found)
+    for lesson_id in missing:
+        outcomes.setdefault(lesson_id, "not_found")
+    
+    return BatchLessonResponse(
+        succeeded=len(changed),
+        failed=len(outcomes) - len(changed),
+        results=[
+            BatchLessonResult(lesson_id=lesson_id, outcome=lesson_outcome)
+            for lesson_id, lesson_outcome in sorted(outcomes.items())
+        ],
+    )
+
+
+@router.post("/batch/publish", response_model=BatchLessonResponse)
+async def batch_publish_lessons(
+    batch: BatchLessonRequest,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Publish many lessons at once.
+    
+    Unpublished lessons with exercises are published with one UPDATE,
+    which returns the rows it changed; lessons skipped for having no
+    exercises are then looked up for the report.
+    """
+    has_exercises = exists().where(Exercise.lesson_id == Lesson.id)
+    result = await db.execute(_batch_target(
+        update(Lesson)
+        .where(Lesson.status != LessonStatus.PUBLISHED, has_exercises)
+        .values(
+            status=LessonStatus.PUBLISHED,
+            published_at=datetime.utcnow(),
+            updated_by=int(token_data["sub"]),
+        )
+        .returning(Lesson.id, Lesson.language_pair)
+        .execution_options(synchronize_session=False),
+        batch,
+    ))
+    changed = [tuple(row) for row in result.all()]
+    
+    no_exercises = await db.scalars(_batch_target(
+        select(Lesson.id).where(Lesson.status != LessonStatus.PUBLISHED, ~has_exercises),
+        batch,
+    ))
+    
+    return await _finish_batch(
+        db, batch, changed, ChangeType.PUBLISHED, "published",
+        failures={lesson_id: "no_exercises" for lesson_id in no_exercises},
+        unchanged="already_published",
     )
 
 
+@router.post("/batch/unpublish", response_model=BatchLessonResponse)
+async def batch_unpublish_lessons(
+    batch: BatchLessonRequest,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_db)
+):
+    """Unpublish many published lessons with one UPDATE."""
+    result = await db.execute(_batch_target(
+        update(Lesson)
+        .where(Lesson.status == LessonStatus.PUBLISHED)
+        .values(status=LessonStatus.DRAFT, updated_by=int(token_data["sub"]))
+        .returning(Lesson.id, Lesson.language_pair)
+        .execution_options(synchronize_session=False),
+        batch,
+    ))
+    changed = [tuple(row) for row in result.all()]
+    
+    return await _finish_batch(
+        db, batch, changed, ChangeType.UNPUBLISHED, "unpublished", unchanged="not_published",
+    )
+
+
+@router.post("/batch/delete", response_model=BatchLessonResponse)
+async def batch_delete_lessons(
+    batch: BatchLessonRequest,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete many lessons with one DELETE.
+    
+    Exercises and dialogs are removed by the database's cascading foreign
+    keys, without loading them.
+    """
+    result = await db.execute(_batch_target(
+        delete(Lesson)
+        .returning(Lesson.id, Lesson.language_pair)
+        .execution_options(synchronize_session=False),
+        batch,
+    ))
+    changed = [tuple(row) for row in result.all()]
+    
+    return await _finish_batch(db, batch, changed, ChangeType.DELETED, "deleted")
+
+
 @router.post("/{lesson_id}/publish")
 async def publish_lesson(
     lesson_id: int,
@@ -226,7 +996,9 @@ async def publish_lesson(
     lesson.published_at = datetime.utcnow()
     lesson.updated_by = int(token_data["sub"])
     
+    await record_lesson_changes(db, [(lesson.id, lesson.language_pair)], ChangeType.PUBLISHED)
     await db.commit()
+    await catalog_store.refresh(db, lesson.language_pair)
     
     return {"message": "Lesson published successfully", "lesson_id": lesson.id}
 
@@ -252,7 +1024,9 @@ async def unpublish_lesson(
     lesson.status = LessonStatus.DRAFT
     lesson.updated_by = int(token_data["sub"])
     
+    await record_lesson_changes(db, [(lesson.id, lesson.language_pair)], ChangeType.UNPUBLISHED)
     await db.commit()
+    await catalog_store.refresh(db, lesson.language_pair)
     
     return {"message": "Lesson unpublished successfully"}
 
@@ -276,6 +1050,8 @@ async def delete_lesson(
         )
     
     await db.delete(lesson)
+    await record_lesson_changes(db, [(lesson_id, lesson.language_pair)], ChangeType.DELETED)
     await db.commit()
+    await catalog_store.refresh(db, lesson.language_pair)
     
     return {"message": "Lesson deleted successfully"}
@@ -0,0 +1,57 @@
+"""
+Admin runtime metrics endpoint.
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.database import pool_metrics
+from app.core.query_log import query_log
+from app.core.rate_limit import request_limiter
+from app.core.security import token_cache, verify_admin_token
+from app.services.login_throttle import login_throttle
+from app.services.password_hashing import password_hasher
+from app.services.token_revocation import revocation_store
+from app.services.user_profiles import user_profiles
+from app.services.vector_index import vector_index
+
+
+router = APIRouter(prefix="/admin/metrics", tags=["Admin Metrics"])
+
+
+@router.get("")
+async def get_metrics(token_data: dict = Depends(verify_admin_token)):
+    """
+    In-process metrics for the worker serving this request.
+    
+    Timings are histograms in milliseconds with cumulative bucket counts.
+    """
+    return {
+        "database_pool": pool_metrics(),
+        "queries": query_log.metrics(),
+        "password_hashing": password_hasher.metrics(),
+        "login_throttle": login_throttle.metrics(),
+        "rate_limit": request_limiter.metrics(),
+        "user_profiles": user_profiles.metrics(),
+        "token_cache": token_cache.metrics(),
+        "token_revocation": revocation_store.metrics(),
+        "vector_index": vector_index.metrics(),
+    }
+
+
+@router.get("/queries")
+async def get_query_stats(
+    order_by: Literal["total_ms", "count", "p95_ms", "max_ms", "slow"] = "total_ms",
+    limit: int = Query(50, ge=1, le=500),
+    token_data: dict = Depends(verify_admin_token)
+):
+    """
+    Per-fingerprint statement statistics for this worker.
+    
+    Fingerprints are SQL with literals and parameters normalized away;
+    p95_ms is the upper bound of the histogram bucket it falls in.
+    """
+    return {
+        **query_log.metrics(),
+        "queries": query_log.top(order_by=order_by, limit=limit),
+    }
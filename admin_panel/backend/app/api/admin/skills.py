@@ -0,0 +1,168 @@
+"""
+Admin skill tree endpoints.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Text, cast, literal_column, select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import selectinload
+from pydantic import BaseModel
+
+from app.core.database import get_read_db
+from app.core.security import verify_admin_token
+from app.models.lesson import ContentChange, Skill, Lesson, Exercise, LanguagePair
+
+
+router = APIRouter(prefix="/admin/skills", tags=["Admin Skills"])
+
+
+# Schemas
+class SkillTreeLesson(BaseModel):
+    id: int
+    title: str
+    slug: str
+    status: str
+    level: str
+    unit_number: int
+    lesson_number: int
+    order: int
+    exercise_count: int
+
+
+class SkillTreeNode(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    icon: Optional[str]
+    color: Optional[str]
+    level: str
+    order: int
+    lessons: List[SkillTreeLesson]
+
+
+class SkillTreeResponse(BaseModel):
+    language_pair: str
+    skills: List[SkillTreeNode]
+
+
+class SkillTreeCache:
+    """
+    Per-process cache of built skill trees, one per language pair.
+    
+    An entry is reused only while the pair's version is unchanged: the
+    content change log watermark, which lesson writes advance, and a
+    fingerprint of the pair's skill rows. Skill writes aren't logged (and
+    may come from outside this app), so the rows themselves are hashed.
+    Both are read in one query.
+    """
+    
+    def __init__(self) -> None:
+        self._entries: Dict[LanguagePair, Tuple[Tuple[int, Optional[str]], SkillTreeResponse]] = {}
+        self._locks = {pair: asyncio.Lock() for pair in LanguagePair}
+    
+    async def get(self, db: AsyncSession, language_pair: LanguagePair) -> SkillTreeResponse:
+        version = await tree_version(db, language_pair)
+        entry = self._entries.get(language_pair)
+        if entry and entry[0] == version:
+            return entry[1]
+        
+        async with self._locks[language_pair]:
+            entry = self._entries.get(language_pair)
+            if entry and entry[0] == version:
+                return entry[1]
+            tree = await build_skill_tree(db, language_pair)
+            self._entries[language_pair] = (version, tree)
+            return tree
+
+
+skill_tree_cache = SkillTreeCache()
+
+
+async def tree_version(db: AsyncSession, language_pair: LanguagePair) -> Tuple[int, Optional[str]]:
+    """Change watermark (0 if none) and md5 of the skill rows of a language pair."""
+    watermark = (
+        select(func.coalesce(func.max(ContentChange.id), 0))
+        .where(ContentChange.language_pair == language_pair)
+        .scalar_subquery()
+    )
+    # The whole row as text, so a change to any column shows
+    skill_row = cast(literal_column("skills"), Text)
+    fingerprint = (
+        select(func.md5(func.string_agg(skill_row, aggregate_order_by(literal_column("','"), Skill.id))))
+        .where(Skill.language_pair == language_pair)
+        .scalar_subquery()
+    )
+    result = await db.execute(select(watermark, fingerprint))
+    return tuple(result.one())
+
+
+async def build_skill_tree(db: AsyncSession, language_pair: LanguagePair) -> SkillTreeResponse:
+    """
+    Build the skill tree for a language pair in three queries.
+    
+    Skills, their lessons (selectin loaded) and the lessons' exercise
+    counts (one grouped query) are fetched regardless of tree size.
+    """
+    result = await db.execute(
+        select(Skill)
+        .where(Skill.language_pair == language_pair)
+        .options(selectinload(Skill.lessons))
+        .order_by(Skill.order, Skill.id)
+    )
+    skills = result.scalars().all()
+    
+    lesson_ids = [lesson.id for skill in skills for lesson in skill.lessons]
+    exercise_counts: Dict[int, int] = {}
+    if lesson_ids:
+        counts = await db.execute(
+            select(Exercise.lesson_id, func.count(Exercise.id))
+            .where(Exercise.lesson_id.in_(lesson_ids))
+            .group_by(Exercise.lesson_id)
+        )
+        exercise_counts = dict(counts.all())
+    
+    def lesson_key(lesson: Lesson) -> Tuple[int, int, int, int]:
+        return (lesson.unit_number or 0, lesson.lesson_number or 0, lesson.order or 0, lesson.id)
+    
+    return SkillTreeResponse(
+        language_pair=language_pair.value,
+        skills=[
+            SkillTreeNode(
+                id=skill.id,
+                name=skill.name,
+                description=skill.description,
+                icon=skill.icon,
+                color=skill.color,
+                level=skill.level.value,
+                order=skill.order,
+                lessons=[
+                    SkillTreeLesson(
+                        id=lesson.id,
+                        title=lesson.title,
+                        slug=lesson.slug,
+                        status=lesson.status.value,
+                        level=lesson.level.value,
+                        unit_number=lesson.unit_number,
+                        lesson_number=lesson.lesson_number,
+                        order=lesson.order,
+                        exercise_count=exercise_counts.get(lesson.id, 0),
+                    )
+                    for lesson in sorted(skill.lessons, key=lesson_key)
+                    if lesson.language_pair == language_pair
+                ],
+            )
+            for skill in skills
+        ],
+    )
+
+
+@router.get("/tree", response_model=SkillTreeResponse)
+async def get_skill_tree(
+    language_pair: LanguagePair,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the skill → lesson tree for a language pair with exercise counts."""
+    return await skill_tree_cache.get(db, language_pair)
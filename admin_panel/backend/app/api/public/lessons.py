@@ -0,0 +1,104 @@
+"""
+Public lesson content endpoints for the mobile app.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.models.lesson import LanguagePair
+from app.services.catalog import catalog_store
+from app.services.content_changes import get_changes
+
+
+router = APIRouter(prefix="/lessons", tags=["Lessons"])
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against a strong ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+def _accepts_gzip(header: str) -> bool:
+    """
+    Whether an Accept-Encoding header lets the response be gzipped.
+    
+    gzip is used if its q-value (or that of * when gzip isn't listed) is
+    positive and, when identity is listed (or covered by *), at least
+    identity's. So "gzip;q=0" is a refusal.
+    """
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities["gzip" if coding == "x-gzip" else coding] = quality
+    
+    default = qualities.get("*")
+    gzip_quality = qualities.get("gzip", default if default is not None else 0.0)
+    identity_quality = qualities.get("identity", default if default is not None else 0.0)
+    return gzip_quality > 0 and gzip_quality >= identity_quality
+
+
+@router.get("/changes")
+async def get_lesson_changes(
+    since: int = Query(0, ge=0),
+    language_pair: Optional[LanguagePair] = None,
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get published lesson content changed after a watermark.
+    
+    Returns changed published lessons in full and ids of lessons that were
+    unpublished or deleted. Pass the returned watermark as since on the next
+    call; keep calling while has_more is true.
+    """
+    return await get_changes(db, since, language_pair, limit)
+
+
+@router.get("/catalog/{language_pair}")
+async def get_catalog(
+    language_pair: LanguagePair,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the published curriculum for a language pair.
+    
+    Served from a precompiled snapshot. Clients should send the ETag back in
+    If-None-Match and get 304 Not Modified while their copy is current. The
+    X-Change-Watermark header is the since value for GET /lessons/changes.
+    """
+    snapshot = await catalog_store.get(db, language_pair)
+    
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = f'"{snapshot.etag}-gzip"' if use_gzip else f'"{snapshot.etag}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Change-Watermark": str(snapshot.watermark),
+    }
+    
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(snapshot.body, media_type="application/json", headers=headers)
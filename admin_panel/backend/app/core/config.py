@@ -1,7 +1,7 @@
 """
 Core configuration management for the admin panel backend.
 """
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import AnyHttpUrl, EmailStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -26,12 +26,36 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
     DATABASE_POOL_RECYCLE: int = 3600
+    # Seconds to wait for a free connection before failing the checkout
+    DATABASE_POOL_TIMEOUT: int = 30
+    # Log every statement (very verbose; prefer the slow-query log)
+    DATABASE_ECHO: bool = False
+    # Statements at or above the threshold are logged; the sample rate is
+    # the fraction of faster statements logged as well
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_SAMPLE_RATE: float = 0.0
+    QUERY_STATS_MAX_FINGERPRINTS: int = 1000
+    # Optional streaming replica for read-only requests (same pool settings)
+    DATABASE_REPLICA_URL: Optional[str] = None
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    USER_PROFILE_CACHE_TTL_SECONDS: int = 30
+    # Revoked refresh tokens: Bloom filter sizing, and how often each worker
+    # picks up revocations made by the others
+    REVOKED_TOKEN_BLOOM_CAPACITY: int = 100_000
+    REVOKED_TOKEN_BLOOM_ERROR_RATE: float = 0.001
+    REVOKED_TOKEN_SYNC_SECONDS: float = 10.0
+    
+    # Password hashing pool: concurrent bcrypt threads, and hashes allowed to
+    # wait for one before requests are rejected with 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 8
     
     # Admin credentials
     ADMIN_EMAIL: EmailStr
@@ -61,6 +85,29 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     LLM_MODEL: str = "gpt-4-turbo-preview"
     MAX_TOKENS: int = 2000
+    # Knowledge base indexing; "stub" embeds offline with deterministic vectors
+    EMBEDDING_BACKEND: Literal["openai", "stub"] = "openai"
+    EMBEDDING_DIMENSIONS: int = 1536
+    # Chunk size in tokens; paragraphs shorter than the minimum are merged
+    # into the paragraph that follows them
+    EMBEDDING_CHUNK_TOKENS: int = 400
+    EMBEDDING_CHUNK_MIN_TOKENS: int = 48
+    # Caps per embeddings request, and how many requests run at once
+    EMBEDDING_BATCH_SIZE: int = 256
+    EMBEDDING_BATCH_TOKENS: int = 64_000
+    EMBEDDING_CONCURRENCY: int = 4
+    # HNSW candidate list size per search, and the limit a filtered search
+    # widens it to before ranking the filtered chunks exactly
+    VECTOR_SEARCH_EF_SEARCH: int = 40
+    VECTOR_SEARCH_MAX_EF_SEARCH: int = 1000
+    # In-process index memory-mapped from this directory, shared by the
+    # workers on a host (unset disables it), and how often it is refreshed
+    VECTOR_INDEX_DIR: Optional[str] = None
+    VECTOR_INDEX_REFRESH_SECONDS: float = 30.0
+    # Hybrid search: chunks each leg contributes to the fusion, and the
+    # reciprocal rank fusion constant (larger flattens the rank weights)
+    HYBRID_SEARCH_CANDIDATES: int = 50
+    HYBRID_SEARCH_RRF_K: int = 60
     
     # Payment Providers
     TELEBIRR_APP_ID: Optional[str] = None
@@ -69,10 +116,17 @@ class Settings(BaseSettings):
     CBE_MERCHANT_ID: Optional[str] = None
     CBE_API_KEY: Optional[str] = None
     
-    # Rate Limiting
+    # Published catalog snapshots
+    CATALOG_SNAPSHOT_DIR: Optional[str] = None
+    CATALOG_REVALIDATE_SECONDS: int = 30
+    
+    # Rate Limiting (RATE_LIMIT_PER_MINUTE=0 disables request limiting)
     RATE_LIMIT_PER_MINUTE: int = 100
     RATE_LIMIT_LOGIN_ATTEMPTS: int = 5
     RATE_LIMIT_LOGIN_WINDOW_MINUTES: int = 15
+    # "memory" is per worker; "database" shares attempts across workers
+    LOGIN_THROTTLE_BACKEND: Literal["memory", "database"] = "memory"
+    LOGIN_THROTTLE_MAX_KEYS: int = 100_000
     
     # Logging
     LOG_LEVEL: str = "INFO"
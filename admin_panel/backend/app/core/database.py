@@ -1,28 +1,82 @@
 """
 Database connection and session management.
 """
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.pool import NullPool
+import ast
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict, Optional, Set
+from sqlalchemy import event, text
+from sqlalchemy.exc import InvalidRequestError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
 
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedNullPool, PoolMetrics
+from app.core.query_log import query_log
 
 
-# Convert postgresql:// to postgresql+asyncpg://
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+# Alembic scripts, next to the app package
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+def _async_url(url: str) -> str:
+    """Convert postgresql:// to postgresql+asyncpg://"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _create_engine(name: str, url: str, **kwargs) -> AsyncEngine:
+    """Create an engine whose pool and statements are instrumented"""
+    if settings.ENVIRONMENT == "test":
+        pool_options = {"poolclass": InstrumentedNullPool}
+    else:
+        pool_options = {
+            "poolclass": InstrumentedAsyncQueuePool,
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        }
+    async_engine = create_async_engine(
+        _async_url(url),
+        echo=settings.DATABASE_ECHO,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        **pool_options,
+        **kwargs,
+    )
+    PoolMetrics().attach(async_engine.sync_engine.pool)
+    query_log.instrument(async_engine, name)
+    return async_engine
+
+
+database_url = _async_url(settings.DATABASE_URL)
 
 # Create async engine
-engine = create_async_engine(
-    database_url,
-    echo=settings.DEBUG,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_recycle=settings.DATABASE_POOL_RECYCLE,
-    poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
-)
+engine = _create_engine("primary", settings.DATABASE_URL)
+
+# Engine for read-only requests: the replica when one is configured (with
+# its own pool, refusing writes server-side), otherwise the primary's pool.
+# Reads run in autocommit mode, so there is no BEGIN or COMMIT round trip.
+if settings.DATABASE_REPLICA_URL:
+    replica_engine: Optional[AsyncEngine] = _create_engine(
+        "replica",
+        settings.DATABASE_REPLICA_URL,
+        connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+    )
+    read_engine = replica_engine.execution_options(isolation_level="AUTOCOMMIT")
+else:
+    replica_engine = None
+    read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """Pool metrics per engine, for the admin metrics endpoint."""
+    engines = {"primary": engine, "replica": replica_engine}
+    return {
+        name: async_engine.sync_engine.pool.metrics.snapshot()
+        for name, async_engine in engines.items()
+        if async_engine is not None
+    }
+
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -33,6 +87,22 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Session factory for read-only work
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    info={"read_only": True},
+)
+
+
+@event.listens_for(Session, "before_flush")
+def _refuse_read_only_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise InvalidRequestError("Cannot write through a read-only session")
+
+
 # Base class for models
 Base = declarative_base()
 
@@ -55,12 +125,91 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only database sessions.
+    
+    Statements run in autocommit mode against the replica if configured,
+    so nothing is committed and each statement sees the latest committed
+    data (which on a replica may lag the primary slightly). Use get_db for
+    anything that writes or must read its own writes.
+    
+    Yields:
+        AsyncSession: Read-only database session
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 async def init_db():
-    """Initialize database tables."""
+    """Create missing tables; only for tests, migrations own the schema."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the Alembic head revision"""
+
+
+def _head_revisions() -> Set[str]:
+    """
+    Head revision(s) of the migration scripts shipped with this code.
+    
+    Reads the revision identifiers from the scripts' source rather than
+    loading them through Alembic, which would import Alembic and every
+    migration module on each worker start.
+    """
+    revisions: Set[str] = set()
+    parents: Set[str] = set()
+    for script in (MIGRATIONS_DIR / "versions").glob("*.py"):
+        for node in ast.parse(script.read_text(encoding="utf-8")).body:
+            if isinstance(node, ast.AnnAssign):
+                target, value = node.target, node.value
+            elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+                target, value = node.targets[0], node.value
+            else:
+                continue
+            if not isinstance(target, ast.Name) or value is None:
+                continue
+            if target.id == "revision":
+                revisions.add(ast.literal_eval(value))
+            elif target.id == "down_revision":
+                down_revision = ast.literal_eval(value)
+                if isinstance(down_revision, str):
+                    parents.add(down_revision)
+                elif down_revision:
+                    parents.update(down_revision)
+    return revisions - parents
+
+
+async def check_schema_version() -> None:
+    """
+    Fail fast unless the database schema is at the Alembic head.
+    
+    One query against alembic_version on the primary, instead of
+    reflecting every table as create_all does.
+    
+    Raises:
+        SchemaOutOfDate: If the database is unmigrated, behind or ahead
+    """
+    heads = _head_revisions()
+    async with engine.connect() as conn:
+        autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            result = await autocommit.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars().all())
+        except ProgrammingError:
+            current = set()
+    
+    if current != heads:
+        raise SchemaOutOfDate(
+            f"Database schema is at {sorted(current) or 'no revision'}, "
+            f"expected {sorted(heads)}; run `alembic upgrade head`"
+        )
+
+
 async def close_db():
     """Close database connections."""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
@@ -0,0 +1,75 @@
+"""
+In-process metrics primitives.
+
+Values live in the worker process that records them; the admin metrics
+endpoint reports the worker that served the request.
+"""
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+
+
+# Upper bounds in milliseconds, suited to request-path latencies
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """
+    Cumulative histogram of millisecond timings with fixed buckets.
+    
+    Observations are O(log buckets) and memory does not grow with the number
+    of samples. Percentiles are estimated as the upper bound of the bucket
+    they fall in, capped at the largest value seen. Not thread-safe: record
+    from the event loop.
+    
+    Other quantities can be recorded by passing their buckets and unit; the
+    unit is the suffix of the summary keys ("" for plain counts).
+    """
+    
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS, unit: str = "ms") -> None:
+        self.buckets = tuple(buckets)
+        self.unit = unit
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Record one timing (or value in the histogram's unit)."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def percentile(self, pct: float) -> float:
+        """Estimate a percentile; 0 when nothing has been observed."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable summary with cumulative bucket counts."""
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound}"] = cumulative
+        buckets["le_inf"] = self.count
+        
+        suffix = f"_{self.unit}" if self.unit else ""
+        return {
+            "count": self.count,
+            f"sum{suffix}": round(self.total, 3),
+            f"mean{suffix}": round(self.total / self.count, 3) if self.count else 0.0,
+            f"max{suffix}": round(self.max, 3),
+            f"p50{suffix}": self.percentile(50),
+            f"p95{suffix}": self.percentile(95),
+            f"p99{suffix}": self.percentile(99),
+            "buckets": buckets,
+        }
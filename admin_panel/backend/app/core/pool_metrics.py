@@ -0,0 +1,142 @@
+"""
+Connection pool instrumentation.
+
+Engines are created with the instrumented pool classes below, which time
+every checkout including the wait for a free connection, and PoolMetrics
+listens to the pool's events for the rest: connections in use, overflow,
+recycles, invalidations and checkout timeouts.
+"""
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.core.metrics import Histogram
+
+
+# Checkouts from a warm pool take well under a millisecond; waits for a free
+# connection run up to DATABASE_POOL_TIMEOUT
+CHECKOUT_WAIT_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000, 30000)
+
+# Buckets for connection counts rather than milliseconds
+CONNECTION_BUCKETS = (1, 2, 3, 5, 8, 10, 15, 20, 25, 30, 40, 50, 75, 100)
+
+
+class PoolMetrics:
+    """Checkout timings and pool usage for one engine's pool"""
+    
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram(CHECKOUT_WAIT_BUCKETS_MS)
+        self.in_use_at_checkout = Histogram(CONNECTION_BUCKETS, unit="")
+        self.in_use = 0
+        self.max_in_use = 0
+        self.max_overflow_in_use = 0
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.recycles = 0
+        self.invalidations = 0
+        self._pool: Optional[Pool] = None
+    
+    def attach(self, pool: Pool) -> None:
+        """Start recording a pool; its listeners carry over when it is recreated."""
+        self._pool = pool
+        pool.metrics = self
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        event.listen(pool, "soft_invalidate", self._on_invalidate)
+    
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.connects += 1
+        # A record that connects again without having been invalidated was
+        # recycled for reaching DATABASE_POOL_RECYCLE
+        info = connection_record.record_info
+        if info.pop("connected", False) and not info.pop("invalidated", False):
+            self.recycles += 1
+        info["connected"] = True
+    
+    def _on_checkout(self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+        self.in_use_at_checkout.observe(self.in_use)
+        
+        # Checkouts made while the pool holds more than pool_size connections
+        pool = self._pool
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            self.overflow_checkouts += 1
+            self.max_overflow_in_use = max(self.max_overflow_in_use, pool.overflow())
+    
+    def _on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        self.in_use -= 1
+    
+    def _on_invalidate(self, dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        self.invalidations += 1
+        connection_record.record_info["invalidated"] = True
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable pool state and histograms."""
+        pool = self._pool
+        state: Dict[str, Any] = {"pool": type(pool).__name__ if pool else None}
+        if isinstance(pool, QueuePool):
+            state.update(
+                size=pool.size(),
+                idle=pool.checkedin(),
+                overflow=max(0, pool.overflow()),
+                max_overflow=pool._max_overflow,
+                timeout_seconds=pool.timeout(),
+            )
+        return {
+            **state,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "max_overflow_in_use": self.max_overflow_in_use,
+            "checkouts": self.checkouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "recycles": self.recycles,
+            "invalidations": self.invalidations,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "in_use_at_checkout": self.in_use_at_checkout.snapshot(),
+        }
+
+
+class _TimedCheckout:
+    """Pool mixin timing connect(), i.e. the wait for a usable connection"""
+    
+    metrics: Optional[PoolMetrics] = None
+    
+    def connect(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()
+        
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.checkout_wait.observe((time.perf_counter() - started) * 1000)
+    
+    def recreate(self):
+        pool = super().recreate()
+        if self.metrics is not None:
+            self.metrics._pool = pool
+            pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
@@ -0,0 +1,236 @@
+"""
+Statement timing, slow-query log and per-fingerprint query statistics.
+
+Every statement executed through an instrumented engine is timed and folded
+into statistics keyed by its fingerprint: the SQL with literals, bind
+parameters and IN lists normalized away. Statements slower than
+SLOW_QUERY_THRESHOLD_MS are logged as one JSON line each; a
+SLOW_QUERY_SAMPLE_RATE fraction of the fast ones are logged too, so the
+log shows what normal traffic looks like without logging all of it.
+
+Log entries and statistics carry the route that issued the query, taken
+from the request scope that QueryRouteMiddleware records.
+"""
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+
+logger = logging.getLogger("app.slow_query")
+
+# ASGI scope of the request being served, if any
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("current_scope", default=None)
+
+# Most statements finish in well under a millisecond
+QUERY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+\b")
+# Casts the asyncpg dialect renders on bind parameters, e.g. $1::VARCHAR
+_PARAMETER_CAST = re.compile(r"\?::\w+(?:\s+WITH(?:OUT)?\s+TIME\s+ZONE)?(?:\[\])?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_sql(statement: str) -> str:
+    """Normalize SQL so statements differing only in values compare equal."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAMETER_CAST.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def current_route() -> Optional[str]:
+    """Method and route template of the request being served."""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', None) or scope['path']}".strip()
+
+
+class QueryStats:
+    """Timings for one fingerprint"""
+    
+    def __init__(self, fingerprint: str) -> None:
+        self.fingerprint = fingerprint
+        self.timings = Histogram(QUERY_BUCKETS_MS)
+        self.slow = 0
+        self.rows = 0
+        self.routes: Dict[str, int] = {}
+    
+    def snapshot(self) -> Dict[str, Any]:
+        timings = self.timings
+        return {
+            "fingerprint": self.fingerprint,
+            "count": timings.count,
+            "total_ms": round(timings.total, 3),
+            "mean_ms": round(timings.total / timings.count, 3) if timings.count else 0.0,
+            "p95_ms": timings.percentile(95),
+            "max_ms": round(timings.max, 3),
+            "slow": self.slow,
+            "rows": self.rows,
+            "routes": dict(sorted(self.routes.items(), key=lambda item: -item[1])[:5]),
+        }
+
+
+class QueryLog:
+    """
+    Slow-query logger and bounded per-fingerprint aggregation.
+    
+    Fingerprints are computed once per distinct statement string; at most
+    max_fingerprints are tracked, dropping the least recently executed.
+    """
+    
+    # Distinct statement strings whose fingerprints are remembered
+    FINGERPRINT_CACHE_SIZE = 2048
+    
+    def __init__(self, threshold_ms: float, sample_rate: float, max_fingerprints: int) -> None:
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.max_fingerprints = max_fingerprints
+        self._fingerprints: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._stats: "OrderedDict[str, QueryStats]" = OrderedDict()
+        self.logged = 0
+    
+    def instrument(self, async_engine: AsyncEngine, name: str) -> None:
+        """Time every statement executed on an engine."""
+        sync_engine = async_engine.sync_engine
+        
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+        
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _finish(conn, cursor, statement, parameters, context, executemany):
+            elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+            self.record(name, statement, parameters, executemany, cursor.rowcount, elapsed_ms)
+        
+        @event.listens_for(sync_engine, "handle_error")
+        def _failed(exception_context):
+            connection = exception_context.connection
+            if connection is not None and connection.info.get("query_started"):
+                connection.info["query_started"].pop()
+    
+    def _fingerprint(self, statement: str) -> Tuple[str, str]:
+        cached = self._fingerprints.get(statement)
+        if cached is None:
+            fingerprint = fingerprint_sql(statement)
+            digest = hashlib.blake2b(fingerprint.encode("utf-8"), digest_size=8).hexdigest()
+            cached = self._fingerprints[statement] = (digest, fingerprint)
+            if len(self._fingerprints) > self.FINGERPRINT_CACHE_SIZE:
+                self._fingerprints.popitem(last=False)
+        return cached
+    
+    def record(
+        self,
+        engine_name: str,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        rowcount: int,
+        elapsed_ms: float,
+    ) -> None:
+        """Aggregate one executed statement and log it if slow or sampled."""
+        digest, fingerprint = self._fingerprint(statement)
+        route = current_route()
+        rows = rowcount if rowcount >= 0 else None
+        slow = elapsed_ms >= self.threshold_ms
+        
+        stats = self._stats.get(digest)
+        if stats is None:
+            stats = self._stats[digest] = QueryStats(fingerprint)
+            if len(self._stats) > self.max_fingerprints:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(digest)
+        stats.timings.observe(elapsed_ms)
+        stats.rows += rows or 0
+        if slow:
+            stats.slow += 1
+        if route:
+            stats.routes[route] = stats.routes.get(route, 0) + 1
+        
+        if not slow and not (self.sample_rate and random.random() < self.sample_rate):
+            return
+        
+        if executemany:
+            batch = len(parameters)
+            param_count = len(parameters[0]) if batch else 0
+        else:
+            batch = None
+            param_count = len(parameters) if parameters else 0
+        
+        self.logged += 1
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            json.dumps({
+                "event": "slow_query" if slow else "sampled_query",
+                "engine": engine_name,
+                "duration_ms": round(elapsed_ms, 3),
+                "fingerprint_id": digest,
+                "fingerprint": fingerprint,
+                "params": param_count,
+                "batch": batch,
+                "rows": rows,
+                "route": route,
+            }),
+        )
+    
+    def top(self, order_by: str = "total_ms", limit: int = 50) -> List[Dict[str, Any]]:
+        """Statistics for the heaviest fingerprints."""
+        snapshots = [stats.snapshot() for stats in self._stats.values()]
+        snapshots.sort(key=lambda snapshot: snapshot[order_by], reverse=True)
+        return snapshots[:limit]
+    
+    def reset(self) -> None:
+        self._stats.clear()
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": self.threshold_ms,
+            "sample_rate": self.sample_rate,
+            "fingerprints": len(self._stats),
+            "logged": self.logged,
+        }
+
+
+class QueryRouteMiddleware:
+    """ASGI middleware exposing the request scope to the query log"""
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+query_log = QueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_SAMPLE_RATE,
+    max_fingerprints=settings.QUERY_STATS_MAX_FINGERPRINTS,
+)
@@ -0,0 +1,177 @@
+"""
+Request rate limiting middleware.
+
+Each principal gets a token bucket holding RATE_LIMIT_PER_MINUTE requests
+that refills continuously. Requests carrying a bearer token that has already
+been verified (it is in the token cache) count against the token's subject;
+all other requests count against the client IP. Unverified tokens are never
+trusted for the key, so a forged sub cannot drain someone else's bucket.
+"""
+import asyncio
+import math
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.security import token_cache
+from app.core.token_cache import token_digest
+
+
+# Paths that are never limited (load balancer health checks)
+EXEMPT_PATHS = frozenset({"/health"})
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+    
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets per key with O(1) state each.
+    
+    Idle keys are dropped by a periodic sweep rather than on the request
+    path: once a bucket would have refilled completely it is equivalent to
+    having no bucket at all.
+    """
+    
+    def __init__(self, requests_per_minute: int, sweep_interval: float = 60.0) -> None:
+        self.capacity = float(requests_per_minute)
+        self.rate = requests_per_minute / 60.0
+        self.sweep_interval = sweep_interval
+        self._buckets: Dict[str, _Bucket] = {}
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+        self.limited = 0
+        self.swept = 0
+    
+    def take(self, key: str) -> Tuple[bool, int, float]:
+        """
+        Spend one token for key.
+        
+        Returns:
+            (allowed, remaining tokens, seconds until the bucket is full again)
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.capacity, now)
+        else:
+            bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        
+        allowed = bucket.tokens >= 1
+        if allowed:
+            bucket.tokens -= 1
+        else:
+            self.limited += 1
+        return allowed, int(bucket.tokens), (self.capacity - bucket.tokens) / self.rate
+    
+    def retry_after(self, key: str) -> float:
+        """Seconds until key has a token to spend."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return 0.0
+        return max(0.0, (1 - bucket.tokens) / self.rate)
+    
+    def start_sweeping(self) -> None:
+        """Schedule the idle-key sweep on the running loop, once."""
+        if self._sweep_handle is None:
+            self._sweep_handle = asyncio.get_running_loop().call_later(
+                self.sweep_interval, self._sweep
+            )
+    
+    def stop_sweeping(self) -> None:
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
+    
+    def _sweep(self) -> None:
+        full_after = self.capacity / self.rate
+        cutoff = time.monotonic() - full_after
+        idle = [key for key, bucket in self._buckets.items() if bucket.updated <= cutoff]
+        for key in idle:
+            del self._buckets[key]
+        self.swept += len(idle)
+        self._sweep_handle = asyncio.get_running_loop().call_later(
+            self.sweep_interval, self._sweep
+        )
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": int(self.capacity),
+            "active_keys": len(self._buckets),
+            "limited": self.limited,
+            "swept": self.swept,
+        }
+
+
+def _bearer_subject(headers: Iterable[Tuple[bytes, bytes]]) -> Optional[str]:
+    """Subject of an already verified bearer token in the request headers."""
+    for name, value in headers:
+        if name == b"authorization":
+            if value[:7].lower() != b"bearer ":
+                return None
+            payload = token_cache.peek(token_digest(value[7:].decode("latin-1").strip()))
+            return payload.get("sub") if payload else None
+    return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware enforcing a TokenBucketLimiter with RateLimit-* headers"""
+    
+    def __init__(self, app: ASGIApp, limiter: TokenBucketLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+        self._limit_header = str(int(limiter.capacity)).encode()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        self.limiter.start_sweeping()
+        
+        subject = _bearer_subject(scope["headers"])
+        if subject is not None:
+            key = f"sub:{subject}"
+        else:
+            client = scope.get("client")
+            key = f"ip:{client[0] if client else 'unknown'}"
+        
+        allowed, remaining, reset = self.limiter.take(key)
+        rate_headers = [
+            (b"ratelimit-limit", self._limit_header),
+            (b"ratelimit-remaining", str(remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(reset)).encode()),
+        ]
+        
+        if not allowed:
+            retry_after = str(math.ceil(self.limiter.retry_after(key))).encode()
+            body = b'{"detail":"Rate limit exceeded"}'
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": rate_headers + [
+                    (b"retry-after", retry_after),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + rate_headers
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
+
+
+# Process-wide limiter shared by the middleware and the metrics endpoint
+request_limiter = TokenBucketLimiter(settings.RATE_LIMIT_PER_MINUTE)
@@ -2,13 +2,16 @@
 Security utilities for authentication and authorization.
 """
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from uuid import uuid4
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.token_cache import RevocationCheck, TokenCache, token_digest
+from app.services.user_profiles import user_profiles
 
 
 # Password hashing context
@@ -17,6 +20,30 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # HTTP Bearer token security
 security_scheme = HTTPBearer()
 
+# Verified token payloads, so repeated requests skip the signature check
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+# "type" claim of refresh tokens
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Checks run on every decoded token, cached or not
+_revocation_checks: List[RevocationCheck] = []
+
+
+def register_revocation_check(check: RevocationCheck) -> None:
+    """
+    Reject tokens for which check(payload) returns True.
+    
+    Checks run on every decode, including cache hits, so they must be cheap.
+    
+    Args:
+        check: Callable receiving the verified token payload
+    """
+    _revocation_checks.append(check)
+
 
 def hash_password(password: str) -> str:
     """
@@ -52,6 +79,8 @@ def create_access_token(
     """
     Create a JWT access token.
     
+    Every token gets a unique jti claim so it can be revoked on its own.
+    
     Args:
         data: Data to encode in the token
         expires_delta: Optional custom expiration time
@@ -70,7 +99,8 @@ def create_access_token(
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow()
+        "iat": datetime.utcnow(),
+        "jti": uuid4().hex,
     })
     
     encoded_jwt = jwt.encode(
@@ -86,6 +116,9 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     """
     Create a JWT refresh token with longer expiration.
     
+    Refresh tokens are typed so they are only accepted by the refresh
+    endpoint, never as access tokens.
+    
     Args:
         data: Data to encode in the token
         
@@ -93,13 +126,17 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         Encoded JWT refresh token
     """
     expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    return create_access_token(data, expires_delta)
+    return create_access_token({**data, "type": REFRESH_TOKEN_TYPE}, expires_delta)
 
 
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate a JWT token.
     
+    Verified payloads are cached until the token expires (or the cache TTL
+    passes), so the signature is checked once per token rather than on
+    every request.
+    
     Args:
         token: JWT token string
         
@@ -107,29 +144,71 @@ def decode_token(token: str) -> Dict[str, Any]:
         Decoded token payload
         
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid, expired or revoked
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+    digest = token_digest(token)
+    payload = token_cache.get(digest)
+    
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM]
+            )
+        except JWTError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            ) from e
+        token_cache.put(digest, payload)
+    
+    if any(check(payload) for check in _revocation_checks):
+        token_cache.discard(digest)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        return payload
-    except JWTError as e:
+    
+    # Callers get their own copy so the cached payload stays intact
+    return dict(payload)
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Decode a token presented as a bearer credential.
+    
+    Args:
+        token: JWT token string
+        
+    Returns:
+        Decoded token payload
+        
+    Raises:
+        HTTPException: If token is invalid, revoked or a refresh token
+    """
+    payload = decode_token(token)
+    if payload.get("type") == REFRESH_TOKEN_TYPE:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        ) from e
+        )
+    return payload
 
 
-def verify_admin_token(
+async def verify_admin_token(
     credentials: HTTPAuthorizationCredentials = Security(security_scheme)
 ) -> Dict[str, Any]:
     """
     Verify admin JWT token and check role.
     
+    The caller's current role and status come from the cached user profile,
+    so demoted, banned or deactivated admins are turned away on their next
+    request rather than when their token expires.
+    
     Args:
         credentials: HTTP authorization credentials
         
@@ -137,10 +216,10 @@ def verify_admin_token(
         Decoded token payload
         
     Raises:
-        HTTPException: If token is invalid or user is not admin
+        HTTPException: If token is invalid or user is not an active admin
     """
     token = credentials.credentials
-    payload = decode_token(token)
+    payload = decode_access_token(token)
     
     # Check if user has admin role
     role = payload.get("role")
@@ -150,6 +229,27 @@ def verify_admin_token(
             detail="Admin access required"
         )
     
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+    
+    profile = await user_profiles.get(user_id)
+    if profile is None or not profile.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    if not profile.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
     return payload
 
 
@@ -166,7 +266,7 @@ def verify_token(
         Decoded token payload
     """
     token = credentials.credentials
-    return decode_token(token)
+    return decode_access_token(token)
 
 
 def generate_password_reset_token(email: str) -> str:
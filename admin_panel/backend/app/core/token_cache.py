@@ -0,0 +1,106 @@
+"""
+Cache of verified JWT payloads.
+
+The admin UI sends bursts of requests with the same bearer token, and each
+one used to re-parse the token and re-check its HMAC signature. Verified
+payloads are kept in a bounded LRU keyed by a digest of the token, so the
+raw token is never held as a key.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Returns True when a verified payload must no longer be accepted
+RevocationCheck = Callable[[Dict[str, Any]], bool]
+
+
+def token_digest(token: str) -> bytes:
+    """Cache key for a raw token."""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+class TokenCache:
+    """
+    Bounded LRU/TTL cache of verified token payloads.
+    
+    An entry lives for at most ttl_seconds and never past the token's own
+    exp claim. When the cache is full the least recently used entry is
+    evicted. Safe to share between the event loop and sync dependencies
+    running in the threadpool.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a token digest, if still valid."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, payload = entry
+            if time.time() >= expires_at:
+                self._entries.pop(digest, None)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload
+    
+    def peek(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        """Like get, but without counting the lookup or refreshing recency."""
+        entry = self._entries.get(digest)
+        if entry is None or time.time() >= entry[0]:
+            return None
+        return entry[1]
+    
+    def put(self, digest: bytes, payload: Dict[str, Any]) -> None:
+        """Cache a verified payload."""
+        if self.max_entries <= 0:
+            return
+        
+        expires_at = time.time() + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        
+        with self._lock:
+            self._entries[digest] = (expires_at, payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def discard(self, digest: bytes) -> None:
+        """Drop one token, e.g. after it was revoked."""
+        with self._lock:
+            self._entries.pop(digest, None)
+    
+    def clear(self) -> None:
+        """Drop every cached token."""
+        with self._lock:
+            self._entries.clear()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Size, hit rate and eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -8,8 +8,15 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
-from app.api.admin import auth, lessons
+from app.core.database import check_schema_version, init_db, close_db
+from app.core.query_log import QueryRouteMiddleware
+from app.core.rate_limit import RateLimitMiddleware, request_limiter
+from app.api.admin import auth, knowledge, lessons, metrics, skills
+from app.api.public import lessons as public_lessons
+from app.models import user, lesson, subscription, rag  # noqa: F401  Register all models
+from app.services.password_hashing import PasswordHashingOverloaded, password_hasher
+from app.services.token_revocation import revocation_store
+from app.services.vector_index import vector_index
 
 
 # Configure logging
@@ -25,13 +32,26 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup/shutdown"""
     # Startup
     logger.info("Starting up Admin Panel API...")
-    await init_db()
-    logger.info("Database initialized")
+    if settings.ENVIRONMENT == "test":
+        await init_db()
+        logger.info("Database initialized")
+    else:
+        await check_schema_version()
+        logger.info("Database schema is up to date")
+    await revocation_store.load()
+    revocation_store.start_sync()
+    if vector_index.enabled:
+        # The first (possibly full) export runs in the background
+        vector_index.start_refresh()
     
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    await revocation_store.stop_sync()
+    await vector_index.stop_refresh()
+    password_hasher.shutdown()
+    request_limiter.stop_sweeping()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -47,6 +67,11 @@ app = FastAPI(
 )
 
 
+# Rate limiting (0 disables it), added first so CORS headers still reach
+# 429 responses
+if settings.RATE_LIMIT_PER_MINUTE > 0:
+    app.add_middleware(RateLimitMiddleware, limiter=request_limiter)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -56,8 +81,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so every query issued while serving a request is attributed
+# to its route
+app.add_middleware(QueryRouteMiddleware)
+
 
 # Exception handlers
+@app.exception_handler(PasswordHashingOverloaded)
+async def password_hashing_overloaded_handler(request: Request, exc: PasswordHashingOverloaded):
+    """Shed password checks once the hashing queue is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent sign-in attempts, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
@@ -71,6 +110,10 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(auth.router)
 app.include_router(lessons.router)
+app.include_router(skills.router)
+app.include_router(metrics.router)
+app.include_router(knowledge.router)
+app.include_router(public_lessons.router)
 
 
 # Health check
@@ -3,7 +3,7 @@ Lesson models for the Duolingo-style learning system.
 """
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, Text, Integer, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float
+from sqlalchemy import String, Text, Integer, BigInteger, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 import enum
@@ -55,10 +55,35 @@ class ExerciseType(str, enum.Enum):
     SPEAKING = "speaking"
 
 
+class ChangeType(str, enum.Enum):
+    """Lesson content change type"""
+    CREATED = "created"
+    UPDATED = "updated"
+    PUBLISHED = "published"
+    UNPUBLISHED = "unpublished"
+    DELETED = "deleted"
+
+
 class Lesson(Base):
     """Lesson model - Duolingo-style learning units"""
     
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Keyset pagination: newest first, id as tie-breaker. The listing
+        # is read in order from the index whose equality prefix matches its
+        # filters: none, status, language_pair, or all three. Other
+        # combinations (e.g. status and level) scan the status or
+        # language_pair index in order and filter the rest.
+        Index("ix_lessons_created_at_id", "created_at", "id"),
+        Index("ix_lessons_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_lessons_language_pair_created_at_id", "language_pair", "created_at", "id"),
+        Index(
+            "ix_lessons_status_pair_level_created_at_id",
+            "status", "language_pair", "level", "created_at", "id"
+        ),
+        # Prefix LIKE lookups of suffixed slugs ("greetings-%")
+        Index("ix_lessons_slug_pattern", "slug", postgresql_ops={"slug": "text_pattern_ops"}),
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -109,10 +134,17 @@ class Lesson(Base):
     )
     
     # Additional metadata (JSON)
-    metadata: Mapped[Optional[dict]] = mapped_column(JSON)
+    # ("metadata" is reserved by the declarative base, so map it under another name)
+    extra_metadata: Mapped[Optional[dict]] = mapped_column("metadata", JSON)
     
     # Relationships
-    exercises = relationship("Exercise", back_populates="lesson", cascade="all, delete-orphan")
+    exercises = relationship(
+        "Exercise",
+        back_populates="lesson",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="Exercise.order"
+    )
     skill = relationship("Skill", back_populates="lessons")
     
     def __repr__(self) -> str:
@@ -151,6 +183,10 @@ class Exercise(Base):
     """Exercise model - Individual learning activities within a lesson"""
     
     __tablename__ = "exercises"
+    __table_args__ = (
+        # Lesson detail and exercise counts read exercises by lesson in order
+        Index("ix_exercises_lesson_id_order", "lesson_id", "order"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     lesson_id: Mapped[int] = mapped_column(ForeignKey("lessons.id", ondelete="CASCADE"), nullable=False)
@@ -184,6 +220,13 @@ class Exercise(Base):
     
     # Relationships
     lesson = relationship("Lesson", back_populates="exercises")
+    dialogs = relationship(
+        "ConversationDialog",
+        back_populates="exercise",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="ConversationDialog.order"
+    )
     
     def __repr__(self) -> str:
         return f"<Exercise(id={self.id}, type='{self.type}', lesson_id={self.lesson_id})>"
@@ -193,6 +236,9 @@ class ConversationDialog(Base):
     """Conversation dialog for conversation-type exercises"""
     
     __tablename__ = "conversation_dialogs"
+    __table_args__ = (
+        Index("ix_conversation_dialogs_exercise_id_order", "exercise_id", "order"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     exercise_id: Mapped[int] = mapped_column(ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
@@ -207,5 +253,34 @@ class ConversationDialog(Base):
     # Ordering
     order: Mapped[int] = mapped_column(Integer, default=0)
     
+    # Relationships
+    exercise = relationship("Exercise", back_populates="dialogs")
+    
     def __repr__(self) -> str:
         return f"<ConversationDialog(id={self.id}, speaker='{self.speaker}')>"
+
+
+class ContentChange(Base):
+    """Append-only log of lesson content changes for client delta sync"""
+    
+    __tablename__ = "content_changes"
+    __table_args__ = (
+        Index("ix_content_changes_language_pair_id", "language_pair", "id"),
+    )
+    
+    # Monotonic change sequence; clients sync from the last id they saw
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    
+    # No foreign key: entries outlive deleted lessons as tombstones
+    lesson_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    language_pair: Mapped[LanguagePair] = mapped_column(SQLEnum(LanguagePair), nullable=False)
+    change_type: Mapped[ChangeType] = mapped_column(SQLEnum(ChangeType), nullable=False)
+    
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        return f"<ContentChange(id={self.id}, lesson_id={self.lesson_id}, change_type='{self.change_type}')>"
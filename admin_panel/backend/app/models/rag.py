@@ -3,7 +3,7 @@ RAG (Retrieval-Augmented Generation) models for knowledge base and embeddings.
 """
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Boolean, Index, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
@@ -57,10 +57,27 @@ class KnowledgeSource(Base):
         return f"<KnowledgeSource(id={self.id}, title='{self.title}')>"
 
 
+@event.listens_for(KnowledgeSource.content, "set")
+def _mark_content_unindexed(target: KnowledgeSource, value, oldvalue, initiator) -> None:
+    """Editing a source's content queues it for re-indexing"""
+    if value != oldvalue:
+        target.is_indexed = False
+
+
 class KnowledgeEmbedding(Base):
     """Vector embeddings for knowledge sources"""
     
     __tablename__ = "kb_embeddings"
+    __table_args__ = (
+        # Approximate nearest neighbour search by cosine distance
+        Index(
+            "ix_kb_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     source_id: Mapped[int] = mapped_column(ForeignKey("kb_sources.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -68,6 +85,8 @@ class KnowledgeEmbedding(Base):
     # Text chunk
     chunk_text: Mapped[str] = mapped_column(Text, nullable=False)
     chunk_index: Mapped[int] = mapped_column(Integer, default=0)
+    # Hash of model_name and chunk_text; re-indexing reuses rows whose hash matches
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64))
     
     # Vector embedding (1536 dimensions for OpenAI text-embedding-3-small)
     embedding: Mapped[Vector] = mapped_column(Vector(1536))
@@ -87,6 +106,13 @@ class KnowledgeEmbedding(Base):
         return f"<KnowledgeEmbedding(id={self.id}, source_id={self.source_id})>"
 
 
+# Full-text document of a chunk. The 'simple' configuration only lowercases
+# (PostgreSQL has no Amharic stemmer or stop words); queries must use this
+# same expression for the GIN index to apply.
+chunk_tsvector = func.to_tsvector(text("'simple'"), KnowledgeEmbedding.__table__.c.chunk_text)
+Index("ix_kb_embeddings_chunk_text_fts", chunk_tsvector, postgresql_using="gin")
+
+
 class RAGQuery(Base):
     """Log of RAG queries for analytics and improvement"""
     
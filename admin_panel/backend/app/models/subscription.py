@@ -62,7 +62,7 @@ class Subscription(Base):
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))  # NULL = permanent
     
     # Metadata
-    metadata: Mapped[Optional[dict]] = mapped_column(String)  # JSON string for payment details
+    extra_metadata: Mapped[Optional[dict]] = mapped_column("metadata", String)  # JSON string for payment details
     notes: Mapped[Optional[str]] = mapped_column(String)
     
     # Relationships
@@ -3,7 +3,7 @@ User model for authentication and authorization.
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Boolean, String, DateTime, Enum as SQLEnum
+from sqlalchemy import BigInteger, Boolean, String, DateTime, Enum as SQLEnum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 import enum
@@ -92,3 +92,37 @@ class User(Base):
     def is_banned(self) -> bool:
         """Check if user is banned"""
         return self.status == UserStatus.BANNED
+
+
+class LoginAttempt(Base):
+    """Login attempts per throttle key, for the shared login throttle backend"""
+    
+    __tablename__ = "login_attempts"
+    __table_args__ = (
+        Index("ix_login_attempts_key_attempted_at", "key", "attempted_at"),
+        # Expired attempts are purged by time across all keys
+        Index("ix_login_attempts_attempted_at", "attempted_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    
+    # "email:<address>" or "ip:<address>"
+    key: Mapped[str] = mapped_column(String(320), nullable=False)
+    attempted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class RevokedToken(Base):
+    """JWT ids that must no longer be accepted, kept until the token expires"""
+    
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # Workers pick up new revocations by time, and expired rows are purged by it
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+    
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,262 @@
+"""
+Precompiled snapshots of the published lesson catalog.
+
+Each language pair's published lessons (with exercises and dialogs) are
+serialized once into an immutable, content-hashed JSON blob that read
+endpoints can serve as-is. Snapshots are kept per lesson so a publish,
+unpublish or delete only reloads the affected lessons.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.lesson import ContentChange, Lesson, LanguagePair, LessonStatus
+from app.services.content_changes import current_watermark
+from app.services.lesson_content import load_lesson_documents, public_lesson_document
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An immutable serialized catalog for one language pair"""
+    language_pair: LanguagePair
+    etag: str
+    body: bytes
+    gzip_body: bytes
+    lesson_count: int
+    watermark: int
+
+
+class _PairState:
+    """Mutable build state for one language pair"""
+    
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.documents: Dict[int, Dict[str, Any]] = {}
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self.checked_at = 0.0
+
+
+def _sort_key(document: Dict[str, Any]) -> Tuple[int, int, int, int]:
+    return (
+        document["unit_number"] or 0,
+        document["lesson_number"] or 0,
+        document["order"] or 0,
+        document["id"],
+    )
+
+
+class CatalogStore:
+    """
+    Per-process store of published catalog snapshots.
+    
+    Snapshots are built lazily on first request and then kept current by
+    applying the content change log: only lessons changed since a
+    snapshot's watermark are reloaded. Writers in this process call
+    refresh() after committing; changes made by other workers are picked up
+    at most CATALOG_REVALIDATE_SECONDS later.
+    """
+    
+    # Beyond this many changed lessons a full rebuild is cheaper
+    MAX_INCREMENTAL_LESSONS = 500
+    
+    def __init__(
+        self,
+        snapshot_dir: Optional[str] = None,
+        revalidate_seconds: int = 30,
+    ) -> None:
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.revalidate_seconds = revalidate_seconds
+        self._pairs: Dict[LanguagePair, _PairState] = {
+            pair: _PairState() for pair in LanguagePair
+        }
+    
+    async def get(self, db: AsyncSession, language_pair: LanguagePair) -> CatalogSnapshot:
+        """Return the current snapshot, building or revalidating it if needed."""
+        state = self._pairs[language_pair]
+        snapshot = state.snapshot
+        if snapshot and time.monotonic() - state.checked_at < self.revalidate_seconds:
+            return snapshot
+        
+        async with state.lock:
+            if state.snapshot is None:
+                self._load_from_disk(language_pair, state)
+            if state.snapshot is None:
+                await self._rebuild(db, language_pair, state)
+            elif time.monotonic() - state.checked_at >= self.revalidate_seconds:
+                await self._apply_changes(db, language_pair, state)
+            return state.snapshot
+    
+    async def refresh(self, db: AsyncSession, language_pair: LanguagePair) -> None:
+        """
+        Bring a language pair's snapshot up to date with the change log.
+        
+        Call after committing a publish, unpublish or delete. Pairs that have
+        not been built yet are left to build lazily.
+        """
+        state = self._pairs[language_pair]
+        async with state.lock:
+            if state.snapshot is not None:
+                await self._apply_changes(db, language_pair, state)
+    
+    async def _apply_changes(
+        self,
+        db: AsyncSession,
+        language_pair: LanguagePair,
+        state: _PairState,
+    ) -> None:
+        """Reload only the lessons changed since the snapshot's watermark."""
+        result = await db.execute(
+            select(ContentChange.id, ContentChange.lesson_id)
+            .where(ContentChange.language_pair == language_pair)
+            .where(ContentChange.id > state.snapshot.watermark)
+        )
+        changes = result.all()
+        state.checked_at = time.monotonic()
+        if not changes:
+            return
+        
+        lesson_ids = {lesson_id for _, lesson_id in changes}
+        if len(lesson_ids) > self.MAX_INCREMENTAL_LESSONS:
+            await self._rebuild(db, language_pair, state)
+            return
+        
+        result = await db.execute(
+            select(Lesson)
+            .where(Lesson.id.in_(lesson_ids))
+            .where(Lesson.status == LessonStatus.PUBLISHED)
+        )
+        for lesson_id in lesson_ids:
+            state.documents.pop(lesson_id, None)
+        for document in await load_lesson_documents(db, result.scalars().all()):
+            state.documents[document["id"]] = public_lesson_document(document)
+        
+        self._assemble(language_pair, state, max(change_id for change_id, _ in changes))
+    
+    async def _rebuild(
+        self,
+        db: AsyncSession,
+        language_pair: LanguagePair,
+        state: _PairState,
+    ) -> None:
+        """Rebuild a language pair's snapshot from the database."""
+        started = time.perf_counter()
+        # Read the watermark first: changes committed while loading are
+        # included in the documents and merely re-sent by the next delta
+        watermark = await current_watermark(db, language_pair)
+        result = await db.execute(
+            select(Lesson)
+            .where(Lesson.status == LessonStatus.PUBLISHED)
+            .where(Lesson.language_pair == language_pair)
+        )
+        documents = await load_lesson_documents(db, result.scalars().all())
+        state.documents = {
+            document["id"]: public_lesson_document(document) for document in documents
+        }
+        self._assemble(language_pair, state, watermark)
+        logger.info(
+            "Built %s catalog snapshot: %d lessons in %.1fms",
+            language_pair.value,
+            len(documents),
+            (time.perf_counter() - started) * 1000,
+        )
+    
+    def _assemble(
+        self,
+        language_pair: LanguagePair,
+        state: _PairState,
+        watermark: int,
+    ) -> None:
+        """Serialize the pair's lesson documents into a new snapshot."""
+        body = json.dumps(
+            {
+                "language_pair": language_pair.value,
+                "lessons": sorted(state.documents.values(), key=_sort_key),
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        
+        state.snapshot = CatalogSnapshot(
+            language_pair=language_pair,
+            etag=hashlib.sha256(body).hexdigest(),
+            body=body,
+            gzip_body=gzip.compress(body, mtime=0),
+            lesson_count=len(state.documents),
+            watermark=watermark,
+        )
+        state.checked_at = time.monotonic()
+        self._write_to_disk(state.snapshot)
+    
+    def _paths(self, language_pair: LanguagePair) -> Tuple[Path, Path]:
+        return (
+            self.snapshot_dir / f"{language_pair.value}.json",
+            self.snapshot_dir / f"{language_pair.value}.meta.json",
+        )
+    
+    def _write_to_disk(self, snapshot: CatalogSnapshot) -> None:
+        """Persist a snapshot atomically when a snapshot directory is configured."""
+        if self.snapshot_dir is None:
+            return
+        
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            body_path, meta_path = self._paths(snapshot.language_pair)
+            for path, content in (
+                (body_path, snapshot.body),
+                (meta_path, json.dumps({
+                    "etag": snapshot.etag,
+                    "watermark": snapshot.watermark,
+                }).encode("utf-8")),
+            ):
+                tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write catalog snapshot to disk: {e}")
+    
+    def _load_from_disk(self, language_pair: LanguagePair, state: _PairState) -> None:
+        """Seed a cold pair from disk; the watermark check validates it."""
+        if self.snapshot_dir is None:
+            return
+        
+        body_path, meta_path = self._paths(language_pair)
+        try:
+            meta = json.loads(meta_path.read_bytes())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return
+        
+        if hashlib.sha256(body).hexdigest() != meta.get("etag") or "watermark" not in meta:
+            return
+        
+        documents = json.loads(body)["lessons"]
+        state.documents = {document["id"]: document for document in documents}
+        state.snapshot = CatalogSnapshot(
+            language_pair=language_pair,
+            etag=meta["etag"],
+            body=body,
+            gzip_body=gzip.compress(body, mtime=0),
+            lesson_count=len(documents),
+            watermark=meta["watermark"],
+        )
+
+
+# Process-wide store
+catalog_store = CatalogStore(
+    snapshot_dir=settings.CATALOG_SNAPSHOT_DIR,
+    revalidate_seconds=settings.CATALOG_REVALIDATE_SECONDS,
+)
@@ -0,0 +1,104 @@
+"""
+Change log for lesson content, used by client delta sync.
+
+Writers record changes inside the transaction that makes them. Recording
+takes a transaction-scoped advisory lock first, so change ids are
+allocated in commit order: once a reader has seen change N, no change with
+a lower id can still become visible.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lesson import ChangeType, ContentChange, LanguagePair, Lesson, LessonStatus
+from app.services.lesson_content import load_lesson_documents, public_lesson_document
+
+
+# Advisory lock key serializing change-log writers ("lsnc")
+CHANGE_LOG_LOCK_KEY = 0x6C736E63
+
+# Change types that remove a lesson from clients
+REMOVAL_CHANGES = {ChangeType.UNPUBLISHED, ChangeType.DELETED}
+
+
+async def record_lesson_changes(
+    db: AsyncSession,
+    lessons: Iterable[Tuple[int, LanguagePair]],
+    change_type: ChangeType,
+) -> None:
+    """
+    Append change entries for (lesson_id, language_pair) pairs.
+    
+    Call as late as possible before commit: the change-log lock is held
+    until the transaction ends.
+    """
+    rows = [
+        {"lesson_id": lesson_id, "language_pair": language_pair, "change_type": change_type}
+        for lesson_id, language_pair in lessons
+    ]
+    if not rows:
+        return
+    
+    await db.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK_KEY)))
+    await db.execute(insert(ContentChange), rows)
+
+
+async def current_watermark(db: AsyncSession, language_pair: LanguagePair) -> int:
+    """Latest change id for a language pair (0 if none)."""
+    result = await db.execute(
+        select(func.max(ContentChange.id)).where(ContentChange.language_pair == language_pair)
+    )
+    return result.scalar() or 0
+
+
+async def get_changes(
+    db: AsyncSession,
+    since: int,
+    language_pair: Optional[LanguagePair] = None,
+    limit: int = 500,
+) -> Dict[str, Any]:
+    """
+    Collapse changes after a watermark into a client delta.
+    
+    Lessons touched since the watermark that are currently published are
+    returned in full; lessons unpublished or deleted since the watermark
+    are returned as tombstone ids. Draft-only activity is omitted.
+    
+    Returns:
+        Dict with watermark, has_more, lessons and deleted
+    """
+    query = select(ContentChange).where(ContentChange.id > since)
+    if language_pair:
+        query = query.where(ContentChange.language_pair == language_pair)
+    result = await db.execute(query.order_by(ContentChange.id).limit(limit + 1))
+    changes = result.scalars().all()
+    
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    touched = {change.lesson_id for change in changes}
+    removed = {
+        change.lesson_id for change in changes if change.change_type in REMOVAL_CHANGES
+    }
+    
+    lessons = []
+    if touched:
+        published = (await db.execute(
+            select(Lesson)
+            .where(Lesson.id.in_(touched))
+            .where(Lesson.status == LessonStatus.PUBLISHED)
+            .order_by(Lesson.id)
+        )).scalars().all()
+        lessons = [
+            public_lesson_document(document)
+            for document in await load_lesson_documents(db, published)
+        ]
+        removed -= {lesson.id for lesson in published}
+    
+    return {
+        "watermark": changes[-1].id if changes else since,
+        "has_more": has_more,
+        "lessons": lessons,
+        "deleted": sorted(removed),
+    }
@@ -0,0 +1,98 @@
+"""
+Text embedding backends.
+
+The knowledge base indexer talks to an Embedder rather than to OpenAI
+directly, so the pipeline can run offline against StubEmbedder, which
+returns deterministic vectors and can simulate request latency.
+"""
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+
+class Embedder(ABC):
+    """Embeds batches of texts into float32 vectors of a fixed dimension"""
+    
+    model_name: str
+    dimensions: int
+    
+    @abstractmethod
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """One vector per text, as a (len(texts), dimensions) float32 array."""
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeddings from the OpenAI API, one request per batch"""
+    
+    def __init__(self, api_key: Optional[str], model_name: str, dimensions: int) -> None:
+        from openai import AsyncOpenAI
+        
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self._client = AsyncOpenAI(api_key=api_key)
+    
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        kwargs = {}
+        # Only the text-embedding-3 models accept a reduced dimension
+        if self.model_name.startswith("text-embedding-3"):
+            kwargs["dimensions"] = self.dimensions
+        response = await self._client.embeddings.create(
+            model=self.model_name,
+            input=list(texts),
+            **kwargs
+        )
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+
+
+class StubEmbedder(Embedder):
+    """
+    Deterministic offline embedder for tests and benchmarks.
+    
+    Each text maps to a unit vector seeded from its hash. Every call sleeps
+    latency_seconds plus per_text_seconds for each text, roughly modelling
+    the round trip and throughput of a remote embeddings API.
+    """
+    
+    def __init__(
+        self,
+        dimensions: int,
+        model_name: str = "stub",
+        latency_seconds: float = 0.0,
+        per_text_seconds: float = 0.0,
+    ) -> None:
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.latency_seconds = latency_seconds
+        self.per_text_seconds = per_text_seconds
+        self.calls = 0
+        self.texts = 0
+    
+    def vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls += 1
+        self.texts += len(texts)
+        delay = self.latency_seconds + self.per_text_seconds * len(texts)
+        if delay:
+            await asyncio.sleep(delay)
+        return np.stack([self.vector(text) for text in texts])
+
+
+def create_embedder() -> Embedder:
+    """Embedder selected by EMBEDDING_BACKEND."""
+    if settings.EMBEDDING_BACKEND == "stub":
+        return StubEmbedder(settings.EMBEDDING_DIMENSIONS, model_name=f"stub-{settings.EMBEDDING_MODEL}")
+    return OpenAIEmbedder(
+        api_key=settings.OPENAI_API_KEY,
+        model_name=settings.EMBEDDING_MODEL,
+        dimensions=settings.EMBEDDING_DIMENSIONS,
+    )
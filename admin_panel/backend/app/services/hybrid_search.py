@@ -0,0 +1,205 @@
+"""
+Hybrid lexical + vector retrieval over knowledge base chunks.
+
+Embeddings blur proper nouns and transliterations ("Lalibela", "injera",
+"ቡና") that a query names exactly, so a hybrid search also runs a
+full-text search on chunk_text and merges the two rankings with reciprocal
+rank fusion: each chunk scores the sum of 1 / (rrf_k + rank) over the
+rankings it appears in. Fusion only looks at ranks, so the legs' scores
+(cosine distance and ts_rank) never need to be made comparable.
+
+The legs run concurrently on separate connections. The lexical leg doesn't
+wait for the query embedding, so it usually finishes while the embeddings
+API is still answering.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadSessionLocal
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource, chunk_tsvector
+from app.services.embeddings import Embedder
+from app.services.knowledge_search import source_filters, vector_search
+
+
+# Words of a query that are looked up; the rest are ignored
+MAX_QUERY_TERMS = 32
+
+
+@dataclass
+class LexicalHit:
+    embedding_id: int
+    source_id: int
+    title: str
+    chunk_index: int
+    chunk_text: str
+    # ts_rank, normalized by the log of the chunk's length
+    rank: float
+
+
+@dataclass
+class HybridHit:
+    embedding_id: int
+    source_id: int
+    title: str
+    chunk_index: int
+    chunk_text: str
+    # Reciprocal rank fusion score, higher is better
+    score: float
+    # 1-based rank in each leg, None if the leg didn't return the chunk
+    vector_rank: Optional[int] = None
+    lexical_rank: Optional[int] = None
+    # Cosine distance, if the vector leg returned the chunk
+    distance: Optional[float] = None
+
+
+@dataclass
+class HybridResult:
+    hits: List[HybridHit]
+    # Strategy of the vector leg ("ann", "exact" or "memory")
+    vector_strategy: str
+    embed_ms: float
+    vector_ms: float
+    lexical_ms: float
+    elapsed_ms: float
+
+
+def text_query(query: str):
+    """
+    tsquery matching chunks that contain any word of query, or None.
+    
+    Words are combined with OR rather than AND: a chunk that matches only
+    the proper noun in a longer question should still be a candidate.
+    """
+    words = list(dict.fromkeys(query.split()))[:MAX_QUERY_TERMS]
+    if not words:
+        return None
+    terms = [func.plainto_tsquery(text("'simple'"), word) for word in words]
+    combined = terms[0]
+    for term in terms[1:]:
+        combined = combined.op("||")(term)
+    return combined
+
+
+async def lexical_search(
+    db: AsyncSession,
+    query: str,
+    k: int,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    include_inactive: bool = False,
+) -> List[LexicalHit]:
+    """The k chunks ranking highest for query by full-text search."""
+    tsquery = text_query(query)
+    if tsquery is None:
+        return []
+    rank = func.ts_rank(chunk_tsvector, tsquery, 1).label("rank")
+    rows = (await db.execute(
+        select(
+            KnowledgeEmbedding.id,
+            KnowledgeEmbedding.source_id,
+            KnowledgeSource.title,
+            KnowledgeEmbedding.chunk_index,
+            KnowledgeEmbedding.chunk_text,
+            rank,
+        )
+        .join(KnowledgeSource, KnowledgeSource.id == KnowledgeEmbedding.source_id)
+        .where(chunk_tsvector.bool_op("@@")(tsquery), *source_filters(category, language, include_inactive))
+        .order_by(rank.desc(), KnowledgeEmbedding.id)
+        .limit(k)
+    )).all()
+    return [
+        LexicalHit(
+            embedding_id=row[0],
+            source_id=row[1],
+            title=row[2],
+            chunk_index=row[3],
+            chunk_text=row[4],
+            rank=float(row[5]),
+        )
+        for row in rows
+    ]
+
+
+def fuse(vector_hits: list, lexical_hits: List[LexicalHit], k: int, rrf_k: int) -> List[HybridHit]:
+    """Merge two rankings by reciprocal rank fusion and keep the top k."""
+    fused: Dict[int, HybridHit] = {}
+    for leg, hits in (("vector", vector_hits), ("lexical", lexical_hits)):
+        for rank, hit in enumerate(hits, start=1):
+            entry = fused.get(hit.embedding_id)
+            if entry is None:
+                entry = fused[hit.embedding_id] = HybridHit(
+                    embedding_id=hit.embedding_id,
+                    source_id=hit.source_id,
+                    title=hit.title,
+                    chunk_index=hit.chunk_index,
+                    chunk_text=hit.chunk_text,
+                    score=0.0,
+                )
+            entry.score += 1 / (rrf_k + rank)
+            if leg == "vector":
+                entry.vector_rank = rank
+                entry.distance = hit.distance
+            else:
+                entry.lexical_rank = rank
+    # Ties (same ranks in swapped legs) go to the vector leg's pick
+    return sorted(fused.values(), key=lambda hit: (-hit.score, hit.vector_rank or k + 1))[:k]
+
+
+async def hybrid_search(
+    query: str,
+    embedder: Embedder,
+    k: int,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    include_inactive: bool = False,
+    candidates: Optional[int] = None,
+    rrf_k: Optional[int] = None,
+) -> HybridResult:
+    """
+    The top k chunks for query by both legs, fused.
+    
+    Each leg contributes its best `candidates` chunks (at least k). The
+    legs open their own sessions so they can run at the same time: the
+    lexical leg reads through ReadSessionLocal, the vector leg needs a
+    transaction for its per-search settings.
+    """
+    started = time.perf_counter()
+    candidates = max(candidates or settings.HYBRID_SEARCH_CANDIDATES, k)
+    rrf_k = rrf_k if rrf_k is not None else settings.HYBRID_SEARCH_RRF_K
+    
+    async def lexical_leg() -> Tuple[List[LexicalHit], float]:
+        leg_started = time.perf_counter()
+        async with ReadSessionLocal() as db:
+            hits = await lexical_search(db, query, candidates, category, language, include_inactive)
+        return hits, (time.perf_counter() - leg_started) * 1000
+    
+    async def vector_leg():
+        leg_started = time.perf_counter()
+        vector = (await embedder.embed([query]))[0]
+        embed_ms = (time.perf_counter() - leg_started) * 1000
+        async with AsyncSessionLocal() as db:
+            result = await vector_search(
+                db,
+                vector,
+                candidates,
+                category=category,
+                language=language,
+                include_inactive=include_inactive,
+            )
+        return result, embed_ms
+    
+    (lexical_hits, lexical_ms), (vector_result, embed_ms) = await asyncio.gather(lexical_leg(), vector_leg())
+    return HybridResult(
+        hits=fuse(vector_result.hits, lexical_hits, k, rrf_k),
+        vector_strategy=vector_result.strategy,
+        embed_ms=embed_ms,
+        vector_ms=vector_result.elapsed_ms,
+        lexical_ms=lexical_ms,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,507 @@
+"""
+Knowledge base ingestion: chunk sources, embed the chunks, store the vectors.
+
+Unindexed sources are read in keyset pages and split into token-bounded
+chunks. Chunks from many sources are packed into embedding requests capped
+by EMBEDDING_BATCH_SIZE texts and EMBEDDING_BATCH_TOKENS tokens, and up to
+EMBEDDING_CONCURRENCY requests are in flight at once, so indexing the whole
+knowledge base is bound by the embedding API's throughput rather than its
+round trip. Chunks whose text and model match a stored row keep that row's
+vector, so editing one paragraph re-embeds one chunk. A source is written
+as soon as its new chunks are embedded: one transaction bulk-inserts the
+new vectors, renumbers reused rows, deletes orphaned ones and sets
+is_indexed.
+"""
+import asyncio
+import codecs
+import hashlib
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import Integer, any_, delete, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource
+from app.services.embeddings import Embedder, create_embedder
+
+
+logger = logging.getLogger(__name__)
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# Latin sentence ends need trailing whitespace; Ethiopic full stop and
+# question mark end a sentence on their own
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[።፧])\s*")
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str):
+    """tiktoken encoding for an embedding model (downloaded once, then cached on disk)."""
+    import tiktoken
+    
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        # Models newer than the installed tiktoken; all OpenAI embedding
+        # models use cl100k_base
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    text: str
+    tokens: int
+
+
+class TokenChunker:
+    """
+    Splits text into chunks of at most max_tokens tokens.
+    
+    Paragraphs are the unit: a long paragraph is split at sentence ends
+    (and, failing that, at token boundaries), and a paragraph shorter than
+    min_tokens, such as a heading, is merged into the one after it. Chunk
+    boundaries depend only on neighbouring paragraphs, so editing one
+    paragraph leaves the other chunks of a source unchanged.
+    """
+    
+    def __init__(self, encoding, max_tokens: int, min_tokens: int) -> None:
+        self.encoding = encoding
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+    
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+    
+    def split(self, text: str) -> List[Chunk]:
+        pieces: List[Chunk] = []
+        for paragraph in _PARAGRAPH_BREAK.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            tokens = self.count(paragraph)
+            if tokens <= self.max_tokens:
+                pieces.append(Chunk(paragraph, tokens))
+            else:
+                pieces.extend(self._split_paragraph(paragraph))
+        
+        chunks: List[Chunk] = []
+        pending: Optional[Chunk] = None
+        for piece in pieces:
+            if pending is not None:
+                merged = f"{pending.text}\n\n{piece.text}"
+                tokens = self.count(merged)
+                if tokens <= self.max_tokens:
+                    piece = Chunk(merged, tokens)
+                else:
+                    chunks.append(pending)
+                pending = None
+            if piece.tokens < self.min_tokens:
+                pending = piece
+            else:
+                chunks.append(piece)
+        if pending is not None:
+            chunks.append(pending)
+        return chunks
+    
+    def _split_paragraph(self, paragraph: str) -> List[Chunk]:
+        """Pack the sentences of an oversized paragraph into chunks."""
+        chunks: List[Chunk] = []
+        current: List[str] = []
+        current_tokens = 0
+        for sentence in _SENTENCE_END.split(paragraph):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            tokens = self.count(sentence)
+            if current and current_tokens + tokens + 1 > self.max_tokens:
+                chunks.append(Chunk(" ".join(current), current_tokens))
+                current, current_tokens = [], 0
+            if tokens > self.max_tokens:
+                chunks.extend(self._split_tokens(sentence))
+                continue
+            current.append(sentence)
+            current_tokens += tokens + (1 if len(current) > 1 else 0)
+        if current:
+            chunks.append(Chunk(" ".join(current), current_tokens))
+        return chunks
+    
+    def _split_tokens(self, text: str) -> List[Chunk]:
+        """Cut text every max_tokens tokens without splitting a character."""
+        tokens = self.encoding.encode(text, disallowed_special=())
+        # Tokens may end inside a multi-byte character (common for Ethiopic
+        # script); the incremental decoder carries the partial bytes over
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        chunks: List[Chunk] = []
+        for start in range(0, len(tokens), self.max_tokens):
+            window = tokens[start:start + self.max_tokens]
+            final = start + self.max_tokens >= len(tokens)
+            piece = decoder.decode(self.encoding.decode_bytes(window), final=final).strip()
+            if piece:
+                chunks.append(Chunk(piece, len(window)))
+        return chunks
+
+
+def chunk_hash(text: str, model_name: str) -> str:
+    """Identity of a vector: the same text embedded by the same model."""
+    return hashlib.sha256(f"{model_name}\x1f{text}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IndexingStats:
+    """Counters for one indexing run"""
+    sources: int = 0
+    # Sources edited while being embedded; left for the next run
+    skipped: int = 0
+    # Chunks of the indexed sources: embedded, or reused from existing rows
+    chunks: int = 0
+    embedded: int = 0
+    reused: int = 0
+    deleted: int = 0
+    # Tokens sent to the embedder
+    tokens: int = 0
+    requests: int = 0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    seconds: float = 0.0
+    
+    def as_dict(self) -> dict:
+        return {
+            **self.__dict__,
+            "chunks_per_second": round(self.chunks / self.seconds, 1) if self.seconds else 0.0,
+        }
+
+
+@dataclass
+class _PendingSource:
+    """A source's new chunk set diffed against its stored rows"""
+    id: int
+    updated_at: datetime
+    chunks: List[Chunk]
+    hashes: List[str]
+    # Ids of the stored rows the plan was made against
+    stored_ids: FrozenSet[int]
+    # Chunks no stored row matches, and their vectors once embedded
+    to_embed: List[int] = field(default_factory=list)
+    vectors: Dict[int, np.ndarray] = field(default_factory=dict)
+    # Reused rows whose chunk_index changes, and rows no chunk matches
+    moved: List[Dict[str, int]] = field(default_factory=list)
+    orphans: List[int] = field(default_factory=list)
+    reused: int = 0
+    remaining: int = 0
+
+
+class KnowledgeIndexer:
+    """
+    Embeds unindexed knowledge sources with bounded concurrency.
+    
+    Each source's chunks are diffed against its stored rows by content
+    hash: matching rows keep their vectors (moving to a new chunk_index if
+    needed), only new or changed chunks are embedded, and rows nothing
+    matches are deleted. Reading sources waits for a free request slot, so
+    at most concurrency batches plus one page of sources are held in memory.
+    """
+    
+    # Sources written per transaction
+    WRITE_BATCH = 200
+    
+    def __init__(
+        self,
+        embedder: Embedder,
+        chunker: TokenChunker,
+        batch_size: int,
+        batch_tokens: int,
+        concurrency: int,
+        page_size: int = 100,
+    ) -> None:
+        self.embedder = embedder
+        self.chunker = chunker
+        self.batch_size = batch_size
+        self.batch_tokens = batch_tokens
+        self.concurrency = concurrency
+        self.page_size = page_size
+    
+    async def _pending_sources(self, limit: Optional[int]) -> AsyncIterator[Tuple[int, str, datetime, list]]:
+        """
+        Active unindexed sources in id order with their stored (id, chunk_index,
+        content_hash) rows, one short transaction per page.
+        """
+        last_id = 0
+        seen = 0
+        while limit is None or seen < limit:
+            page_size = self.page_size if limit is None else min(self.page_size, limit - seen)
+            async with AsyncSessionLocal() as session:
+                rows = (await session.execute(
+                    select(KnowledgeSource.id, KnowledgeSource.content, KnowledgeSource.updated_at)
+                    .where(
+                        KnowledgeSource.is_indexed.is_(False),
+                        KnowledgeSource.is_active.is_(True),
+                        KnowledgeSource.id > last_id,
+                    )
+                    .order_by(KnowledgeSource.id)
+                    .limit(page_size)
+                )).all()
+                stored: Dict[int, list] = {}
+                if rows:
+                    result = await session.execute(
+                        select(
+                            KnowledgeEmbedding.source_id,
+                            KnowledgeEmbedding.id,
+                            KnowledgeEmbedding.chunk_index,
+                            KnowledgeEmbedding.content_hash,
+                        )
+                        .where(KnowledgeEmbedding.source_id.in_([row[0] for row in rows]))
+                    )
+                    for source_id, *embedding in result:
+                        stored.setdefault(source_id, []).append(embedding)
+            for source_id, content, updated_at in rows:
+                yield source_id, content, updated_at, stored.get(source_id, [])
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
+            seen += len(rows)
+    
+    def _plan(self, source_id: int, updated_at: datetime, content: str, stored: list) -> _PendingSource:
+        """Chunk a source and match the chunks to its stored rows."""
+        chunks = self.chunker.split(content)
+        model_name = self.embedder.model_name
+        source = _PendingSource(
+            source_id,
+            updated_at,
+            chunks,
+            [chunk_hash(chunk.text, model_name) for chunk in chunks],
+            frozenset(row_id for row_id, _, _ in stored),
+        )
+        
+        reusable: Dict[str, List[Tuple[int, int]]] = {}
+        for row_id, chunk_index, content_hash in stored:
+            if content_hash is not None:
+                reusable.setdefault(content_hash, []).append((row_id, chunk_index))
+        kept: Set[int] = set()
+        for index, content_hash in enumerate(source.hashes):
+            candidates = reusable.get(content_hash)
+            if not candidates:
+                source.to_embed.append(index)
+                continue
+            # A repeated chunk prefers the row already at its position
+            position = next((i for i, (_, old) in enumerate(candidates) if old == index), 0)
+            row_id, old_index = candidates.pop(position)
+            kept.add(row_id)
+            if old_index != index:
+                source.moved.append({"id": row_id, "chunk_index": index})
+        
+        source.orphans = [row_id for row_id, _, _ in stored if row_id not in kept]
+        source.reused = len(kept)
+        source.remaining = len(source.to_embed)
+        return source
+    
+    async def index_pending(self, limit: Optional[int] = None) -> IndexingStats:
+        """Chunk, embed and store every unindexed active source (up to limit)."""
+        stats = IndexingStats()
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(self.concurrency)
+        ready: asyncio.Queue = asyncio.Queue()
+        tasks: Set[asyncio.Task] = set()
+        failures: List[BaseException] = []
+        
+        def track(task: asyncio.Task) -> None:
+            tasks.add(task)
+            task.add_done_callback(done)
+        
+        def done(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                failures.append(task.exception())
+        
+        writer = asyncio.create_task(self._write_ready(ready, stats))
+        writer.add_done_callback(done)
+        batch: List[Tuple[_PendingSource, int]] = []
+        batch_tokens = 0
+        
+        async def submit() -> None:
+            nonlocal batch, batch_tokens
+            await slots.acquire()
+            if failures:
+                slots.release()
+                raise failures[0]
+            track(asyncio.create_task(self._embed(batch, slots, ready, stats)))
+            batch, batch_tokens = [], 0
+        
+        try:
+            async for source_id, content, updated_at, stored in self._pending_sources(limit):
+                source = self._plan(source_id, updated_at, content, stored)
+                if not source.to_embed:
+                    ready.put_nowait(source)
+                    continue
+                for index in source.to_embed:
+                    chunk = source.chunks[index]
+                    if batch and (
+                        len(batch) >= self.batch_size
+                        or batch_tokens + chunk.tokens > self.batch_tokens
+                    ):
+                        await submit()
+                    batch.append((source, index))
+                    batch_tokens += chunk.tokens
+            if batch:
+                await submit()
+            
+            await asyncio.gather(*tasks)
+            if failures:
+                raise failures[0]
+            ready.put_nowait(None)
+            await writer
+        except BaseException:
+            for task in (*tasks, writer):
+                task.cancel()
+            await asyncio.gather(*tasks, writer, return_exceptions=True)
+            raise
+        
+        stats.seconds = time.perf_counter() - started
+        logger.info("Indexed knowledge sources: %s", stats.as_dict())
+        return stats
+    
+    async def _embed(
+        self,
+        batch: List[Tuple[_PendingSource, int]],
+        slots: asyncio.Semaphore,
+        ready: asyncio.Queue,
+        stats: IndexingStats,
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            vectors = await self.embedder.embed([source.chunks[index].text for source, index in batch])
+        finally:
+            slots.release()
+        stats.requests += 1
+        stats.embed_seconds += time.perf_counter() - started
+        
+        for (source, index), vector in zip(batch, vectors):
+            source.vectors[index] = vector
+            source.remaining -= 1
+            if source.remaining == 0:
+                ready.put_nowait(source)
+    
+    async def _write_ready(self, ready: asyncio.Queue, stats: IndexingStats) -> None:
+        """Write embedded sources as they complete, up to WRITE_BATCH per transaction."""
+        finished = False
+        while not finished:
+            sources = [await ready.get()]
+            while len(sources) < self.WRITE_BATCH and not ready.empty():
+                sources.append(ready.get_nowait())
+            finished = sources[-1] is None
+            sources = [source for source in sources if source is not None]
+            if sources:
+                await self._write(sources, stats)
+    
+    async def _write(self, sources: List[_PendingSource], stats: IndexingStats) -> None:
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as session:
+            # Lock the sources unchanged since they were read, so concurrent
+            # indexer runs write each source in turn (in id order, so they
+            # can't deadlock). A source whose stored rows another run has
+            # rewritten since this one planned it is skipped; applying the
+            # plan would duplicate that run's rows.
+            locked = set((await session.scalars(
+                select(KnowledgeSource.id)
+                .where(
+                    tuple_(KnowledgeSource.id, KnowledgeSource.updated_at).in_(
+                        [(source.id, source.updated_at) for source in sources]
+                    )
+                )
+                .order_by(KnowledgeSource.id)
+                .with_for_update()
+            )).all())
+            current: Dict[int, Set[int]] = {}
+            if locked:
+                result = await session.execute(
+                    select(KnowledgeEmbedding.source_id, KnowledgeEmbedding.id)
+                    .where(KnowledgeEmbedding.source_id.in_(locked))
+                )
+                for source_id, row_id in result:
+                    current.setdefault(source_id, set()).add(row_id)
+            written = [
+                source for source in sources
+                if source.id in locked and current.get(source.id, set()) == source.stored_ids
+            ]
+            
+            if written:
+                # updated_at is kept so indexing doesn't look like an edit
+                await session.execute(
+                    update(KnowledgeSource)
+                    .where(KnowledgeSource.id.in_([source.id for source in written]))
+                    .values(is_indexed=True, updated_at=KnowledgeSource.updated_at)
+                )
+            orphans = [row_id for source in written for row_id in source.orphans]
+            if orphans:
+                await session.execute(
+                    delete(KnowledgeEmbedding)
+                    .where(KnowledgeEmbedding.id == any_(literal(orphans, ARRAY(Integer))))
+                )
+            moved = [row for source in written for row in source.moved]
+            if moved:
+                await session.execute(update(KnowledgeEmbedding), moved)
+            rows = [
+                {
+                    "source_id": source.id,
+                    "chunk_index": index,
+                    "chunk_text": source.chunks[index].text,
+                    "content_hash": source.hashes[index],
+                    "embedding": vector,
+                    "model_name": self.embedder.model_name,
+                }
+                for source in written
+                for index, vector in source.vectors.items()
+            ]
+            if rows:
+                await session.execute(insert(KnowledgeEmbedding), rows)
+            await session.commit()
+        
+        stats.write_seconds += time.perf_counter() - started
+        stats.sources += len(written)
+        stats.skipped += len(sources) - len(written)
+        stats.deleted += len(orphans)
+        for source in written:
+            stats.chunks += len(source.chunks)
+            stats.embedded += len(source.to_embed)
+            stats.reused += source.reused
+            stats.tokens += sum(source.chunks[index].tokens for index in source.to_embed)
+    
+    async def reindex_all(self) -> IndexingStats:
+        """
+        Re-index every active source, e.g. after changing the embedding model
+        or chunk sizes.
+        
+        Chunks whose text and model are unchanged keep their vectors, and
+        existing vectors stay searchable until each source is rewritten.
+        """
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(KnowledgeSource)
+                .where(KnowledgeSource.is_active.is_(True))
+                .values(is_indexed=False, updated_at=KnowledgeSource.updated_at)
+            )
+            await session.commit()
+        return await self.index_pending()
+
+
+def create_indexer(embedder: Optional[Embedder] = None, encoding=None) -> KnowledgeIndexer:
+    """Indexer configured from settings."""
+    embedder = embedder or create_embedder()
+    chunker = TokenChunker(
+        encoding or get_encoding(settings.EMBEDDING_MODEL),
+        max_tokens=settings.EMBEDDING_CHUNK_TOKENS,
+        min_tokens=settings.EMBEDDING_CHUNK_MIN_TOKENS,
+    )
+    return KnowledgeIndexer(
+        embedder,
+        chunker,
+        batch_size=settings.EMBEDDING_BATCH_SIZE,
+        batch_tokens=settings.EMBEDDING_BATCH_TOKENS,
+        concurrency=settings.EMBEDDING_CONCURRENCY,
+    )
@@ -0,0 +1,240 @@
+"""
+Top-k cosine search over knowledge base chunks.
+
+Searches walk the HNSW index on kb_embeddings.embedding, joined to
+kb_sources for the category, language and is_active filters. An HNSW scan
+yields at most hnsw.ef_search candidates, so a selective filter can leave
+fewer than k of them; the search then retries with a wider ef_search. If
+even the widest scan comes up short, the filter matches so few chunks that
+an exact scan of just those (through the source_id index) is cheap, so no
+path falls back to scanning the whole table.
+
+memory_search shortlists candidates from the in-process vector index
+instead and only reads (and exactly re-ranks) those from the database.
+"""
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource
+from app.services.vector_index import vector_index
+
+
+# Each widening step multiplies ef_search by this much
+EF_SEARCH_GROWTH = 4
+# memory_search re-ranks this many candidates per hit by exact distance
+MEMORY_SEARCH_CANDIDATES = 4
+
+
+@dataclass
+class SearchHit:
+    embedding_id: int
+    source_id: int
+    title: str
+    chunk_index: int
+    chunk_text: str
+    distance: float
+
+
+@dataclass
+class SearchResult:
+    hits: List[SearchHit]
+    # "ann" for the index, "exact" for the filtered exact scan, "memory"
+    # for the in-process index
+    strategy: str
+    # Widest ef_search used (None for the in-process index)
+    ef_search: Optional[int]
+    elapsed_ms: float
+
+
+def source_filters(
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    include_inactive: bool = False,
+) -> list:
+    """WHERE conditions on KnowledgeSource for a search."""
+    conditions = []
+    if not include_inactive:
+        conditions.append(KnowledgeSource.is_active.is_(True))
+    if category is not None:
+        conditions.append(KnowledgeSource.category == category)
+    if language is not None:
+        conditions.append(KnowledgeSource.language == language)
+    return conditions
+
+
+def _hits_query(vector: Sequence[float], conditions: list):
+    distance = KnowledgeEmbedding.embedding.cosine_distance(vector).label("distance")
+    return (
+        select(
+            KnowledgeEmbedding.id,
+            KnowledgeEmbedding.source_id,
+            KnowledgeSource.title,
+            KnowledgeEmbedding.chunk_index,
+            KnowledgeEmbedding.chunk_text,
+            distance,
+        )
+        .join(KnowledgeSource, KnowledgeSource.id == KnowledgeEmbedding.source_id)
+        .where(*conditions)
+    ), distance
+
+
+async def search_chunks(
+    db: AsyncSession,
+    vector: Sequence[float],
+    k: int,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    include_inactive: bool = False,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> SearchResult:
+    """
+    The k chunks nearest to vector by cosine distance.
+    
+    ef_search (HNSW) and probes (IVFFlat) trade recall for latency and
+    apply to this search only; they are set with SET LOCAL, so db must be
+    a transactional session (get_db, not get_read_db).
+    """
+    started = time.perf_counter()
+    conditions = source_filters(category, language, include_inactive)
+    query, distance = _hits_query(vector, conditions)
+    ann = query.order_by(distance).limit(k)
+    
+    # ef_search below k could never return k rows
+    ef = max(ef_search or settings.VECTOR_SEARCH_EF_SEARCH, k)
+    max_ef = max(settings.VECTOR_SEARCH_MAX_EF_SEARCH, ef)
+    if probes is not None:
+        await db.execute(text("SELECT set_config('ivfflat.probes', :value, true)"), {"value": str(probes)})
+    while True:
+        await db.execute(text("SELECT set_config('hnsw.ef_search', :value, true)"), {"value": str(ef)})
+        rows = (await db.execute(ann)).all()
+        if len(rows) >= k or ef >= max_ef:
+            break
+        ef = min(ef * EF_SEARCH_GROWTH, max_ef)
+    strategy = "ann"
+    
+    if len(rows) < k:
+        # The filter matches few chunks: rank all of them exactly. The CTE
+        # is materialized so the planner can't swap in the HNSW scan again.
+        candidates = query.cte("candidates").prefix_with("MATERIALIZED")
+        rows = (await db.execute(
+            select(candidates).order_by(candidates.c.distance).limit(k)
+        )).all()
+        strategy = "exact"
+    
+    return SearchResult(
+        hits=[
+            SearchHit(
+                embedding_id=row[0],
+                source_id=row[1],
+                title=row[2],
+                chunk_index=row[3],
+                chunk_text=row[4],
+                distance=float(row[5]),
+            )
+            for row in rows
+        ],
+        strategy=strategy,
+        ef_search=ef,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+async def exact_search(
+    db: AsyncSession,
+    vector: Sequence[float],
+    k: int,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    include_inactive: bool = False,
+) -> List[int]:
+    """Embedding ids of the true k nearest chunks, by sequential scan (for recall checks)."""
+    query, distance = _hits_query(vector, source_filters(category, language, include_inactive))
+    await db.execute(text("SET LOCAL enable_indexscan = off"))
+    rows = (await db.execute(query.order_by(distance).limit(k))).all()
+    await db.execute(text("SET LOCAL enable_indexscan = on"))
+    return [row[0] for row in rows]
+
+
+async def memory_search(
+    db: AsyncSession,
+    vector: Sequence[float],
+    k: int,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+) -> SearchResult:
+    """
+    The k chunks nearest to vector, shortlisted by the in-process vector index.
+    
+    The index's int8 scores only pick MEMORY_SEARCH_CANDIDATES times k
+    candidates; the database re-ranks those by exact distance while
+    reading their text. Chunks deleted or deactivated since the index's
+    last refresh are dropped, so a search can come back with fewer than k
+    hits.
+    """
+    started = time.perf_counter()
+    conditions = source_filters(category, language)
+    source_ids = None
+    if category is not None or language is not None:
+        source_ids = (await db.scalars(select(KnowledgeSource.id).where(*conditions))).all()
+    candidates = (await vector_index.search_async(vector, k * MEMORY_SEARCH_CANDIDATES, source_ids))[0]
+    
+    rows = []
+    if candidates:
+        query, distance = _hits_query(vector, conditions)
+        rows = (await db.execute(
+            query.where(KnowledgeEmbedding.id.in_([embedding_id for embedding_id, _, _ in candidates]))
+            .order_by(distance)
+            .limit(k)
+        )).all()
+    return SearchResult(
+        hits=[
+            SearchHit(
+                embedding_id=row[0],
+                source_id=row[1],
+                title=row[2],
+                chunk_index=row[3],
+                chunk_text=row[4],
+                distance=float(row[5]),
+            )
+            for row in rows
+        ],
+        strategy="memory",
+        ef_search=None,
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+async def vector_search(
+    db: AsyncSession,
+    vector: Sequence[float],
+    k: int,
+    category: Optional[str] = None,
+    language: Optional[str] = None,
+    include_inactive: bool = False,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> SearchResult:
+    """
+    memory_search when the in-process index is loaded and can answer (it
+    holds active sources only and has no tuning knobs), else search_chunks.
+    Until the first export is published the index isn't loaded, so searches
+    go to Postgres.
+    """
+    if vector_index.loaded and not include_inactive and ef_search is None and probes is None:
+        return await memory_search(db, vector, k, category=category, language=language)
+    return await search_chunks(
+        db,
+        vector,
+        k,
+        category=category,
+        language=language,
+        include_inactive=include_inactive,
+        ef_search=ef_search,
+        probes=probes,
+    )
@@ -0,0 +1,85 @@
+"""
+Serialization of lessons with their exercises and conversation dialogs.
+"""
+import enum
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lesson import Lesson, Exercise, ConversationDialog
+
+
+# Admin-only columns left out of client-facing documents
+PRIVATE_LESSON_FIELDS = ("created_by", "updated_by")
+
+
+def columns_dict(row: Any) -> Dict[str, Any]:
+    """Serialize a model row's columns to JSON-compatible values."""
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, row.__mapper__.get_property_by_column(column).key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.value
+        data[column.name] = value
+    return data
+
+
+async def load_lesson_documents(
+    db: AsyncSession,
+    lessons: Sequence[Lesson],
+) -> List[Dict[str, Any]]:
+    """
+    Build nested documents for a batch of lessons.
+    
+    Exercises (ordered by order) and their dialogs (ordered by order) are
+    loaded with one query each for the whole batch.
+    
+    Returns:
+        One dict per lesson, in the order given, with an "exercises" list
+        whose items carry a "dialogs" list
+    """
+    if not lessons:
+        return []
+    
+    exercises = (await db.execute(
+        select(Exercise)
+        .where(Exercise.lesson_id.in_([lesson.id for lesson in lessons]))
+        .order_by(Exercise.lesson_id, Exercise.order, Exercise.id)
+    )).scalars().all()
+    
+    dialogs_by_exercise = defaultdict(list)
+    if exercises:
+        dialogs = (await db.execute(
+            select(ConversationDialog)
+            .where(ConversationDialog.exercise_id.in_([exercise.id for exercise in exercises]))
+            .order_by(
+                ConversationDialog.exercise_id, ConversationDialog.order, ConversationDialog.id
+            )
+        )).scalars().all()
+        for dialog in dialogs:
+            dialogs_by_exercise[dialog.exercise_id].append(columns_dict(dialog))
+    
+    exercises_by_lesson = defaultdict(list)
+    for exercise in exercises:
+        exercise_data = columns_dict(exercise)
+        exercise_data["dialogs"] = dialogs_by_exercise.get(exercise.id, [])
+        exercises_by_lesson[exercise.lesson_id].append(exercise_data)
+    
+    documents = []
+    for lesson in lessons:
+        lesson_data = columns_dict(lesson)
+        lesson_data["exercises"] = exercises_by_lesson.get(lesson.id, [])
+        documents.append(lesson_data)
+    return documents
+
+
+def public_lesson_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip admin-only fields from a lesson document."""
+    for field in PRIVATE_LESSON_FIELDS:
+        document.pop(field, None)
+    return document
@@ -0,0 +1,186 @@
+"""
+Login throttling per email address and per client IP.
+
+Every login attempt reserves a slot in a sliding window for both its email
+and its IP before the user is looked up or a password is hashed, so once a
+key is over RATE_LIMIT_LOGIN_ATTEMPTS the attempt is turned away for the
+cost of a dictionary lookup. A successful admin login clears its keys.
+
+The in-process backend suits a single worker. With several workers, set
+LOGIN_THROTTLE_BACKEND=database so they share attempts through Postgres.
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from sqlalchemy import String, any_, delete, exists, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import LoginAttempt
+
+
+def login_keys(email: str, client_ip: Optional[str]) -> List[str]:
+    """Throttle keys for one login attempt."""
+    keys = [f"email:{email.strip().lower()}"]
+    if client_ip:
+        keys.append(f"ip:{client_ip}")
+    return keys
+
+
+class LoginThrottleBackend(ABC):
+    """Storage for sliding-window attempt counts"""
+    
+    @abstractmethod
+    async def acquire(self, keys: Sequence[str], limit: int, window_seconds: float) -> float:
+        """
+        Record an attempt against every key unless one of them is full.
+        
+        Returns:
+            0 if the attempt was recorded, otherwise seconds until a slot frees
+        """
+    
+    @abstractmethod
+    async def reset(self, keys: Sequence[str]) -> None:
+        """Forget all attempts for the keys."""
+
+
+class MemoryLoginThrottle(LoginThrottleBackend):
+    """
+    Per-process sliding log of attempt times.
+    
+    Each key keeps at most limit timestamps, and at most max_keys keys are
+    tracked; past that the least recently attempted key is forgotten.
+    """
+    
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, Deque[float]]" = OrderedDict()
+    
+    async def acquire(self, keys: Sequence[str], limit: int, window_seconds: float) -> float:
+        now = time.monotonic()
+        cutoff = now - window_seconds
+        retry_after = 0.0
+        
+        for key in keys:
+            log = self._attempts.get(key)
+            if log is None:
+                continue
+            while log and log[0] <= cutoff:
+                log.popleft()
+            if len(log) >= limit:
+                retry_after = max(retry_after, log[0] + window_seconds - now)
+        if retry_after:
+            return retry_after
+        
+        for key in keys:
+            log = self._attempts.get(key)
+            if log is None:
+                log = self._attempts[key] = deque(maxlen=limit)
+            else:
+                self._attempts.move_to_end(key)
+            log.append(now)
+        while len(self._attempts) > self.max_keys:
+            self._attempts.popitem(last=False)
+        return 0.0
+    
+    async def reset(self, keys: Sequence[str]) -> None:
+        for key in keys:
+            self._attempts.pop(key, None)
+
+
+class DatabaseLoginThrottle(LoginThrottleBackend):
+    """
+    Attempts shared through the login_attempts table.
+    
+    Checking, recording and purging expired rows is a single statement.
+    Concurrent attempts on the same key can overshoot the limit by the
+    number of attempts racing, which is acceptable for throttling.
+    """
+    
+    async def acquire(self, keys: Sequence[str], limit: int, window_seconds: float) -> float:
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(seconds=window_seconds)
+        key_array = literal(list(keys), ARRAY(String))
+        
+        blocked = (
+            select(func.min(LoginAttempt.attempted_at).label("oldest"))
+            .where(
+                LoginAttempt.key == any_(key_array),
+                LoginAttempt.attempted_at > since,
+            )
+            .group_by(LoginAttempt.key)
+            .having(func.count() >= limit)
+            .cte("blocked")
+        )
+        recorded = (
+            insert(LoginAttempt)
+            .from_select(
+                ["key", "attempted_at"],
+                select(func.unnest(key_array), literal(now))
+                .where(~exists(select(blocked.c.oldest))),
+            )
+            .cte("recorded")
+        )
+        purged = delete(LoginAttempt).where(LoginAttempt.attempted_at <= since).cte("purged")
+        statement = select(func.max(blocked.c.oldest)).add_cte(recorded).add_cte(purged)
+        
+        async with AsyncSessionLocal() as session:
+            oldest = (await session.execute(statement)).scalar_one()
+            await session.commit()
+        
+        if oldest is None:
+            return 0.0
+        return max((oldest + timedelta(seconds=window_seconds) - now).total_seconds(), 1.0)
+    
+    async def reset(self, keys: Sequence[str]) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(LoginAttempt).where(LoginAttempt.key == any_(literal(list(keys), ARRAY(String))))
+            )
+            await session.commit()
+
+
+class LoginThrottle:
+    """Sliding-window login limiter over a pluggable backend"""
+    
+    def __init__(self, backend: LoginThrottleBackend, limit: int, window_seconds: float) -> None:
+        self.backend = backend
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.rejected = 0
+    
+    async def acquire(self, keys: Sequence[str]) -> float:
+        """Reserve an attempt; returns seconds to wait if throttled, else 0."""
+        retry_after = await self.backend.acquire(keys, self.limit, self.window_seconds)
+        if retry_after:
+            self.rejected += 1
+        return retry_after
+    
+    async def reset(self, keys: Sequence[str]) -> None:
+        """Clear attempts after a successful login."""
+        await self.backend.reset(keys)
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "limit": self.limit,
+            "window_seconds": self.window_seconds,
+            "rejected": self.rejected,
+        }
+
+
+def _create_backend() -> LoginThrottleBackend:
+    if settings.LOGIN_THROTTLE_BACKEND == "database":
+        return DatabaseLoginThrottle()
+    return MemoryLoginThrottle(max_keys=settings.LOGIN_THROTTLE_MAX_KEYS)
+
+
+login_throttle = LoginThrottle(
+    backend=_create_backend(),
+    limit=settings.RATE_LIMIT_LOGIN_ATTEMPTS,
+    window_seconds=settings.RATE_LIMIT_LOGIN_WINDOW_MINUTES * 60,
+)
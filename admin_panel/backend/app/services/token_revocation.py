@@ -0,0 +1,218 @@
+"""
+Revoked token store.
+
+Revoked jtis live in the revoked_tokens table until the token would have
+expired anyway. Each worker loads the unexpired ones at startup and then
+polls for rows revoked since its last sync, so checking a token on the
+request path never queries the database.
+
+In memory, a Bloom filter answers the common case (a token that was never
+revoked) from a few bit tests; only a possible hit is confirmed against the
+exact set of jtis, so false positives never reject a valid token.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.security import register_revocation_check
+from app.models.user import RevokedToken
+
+
+logger = logging.getLogger(__name__)
+
+# Rows are re-read this far behind the newest revocation seen, so a row
+# committed late by a slow transaction is still picked up by the next sync
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    
+    Sized for capacity items at the given false positive rate; the k bit
+    positions come from one blake2b digest by double hashing.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _hashes(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+    
+    def add(self, item: str) -> None:
+        h1, h2 = self._hashes(item)
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % self.size
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        # Most lookups are misses and stop at the first clear bit
+        h1, h2 = self._hashes(item)
+        bits, size = self._bits, self.size
+        for i in range(self.hash_count):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationStore:
+    """
+    In-memory view of revoked_tokens for this worker.
+    
+    Expired jtis are pruned on sync; since a Bloom filter cannot forget, the
+    filter is rebuilt from the exact set whenever entries are pruned or it
+    outgrows its capacity.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float, sync_interval: float) -> None:
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._revoked: Dict[str, datetime] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self.checks = 0
+        self.bloom_passes = 0
+        self.rejected = 0
+    
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Whether a jti has been revoked; tokens without one never are."""
+        if not jti:
+            return False
+        self.checks += 1
+        if jti not in self._bloom:
+            return False
+        self.bloom_passes += 1
+        if jti in self._revoked:
+            self.rejected += 1
+            return True
+        return False
+    
+    def _add(self, jti: str, expires_at: datetime) -> None:
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        if self._bloom.count >= self._bloom.capacity:
+            self._rebuild(capacity=self._bloom.capacity * 2)
+        else:
+            self._bloom.add(jti)
+    
+    def _rebuild(self, capacity: int) -> None:
+        bloom = BloomFilter(capacity, self.error_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+    
+    async def revoke(self, jti: str, expires_at: datetime) -> bool:
+        """
+        Revoke a jti in the database and in this worker.
+        
+        Returns:
+            False if the jti had already been revoked, e.g. by a concurrent
+            request rotating the same refresh token
+        """
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                insert(RevokedToken)
+                .values(jti=jti, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+                .returning(RevokedToken.jti)
+            )
+            inserted = result.scalar_one_or_none() is not None
+            await session.commit()
+        self._add(jti, expires_at)
+        return inserted
+    
+    async def load(self) -> None:
+        """Load every unexpired revocation; called once at startup."""
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+                .where(RevokedToken.expires_at > now)
+            )).all()
+        
+        self._revoked = {jti: expires_at for jti, expires_at, _ in rows}
+        self._rebuild(capacity=max(settings.REVOKED_TOKEN_BLOOM_CAPACITY, 2 * len(self._revoked)))
+        self._watermark = max((revoked_at for _, _, revoked_at in rows), default=now)
+        logger.info("Loaded %d revoked tokens", len(self._revoked))
+    
+    async def sync(self) -> None:
+        """Pick up revocations made by other workers and prune expired ones."""
+        now = datetime.now(timezone.utc)
+        since = (self._watermark or now) - SYNC_OVERLAP
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+                .where(RevokedToken.revoked_at > since, RevokedToken.expires_at > now)
+            )).all()
+            await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            await session.commit()
+        
+        for jti, expires_at, revoked_at in rows:
+            self._add(jti, expires_at)
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+        
+        expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+        if expired:
+            for jti in expired:
+                del self._revoked[jti]
+            self._rebuild(capacity=self._bloom.capacity)
+    
+    async def _sync_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Revoked token sync failed")
+    
+    def start_sync(self) -> None:
+        """Start polling for new revocations on the running loop, once."""
+        if self._sync_task is None:
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync_forever())
+    
+    async def stop_sync(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "revoked": len(self._revoked),
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hash_count,
+            "checks": self.checks,
+            "bloom_passes": self.bloom_passes,
+            "rejected": self.rejected,
+        }
+
+
+revocation_store = RevocationStore(
+    capacity=settings.REVOKED_TOKEN_BLOOM_CAPACITY,
+    error_rate=settings.REVOKED_TOKEN_BLOOM_ERROR_RATE,
+    sync_interval=settings.REVOKED_TOKEN_SYNC_SECONDS,
+)
+
+register_revocation_check(lambda payload: revocation_store.is_revoked(payload.get("jti")))
@@ -0,0 +1,128 @@
+"""
+Per-process cache of user profiles.
+
+Admin requests check the caller's role and status, and the admin frontend
+polls /admin/auth/me; both read the same few fields of the user row.
+Profiles are cached for a short TTL and dropped as soon as a session that
+wrote the user commits, so password, role or status changes take effect on
+this worker immediately and on other workers within the TTL.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.user import User, UserRole, UserStatus
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    """The non-secret fields of a user row"""
+    id: int
+    email: str
+    full_name: Optional[str]
+    role: UserRole
+    status: UserStatus
+    is_subscribed: bool
+    created_at: datetime
+    last_login: Optional[datetime]
+    
+    @property
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN
+    
+    @property
+    def is_active(self) -> bool:
+        return self.status == UserStatus.ACTIVE
+
+
+class UserProfileCache:
+    """
+    TTL cache of UserProfile by user id, bounded to max_entries.
+    
+    A load that races with an invalidation is not stored, so a commit
+    never leaves an older profile behind in the cache.
+    """
+    
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[float, UserProfile]]" = OrderedDict()
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+    
+    async def get(self, user_id: int) -> Optional[UserProfile]:
+        """Profile for user_id, loading it on a miss; None if there is no such user."""
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        invalidations = self._invalidations
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(User).where(User.id == user_id))
+            user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        
+        profile = UserProfile(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            status=user.status,
+            is_subscribed=user.is_subscribed,
+            created_at=user.created_at,
+            last_login=user.last_login,
+        )
+        if invalidations == self._invalidations:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, profile)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile
+    
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's profile; call after writing users outside the ORM."""
+        self._invalidations += 1
+        self._entries.pop(user_id, None)
+    
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+user_profiles = UserProfileCache(ttl_seconds=settings.USER_PROFILE_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_users(session: Session, flush_context: Any) -> None:
+    written = session.info.setdefault("written_user_ids", set())
+    written.update(
+        obj.id for obj in chain(session.dirty, session.deleted) if isinstance(obj, User)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_users(session: Session) -> None:
+    for user_id in session.info.pop("written_user_ids", ()):
+        user_profiles.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_users(session: Session) -> None:
+    session.info.pop("written_user_ids", None)
@@ -0,0 +1,465 @@
+"""
+In-process vector index over memory-mapped files.
+
+The vectors of active knowledge sources are exported to VECTOR_INDEX_DIR as
+an int8 matrix with per-row scales (a quarter of the float32 size) plus an
+id sidecar, and searched by brute force with blocked NumPy matrix products
+and argpartition. Every worker maps the same files read-only, so the OS
+page cache holds one copy however many workers there are.
+
+One worker at a time (whichever holds the directory's lock) refreshes the
+files from the database: rows past the id watermark are appended, and when
+the live rows below the watermark stop matching the index (compared by
+count and sums of their ids), a full id diff tombstones deleted or
+deactivated rows and restores re-activated ones. The
+manifest is replaced atomically after the data files are written, so
+readers only ever map complete rows. Tombstoned rows are compacted away
+into a new file generation once they make up a tenth of the index.
+"""
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import BigInteger, Numeric, func, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource
+
+
+logger = logging.getLogger(__name__)
+
+# Rows converted to float32 per matrix product; the 1.5 MB scratch block
+# stays in cache between the conversion and the product
+BLOCK_ROWS = 256
+# Rows fetched per query while refreshing
+FETCH_ROWS = 2000
+# Searches over more rows than this (about a millisecond of work) run in a
+# thread, off the event loop
+OFFLOAD_ROWS = 2_000
+# Compact once this fraction of rows are tombstones
+COMPACT_FRACTION = 0.1
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit-normalize rows and quantize them to int8 with one scale per row."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127
+    quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+class _Files:
+    """Paths of one generation of index files"""
+    
+    def __init__(self, directory: Path, generation: int) -> None:
+        self.vectors = directory / f"{generation}.vectors.i8"
+        self.scales = directory / f"{generation}.scales.f4"
+        # (embedding id, source id) pairs
+        self.ids = directory / f"{generation}.ids.i8"
+    
+    def all(self) -> List[Path]:
+        return [self.vectors, self.scales, self.ids]
+
+
+class VectorIndex:
+    """
+    Memory-mapped int8 vector index with an id sidecar.
+    
+    Readers reload the manifest at most once per reload_interval; refresh()
+    is safe to call from every worker and is a no-op in all but the one
+    holding the lock.
+    """
+    
+    MANIFEST = "manifest.json"
+    
+    def __init__(
+        self,
+        directory: Optional[str],
+        dimensions: int,
+        refresh_interval: float,
+        reload_interval: float = 1.0,
+    ) -> None:
+        self.directory = Path(directory) if directory else None
+        self.dimensions = dimensions
+        self.refresh_interval = refresh_interval
+        self.reload_interval = reload_interval
+        self._manifest: Dict[str, Any] = {}
+        self._manifest_mtime: Optional[int] = None
+        self._checked_at = 0.0
+        # (vectors, scales, ids, live mask), swapped as a whole so searches
+        # in other threads see one consistent mapping
+        self._mapped: Optional[Tuple[np.ndarray, ...]] = None
+        self._scratch = threading.local()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.searches = 0
+        self.refreshes = 0
+        self.appended = 0
+        self.tombstoned = 0
+        self.compactions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+    
+    @property
+    def rows(self) -> int:
+        """Live (searchable) rows"""
+        return int(self._mapped[3].sum()) if self._mapped else 0
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether a published index is mapped (picking up a new one if due)"""
+        if not self.enabled:
+            return False
+        self.reload()
+        return self._mapped is not None
+    
+    # Reading
+    
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads((self.directory / self.MANIFEST).read_text())
+        except FileNotFoundError:
+            return {"generation": 0, "rows": 0, "last_id": 0, "deleted": [], "dimensions": self.dimensions}
+    
+    def reload(self, force: bool = False) -> None:
+        """Map the files again if another worker has published a new manifest."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = (self.directory / self.MANIFEST).stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if not force and mtime == self._manifest_mtime:
+            return
+        
+        manifest = self._read_manifest()
+        rows = manifest["rows"]
+        files = _Files(self.directory, manifest["generation"])
+        if rows:
+            try:
+                vectors = np.memmap(files.vectors, dtype=np.int8, mode="r", shape=(rows, self.dimensions))
+                scales = np.memmap(files.scales, dtype=np.float32, mode="r", shape=(rows,))
+                ids = np.memmap(files.ids, dtype=np.int64, mode="r", shape=(rows, 2))
+            except FileNotFoundError:
+                # Compacted away since the manifest was read; retry next time
+                return
+            live = ~np.isin(ids[:, 0], np.asarray(manifest["deleted"], dtype=np.int64))
+            self._mapped = (vectors, scales, ids, live)
+        else:
+            self._mapped = None
+        self._manifest, self._manifest_mtime = manifest, mtime
+    
+    def _buffer(self, rows: int) -> np.ndarray:
+        # One float32 block per thread, reused across searches
+        buffer = getattr(self._scratch, "buffer", None)
+        if buffer is None or len(buffer) < rows:
+            buffer = self._scratch.buffer = np.empty((rows, self.dimensions), dtype=np.float32)
+        return buffer[:rows]
+    
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        source_ids: Optional[Collection[int]] = None,
+    ) -> List[List[Tuple[int, int, float]]]:
+        """
+        Top k rows by cosine similarity for each query in a batch.
+        
+        Args:
+            queries: (n, dimensions) array, or one vector
+            k: Results per query
+            source_ids: Only consider rows of these sources
+        
+        Returns:
+            Per query, (embedding id, source id, similarity) best first
+        """
+        self.reload()
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        self.searches += len(queries)
+        if self._mapped is None:
+            return [[] for _ in queries]
+        vectors, scales, ids, mask = self._mapped
+        rows = len(vectors)
+        
+        scores = np.empty((len(queries), rows), dtype=np.float32)
+        buffer = self._buffer(min(BLOCK_ROWS, rows))
+        for start in range(0, rows, BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, rows)
+            block = buffer[:stop - start]
+            np.copyto(block, vectors[start:stop], casting="unsafe")
+            np.matmul(queries, block.T, out=scores[:, start:stop])
+        scores *= scales
+        
+        if source_ids is not None:
+            mask = mask & np.isin(ids[:, 1], np.fromiter(source_ids, dtype=np.int64))
+        candidates = int(mask.sum())
+        if candidates < rows:
+            scores[:, ~mask] = -np.inf
+        k = min(k, candidates)
+        if k <= 0:
+            return [[] for _ in queries]
+        
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for query_scores, query_top in zip(scores, top):
+            query_top = query_top[np.argsort(-query_scores[query_top])]
+            results.append([
+                (int(ids[row, 0]), int(ids[row, 1]), float(query_scores[row]))
+                for row in query_top
+            ])
+        return results
+    
+    async def search_async(self, queries: np.ndarray, k: int, source_ids: Optional[Collection[int]] = None):
+        """search(), in a thread when the index is large enough to stall the event loop."""
+        self.reload()
+        if self._mapped is not None and len(self._mapped[0]) > OFFLOAD_ROWS:
+            return await asyncio.to_thread(self.search, queries, k, source_ids)
+        return self.search(queries, k, source_ids)
+    
+    # Writing
+    
+    def _publish(self, manifest: Dict[str, Any]) -> None:
+        path = self.directory / self.MANIFEST
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(manifest))
+        os.replace(temporary, path)
+        self.reload(force=True)
+    
+    def _append(self, files: _Files, rows: int, ids: np.ndarray, vectors: np.ndarray) -> int:
+        """Write rows after the first `rows`, dropping any unpublished tail."""
+        quantized, scales = quantize(vectors)
+        for path, data, row_bytes in (
+            (files.vectors, quantized, self.dimensions),
+            (files.scales, scales, 4),
+            (files.ids, ids.astype(np.int64), 16),
+        ):
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                f.truncate(rows * row_bytes)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(data).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.appended += len(ids)
+        return rows + len(ids)
+    
+    def _live_rows(self, *conditions):
+        return (
+            select(KnowledgeEmbedding.id)
+            .join(KnowledgeSource, KnowledgeSource.id == KnowledgeEmbedding.source_id)
+            .where(
+                KnowledgeSource.is_active.is_(True),
+                KnowledgeEmbedding.embedding.is_not(None),
+                *conditions
+            )
+        )
+    
+    async def _pages(self, *conditions) -> AsyncIterator[Tuple[np.ndarray, np.ndarray]]:
+        """(embedding id, source id) pairs and vectors of live rows, in id order, a page at a time."""
+        last_id = 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                batch = (await session.execute(
+                    self._live_rows(KnowledgeEmbedding.id > last_id, *conditions)
+                    .add_columns(
+                        KnowledgeEmbedding.source_id,
+                        # pgvector's binary format: a 4 byte header, then
+                        # big-endian float32s
+                        func.vector_send(KnowledgeEmbedding.embedding),
+                    )
+                    .order_by(KnowledgeEmbedding.id)
+                    .limit(FETCH_ROWS)
+                )).all()
+            if batch:
+                yield (
+                    np.asarray([(embedding_id, source_id) for embedding_id, source_id, _ in batch], dtype=np.int64),
+                    np.frombuffer(b"".join(vector[4:] for _, _, vector in batch), dtype=">f4")
+                    .astype(np.float32)
+                    .reshape(-1, self.dimensions),
+                )
+            if len(batch) < FETCH_ROWS:
+                break
+            last_id = batch[-1][0]
+    
+    async def _export(self, files: _Files, rows: int, *conditions) -> Tuple[int, Optional[int]]:
+        """
+        Append the live rows matching conditions, one fetched page at a time.
+        
+        Returns:
+            The new row count, and the highest id appended (None if none were)
+        """
+        last_id = None
+        async for ids, vectors in self._pages(*conditions):
+            rows = await asyncio.to_thread(self._append, files, rows, ids, vectors)
+            last_id = int(ids[-1, 0])
+        return rows, last_id
+    
+    async def refresh(self) -> bool:
+        """
+        Bring the files up to date with the database.
+        
+        Returns:
+            False if another worker holds the lock (and is refreshing)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.reload()
+                return False
+            await self._refresh_locked()
+        self.refreshes += 1
+        return True
+    
+    async def _refresh_locked(self) -> None:
+        manifest = self._read_manifest()
+        generation = manifest["generation"]
+        if manifest.get("dimensions") != self.dimensions:
+            # Start over in a new generation
+            generation += 1
+            manifest = {"rows": 0, "last_id": 0, "deleted": []}
+        files = _Files(self.directory, generation)
+        rows, last_id = manifest["rows"], manifest["last_id"]
+        deleted = set(manifest["deleted"])
+        
+        # New rows past the watermark
+        rows, appended_id = await self._export(files, rows, KnowledgeEmbedding.id > last_id)
+        if appended_id is not None:
+            last_id = appended_id
+        
+        # Below the watermark, rows can be deleted, their source deactivated
+        # or re-activated, or committed after a higher id was already seen.
+        # Only diff the ids when the count, sum and sum of squares of the
+        # live ids say something changed; a bare count would miss one source
+        # deactivated while another of the same size is re-activated.
+        live_id = KnowledgeEmbedding.id.cast(BigInteger)
+        async with AsyncSessionLocal() as session:
+            live_summary = tuple((await session.execute(
+                self._live_rows(KnowledgeEmbedding.id <= last_id)
+                .with_only_columns(
+                    func.count(),
+                    func.coalesce(func.sum(live_id), 0),
+                    func.coalesce(func.sum(live_id.cast(Numeric) * live_id), 0),
+                )
+                .order_by(None)
+            )).one())
+        indexed = set((await asyncio.to_thread(self._indexed_ids, files, rows)).tolist())
+        searchable = indexed - deleted
+        if live_summary != (len(searchable), sum(searchable), sum(i * i for i in searchable)):
+            async with AsyncSessionLocal() as session:
+                live = set((await session.scalars(self._live_rows(KnowledgeEmbedding.id <= last_id))).all())
+            gone = indexed - deleted - live
+            self.tombstoned += len(gone)
+            # Vectors never change under an id, so re-activated rows just
+            # lose their tombstone
+            deleted = (deleted | gone) - live
+            missing = live - indexed
+            if missing:
+                rows, _ = await self._export(files, rows, KnowledgeEmbedding.id.in_(sorted(missing)))
+        
+        manifest = {
+            "generation": generation,
+            "dimensions": self.dimensions,
+            "rows": rows,
+            "last_id": last_id,
+            "deleted": sorted(deleted),
+        }
+        if deleted and len(deleted) >= COMPACT_FRACTION * rows:
+            manifest = await asyncio.to_thread(self._compact, manifest)
+        await asyncio.to_thread(self._publish, manifest)
+        await asyncio.to_thread(self._remove_stale_files)
+    
+    @staticmethod
+    def _indexed_ids(files: _Files, rows: int) -> np.ndarray:
+        """Embedding ids of the first `rows` rows."""
+        if not rows:
+            return np.empty(0, dtype=np.int64)
+        return np.fromfile(files.ids, dtype=np.int64, count=rows * 2)[::2]
+    
+    def _compact(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the live rows into a new generation of files."""
+        rows, generation = manifest["rows"], manifest["generation"]
+        old, new = _Files(self.directory, generation), _Files(self.directory, generation + 1)
+        ids = np.fromfile(old.ids, dtype=np.int64, count=rows * 2).reshape(rows, 2)
+        keep = ~np.isin(ids[:, 0], np.asarray(manifest["deleted"], dtype=np.int64))
+        for source, target, dtype, width in (
+            (old.vectors, new.vectors, np.int8, self.dimensions),
+            (old.scales, new.scales, np.float32, 1),
+            (old.ids, new.ids, np.int64, 2),
+        ):
+            data = np.fromfile(source, dtype=dtype, count=rows * width).reshape(rows, width)
+            data[keep].tofile(target)
+        self.compactions += 1
+        return {**manifest, "generation": generation + 1, "rows": int(keep.sum()), "deleted": []}
+    
+    def _remove_stale_files(self) -> None:
+        # Workers still mapping an old generation keep reading it until they
+        # reload; unlinking doesn't invalidate their mappings
+        current = set(_Files(self.directory, self._manifest["generation"]).all())
+        for path in self.directory.glob("*.*.*"):
+            if path.suffix in (".i8", ".f4") and path not in current:
+                path.unlink(missing_ok=True)
+    
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Vector index refresh failed")
+            await asyncio.sleep(self.refresh_interval)
+    
+    def start_refresh(self) -> None:
+        """
+        Refresh now and then periodically on the running loop, once.
+        
+        The first refresh may be a full export; searches fall back to
+        Postgres until it is published.
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_forever())
+    
+    async def stop_refresh(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+    
+    def metrics(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "rows": self.rows,
+            "tombstones": len(self._manifest.get("deleted", [])),
+            "generation": self._manifest.get("generation"),
+            "last_id": self._manifest.get("last_id"),
+            "mapped_bytes": len(self._mapped[0]) * (self.dimensions + 4 + 16) if self._mapped else 0,
+            "searches": self.searches,
+            "refreshes": self.refreshes,
+            "appended": self.appended,
+            "tombstoned": self.tombstoned,
+            "compactions": self.compactions,
+        }
+
+
+vector_index = VectorIndex(
+    settings.VECTOR_INDEX_DIR,
+    dimensions=settings.EMBEDDING_DIMENSIONS,
+    refresh_interval=settings.VECTOR_INDEX_REFRESH_SECONDS,
+)
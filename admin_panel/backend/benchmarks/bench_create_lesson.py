@@ -0,0 +1,129 @@
+"""
+Benchmark POST /admin/lessons/ at 1, 20 and 200 exercises per lesson,
+against the legacy check-then-flush-then-add-each-exercise implementation.
+
+Usage:
+    python benchmarks/bench_create_lesson.py --iterations 100
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from common import admin_client, drop_bench_user, ensure_bench_user, report, time_async
+
+from fastapi import Depends
+from slugify import slugify
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.admin.lessons import LessonCreate
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.security import verify_admin_token
+from app.models.lesson import ChangeType, Exercise, Lesson, LessonStatus
+from app.services.content_changes import record_lesson_changes
+
+
+TITLE_PREFIX = "Benchmark create "
+EXERCISE_COUNTS = (1, 20, 200)
+
+
+async def legacy_create_lesson(
+    lesson_data: LessonCreate,
+    token_data: dict = Depends(verify_admin_token),
+    db: AsyncSession = Depends(get_db),
+):
+    """The previous implementation of create_lesson."""
+    user_id = int(token_data["sub"])
+    slug = slugify(lesson_data.title)
+    existing = await db.execute(select(Lesson).where(Lesson.slug == slug))
+    if existing.scalar_one_or_none():
+        slug = f"{slug}-{datetime.now().timestamp()}"
+    
+    lesson = Lesson(
+        title=lesson_data.title,
+        description=lesson_data.description,
+        slug=slug,
+        language_pair=lesson_data.language_pair,
+        level=lesson_data.level,
+        unit_number=lesson_data.unit_number,
+        lesson_number=lesson_data.lesson_number,
+        skill_id=lesson_data.skill_id,
+        xp_reward=lesson_data.xp_reward,
+        estimated_minutes=lesson_data.estimated_minutes,
+        status=LessonStatus.DRAFT,
+        created_by=user_id,
+        version=1,
+    )
+    db.add(lesson)
+    await db.flush()
+    
+    for exercise_data in lesson_data.exercises:
+        db.add(Exercise(
+            lesson_id=lesson.id,
+            type=exercise_data.type,
+            question=exercise_data.question,
+            question_audio_url=exercise_data.question_audio_url,
+            question_image_url=exercise_data.question_image_url,
+            answer_data=exercise_data.answer_data,
+            hint=exercise_data.hint,
+            explanation=exercise_data.explanation,
+            order=exercise_data.order,
+        ))
+    
+    await record_lesson_changes(db, [(lesson.id, lesson.language_pair)], ChangeType.CREATED)
+    await db.commit()
+    await db.refresh(lesson)
+    return {"id": lesson.id}
+
+
+def lesson_payload(exercise_count: int) -> dict:
+    return {
+        "title": f"{TITLE_PREFIX}{exercise_count}",
+        "language_pair": "en_am",
+        "level": "beginner",
+        "exercises": [
+            {
+                "type": "multiple_choice",
+                "question": f"How do you say coffee? ({n})",
+                "answer_data": {"options": ["ቡና", "ሻይ", "ውሃ"], "correct": 0},
+                "order": n,
+            }
+            for n in range(exercise_count)
+        ],
+    }
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Lesson).where(Lesson.title.startswith(TITLE_PREFIX)))
+        await session.commit()
+    await drop_bench_user()
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.main import app
+    
+    app.add_api_route("/bench/legacy-create", legacy_create_lesson, methods=["POST"])
+    
+    user_id = await ensure_bench_user()
+    try:
+        async with admin_client(user_id) as client:
+            for exercise_count in EXERCISE_COUNTS:
+                payload = lesson_payload(exercise_count)
+                
+                async def before():
+                    (await client.post("/bench/legacy-create", json=payload)).raise_for_status()
+                
+                async def after():
+                    (await client.post("/admin/lessons/", json=payload)).raise_for_status()
+                
+                report(f"before ({exercise_count} exercises)", await time_async(before, args.iterations))
+                report(f"after ({exercise_count} exercises)", await time_async(after, args.iterations))
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,144 @@
+"""
+Latency and precision of hybrid (full-text + vector) knowledge search.
+
+Seeds --sources documents like bench_knowledge_indexing, with a place name
+from NAMES (Latin and Ethiopic script) worked into one paragraph of every
+tenth source, and indexes them with the stub embedder. Then for each name
+it searches "Where is <name>?" with hybrid_search, reporting each leg's
+latency and the total against running the legs one after the other, and
+recall@k of the chunks containing the name, for hybrid and vector search.
+
+Stub embeddings are hashes of the text and carry no meaning, so the
+vector-only recall here is a floor (a real model lands between the
+two); the latencies are what this measures. The embeddings API round trip
+is simulated with --latency.
+
+Amharic full-text matching needs a UTF-8 database; in a SQL_ASCII one the
+Ethiopic names never match.
+
+Usage:
+    python benchmarks/bench_hybrid_search.py --sources 500 --k 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from common import drop_bench_user, ensure_bench_user, report
+
+from sqlalchemy import select
+
+from bench_knowledge_indexing import byte_encoding, cleanup, make_document
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, ReadSessionLocal
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource
+from app.services.embeddings import StubEmbedder
+from app.services.hybrid_search import hybrid_search, lexical_search
+from app.services.knowledge_indexing import KnowledgeIndexer, TokenChunker
+from app.services.knowledge_search import vector_search
+
+
+NAMES = ["Lalibela", "Gondar", "Aksum", "Harar", "Bahir Dar", "ላሊበላ", "ጎንደር", "አክሱም", "ሐረር", "ባሕር ዳር"]
+
+
+async def seed(user_id: int, count: int, paragraphs: int) -> None:
+    rng = random.Random(42)
+    sources = []
+    for i in range(count):
+        content = make_document(rng, paragraphs)
+        if i % 10 == 0:
+            parts = content.split("\n\n")
+            name = NAMES[(i // 10) % len(NAMES)]
+            middle = len(parts) // 2
+            parts[middle] = f"{parts[middle]} {name} {parts[middle]}"
+            content = "\n\n".join(parts)
+        sources.append(KnowledgeSource(
+            title=f"Benchmark source {i}",
+            content=content,
+            category="benchmark",
+            created_by=user_id,
+        ))
+    async with AsyncSessionLocal() as session:
+        session.add_all(sources)
+        await session.commit()
+
+
+async def relevant_chunks(user_id: int) -> dict:
+    """Per name, ids of the chunks containing it."""
+    async with AsyncSessionLocal() as db:
+        return {
+            name: set((await db.scalars(
+                select(KnowledgeEmbedding.id)
+                .join(KnowledgeSource)
+                .where(KnowledgeSource.created_by == user_id, KnowledgeEmbedding.chunk_text.contains(name))
+            )).all())
+            for name in NAMES
+        }
+
+
+def recall(hits: list, relevant: set, k: int) -> float:
+    return len({hit.embedding_id for hit in hits} & relevant) / max(1, min(k, len(relevant)))
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    await cleanup(user_id)
+    embedder = StubEmbedder(settings.EMBEDDING_DIMENSIONS, model_name="stub-hybrid")
+    try:
+        await seed(user_id, args.sources, args.paragraphs)
+        chunker = TokenChunker(byte_encoding(), settings.EMBEDDING_CHUNK_TOKENS, settings.EMBEDDING_CHUNK_MIN_TOKENS)
+        stats = await KnowledgeIndexer(
+            embedder,
+            chunker,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            batch_tokens=settings.EMBEDDING_BATCH_TOKENS,
+            concurrency=settings.EMBEDDING_CONCURRENCY,
+        ).index_pending()
+        print(f"{stats.sources} sources, {stats.chunks} chunks; embeddings API latency {args.latency * 1000:.0f} ms")
+        embedder.latency_seconds = args.latency
+        
+        relevant = await relevant_chunks(user_id)
+        
+        sequential_ms, vector_recall = [], []
+        embed_ms, vector_ms, lexical_ms, hybrid_ms, hybrid_recall = [], [], [], [], []
+        for _ in range(args.rounds):
+            for name in NAMES:
+                query = f"Where is {name}?"
+                # Both legs one after the other, for comparison
+                started = time.perf_counter()
+                vector = (await embedder.embed([query]))[0]
+                async with AsyncSessionLocal() as db:
+                    result = await vector_search(db, vector, settings.HYBRID_SEARCH_CANDIDATES, category="benchmark")
+                async with ReadSessionLocal() as db:
+                    await lexical_search(db, query, settings.HYBRID_SEARCH_CANDIDATES, category="benchmark")
+                sequential_ms.append((time.perf_counter() - started) * 1000)
+                vector_recall.append(recall(result.hits[:args.k], relevant[name], args.k))
+                
+                hybrid = await hybrid_search(query, embedder, args.k, category="benchmark")
+                embed_ms.append(hybrid.embed_ms)
+                vector_ms.append(hybrid.vector_ms)
+                lexical_ms.append(hybrid.lexical_ms)
+                hybrid_ms.append(hybrid.elapsed_ms)
+                hybrid_recall.append(recall(hybrid.hits, relevant[name], args.k))
+        
+        report("hybrid: embed", embed_ms)
+        report("hybrid: vector leg search", vector_ms)
+        report("hybrid: lexical leg", lexical_ms)
+        report("hybrid: total, legs concurrent", hybrid_ms)
+        report("legs sequential, no fusion", sequential_ms)
+        print(f"recall@{args.k} of chunks naming the place: vector only {statistics.fmean(vector_recall):.3f}, "
+              f"hybrid {statistics.fmean(hybrid_recall):.3f}")
+    finally:
+        await cleanup(user_id)
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=500)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
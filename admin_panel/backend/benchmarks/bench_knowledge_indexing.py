@@ -0,0 +1,162 @@
+"""
+Throughput benchmark of knowledge base indexing.
+
+Seeds --sources knowledge sources of mixed Amharic and English paragraphs,
+then indexes them once per --configs entry (batch size:concurrency) with
+the stub embedder, which sleeps --latency seconds per request plus
+--per-text seconds per text to stand in for the embeddings API. Reports
+chunks per second and where the time went. Finally it edits one paragraph
+of every source and re-indexes, which only embeds the changed chunks.
+
+The tokenizer is tiktoken's encoding for EMBEDDING_MODEL; on a machine
+without network access or a cached copy (TIKTOKEN_CACHE_DIR), pass
+--byte-encoding to use a byte-level tiktoken encoding instead.
+
+Usage:
+    python benchmarks/bench_knowledge_indexing.py --sources 200 --configs 16:1,256:1,256:4
+"""
+import argparse
+import asyncio
+import random
+
+from common import drop_bench_user, ensure_bench_user
+
+from sqlalchemy import delete, func, select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource
+from app.services.embeddings import StubEmbedder
+from app.services.knowledge_indexing import KnowledgeIndexer, TokenChunker, get_encoding
+
+
+AMHARIC_WORDS = "ሰላም እንደምን ነህ ቡና ኢትዮጵያ አዲስ አበባ ቤተ ክርስቲያን ገበያ ምግብ ውሃ መንገድ ከተማ ታሪክ ባህል".split()
+ENGLISH_WORDS = "coffee ceremony market highlands church history injera festival river lake city road".split()
+
+
+def byte_encoding():
+    import tiktoken
+    
+    return tiktoken.Encoding(
+        name="bytes",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+
+
+def make_document(rng: random.Random, paragraphs: int) -> str:
+    parts = []
+    for _ in range(paragraphs):
+        if rng.random() < 0.2:
+            parts.append(" ".join(rng.choices(ENGLISH_WORDS, k=4)).title())
+            continue
+        amharic = rng.random() < 0.5
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = rng.choices(AMHARIC_WORDS if amharic else ENGLISH_WORDS, k=rng.randint(6, 14))
+            sentences.append(" ".join(words) + ("።" if amharic else "."))
+        parts.append(" ".join(sentences))
+    return "\n\n".join(parts)
+
+
+async def seed(user_id: int, count: int, paragraphs: int) -> None:
+    rng = random.Random(42)
+    async with AsyncSessionLocal() as session:
+        session.add_all([
+            KnowledgeSource(
+                title=f"Benchmark source {i}",
+                content=make_document(rng, paragraphs),
+                category="benchmark",
+                created_by=user_id,
+            )
+            for i in range(count)
+        ])
+        await session.commit()
+
+
+async def cleanup(user_id: int) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(KnowledgeSource).where(KnowledgeSource.created_by == user_id))
+        await session.commit()
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    await cleanup(user_id)
+    encoding = byte_encoding() if args.byte_encoding else get_encoding(settings.EMBEDDING_MODEL)
+    chunker = TokenChunker(encoding, settings.EMBEDDING_CHUNK_TOKENS, settings.EMBEDDING_CHUNK_MIN_TOKENS)
+    try:
+        await seed(user_id, args.sources, args.paragraphs)
+        print(f"{args.sources} sources, latency {args.latency * 1000:.0f} ms/request "
+              f"+ {args.per_text * 1000:.1f} ms/text")
+        for config in args.configs.split(","):
+            batch_size, concurrency = (int(part) for part in config.split(":"))
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(KnowledgeSource)
+                    .where(KnowledgeSource.created_by == user_id)
+                    .values(is_indexed=False)
+                )
+                await session.commit()
+            
+            # A distinct model name per run, so no stored vector is reused
+            embedder = StubEmbedder(
+                settings.EMBEDDING_DIMENSIONS,
+                model_name=f"stub-{batch_size}-{concurrency}",
+                latency_seconds=args.latency,
+                per_text_seconds=args.per_text,
+            )
+            indexer = KnowledgeIndexer(
+                embedder,
+                chunker,
+                batch_size=batch_size,
+                batch_tokens=settings.EMBEDDING_BATCH_TOKENS,
+                concurrency=concurrency,
+            )
+            stats = await indexer.index_pending()
+            print(
+                f"batch={batch_size:<4} concurrency={concurrency:<3} "
+                f"{stats.sources} sources, {stats.chunks} chunks in {stats.requests} requests: "
+                f"{stats.seconds:7.2f}s  {stats.chunks / stats.seconds:8.1f} chunks/s  "
+                f"(embedding {stats.embed_seconds:6.2f}s summed, writes {stats.write_seconds:5.2f}s)"
+            )
+        
+        # Edit one paragraph per source; re-indexing reuses every other vector
+        async with AsyncSessionLocal() as session:
+            sources = (await session.execute(
+                select(KnowledgeSource).where(KnowledgeSource.created_by == user_id)
+            )).scalars().all()
+            for source in sources:
+                paragraphs = source.content.split("\n\n")
+                middle = len(paragraphs) // 2
+                paragraphs[middle] = f"Edited. {paragraphs[middle]}"
+                source.content = "\n\n".join(paragraphs)
+            await session.commit()
+        stats = await indexer.index_pending()
+        print(
+            f"edit one paragraph per source: {stats.sources} sources, {stats.embedded} chunks embedded "
+            f"in {stats.requests} requests, {stats.reused} reused, {stats.deleted} deleted: {stats.seconds:.2f}s"
+        )
+        
+        async with AsyncSessionLocal() as session:
+            stored = await session.scalar(
+                select(func.count()).select_from(KnowledgeEmbedding)
+                .join(KnowledgeSource)
+                .where(KnowledgeSource.created_by == user_id)
+            )
+        print(f"{stored} vectors stored")
+    finally:
+        await cleanup(user_id)
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--configs", default="16:1,256:1,256:4")
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--per-text", type=float, default=0.0005)
+    parser.add_argument("--byte-encoding", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""
+Benchmark GET /admin/lessons/ against the legacy one-count-per-lesson listing.
+
+Usage:
+    python benchmarks/bench_list_lessons.py --lessons 5000 --iterations 200
+"""
+import argparse
+import asyncio
+import random
+
+from common import admin_client, drop_bench_user, ensure_bench_user, report, time_async
+
+from fastapi import Depends
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, get_db
+from app.models.lesson import Exercise, ExerciseType, LanguagePair, Lesson, LessonLevel
+
+
+SLUG_PREFIX = "bench-list-"
+
+
+async def legacy_list_lessons(
+    skip: int = 0,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_db),
+):
+    """The pre-aggregation implementation: one count query per lesson."""
+    result = await db.execute(
+        select(Lesson).offset(skip).limit(limit).order_by(Lesson.created_at.desc())
+    )
+    response = []
+    for lesson in result.scalars().all():
+        count = await db.execute(
+            select(func.count(Exercise.id)).where(Exercise.lesson_id == lesson.id)
+        )
+        response.append({"id": lesson.id, "exercise_count": count.scalar()})
+    return response
+
+
+async def seed(user_id: int, lesson_count: int, max_exercises: int) -> None:
+    """Insert lessons with a random number of exercises each."""
+    pairs = list(LanguagePair)
+    levels = list(LessonLevel)
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Lesson), [
+            {
+                "title": f"Benchmark lesson {i}",
+                "slug": f"{SLUG_PREFIX}{i}",
+                "language_pair": pairs[i % len(pairs)],
+                "level": levels[i % len(levels)],
+                "created_by": user_id,
+            }
+            for i in range(lesson_count)
+        ])
+        lesson_ids = (await session.execute(
+            select(Lesson.id).where(Lesson.slug.startswith(SLUG_PREFIX))
+        )).scalars().all()
+        exercises = [
+            {
+                "lesson_id": lesson_id,
+                "type": ExerciseType.VOCABULARY,
+                "question": f"Question {n}",
+                "answer_data": {"correct_answers": ["ሰላም"]},
+                "order": n,
+            }
+            for lesson_id in lesson_ids
+            for n in range(random.randint(0, max_exercises))
+        ]
+        if exercises:
+            await session.execute(insert(Exercise), exercises)
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Lesson).where(Lesson.slug.startswith(SLUG_PREFIX)))
+        await session.commit()
+    await drop_bench_user()
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.main import app
+    
+    app.add_api_route("/bench/legacy-lessons", legacy_list_lessons, methods=["GET"])
+    
+    user_id = await ensure_bench_user()
+    await seed(user_id, args.lessons, args.max_exercises)
+    try:
+        async with admin_client(user_id) as client:
+            params = {"limit": args.page_size}
+            
+            async def before():
+                (await client.get("/bench/legacy-lessons", params=params)).raise_for_status()
+            
+            async def after():
+                (await client.get("/admin/lessons/", params=params)).raise_for_status()
+            
+            print(f"lessons={args.lessons} page_size={args.page_size}")
+            report("before (count per lesson)", await time_async(before, args.iterations))
+            report("after (correlated count)", await time_async(after, args.iterations))
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lessons", type=int, default=5000)
+    parser.add_argument("--max-exercises", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
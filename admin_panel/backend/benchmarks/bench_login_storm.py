@@ -0,0 +1,159 @@
+"""
+Load test: latency of unrelated endpoints during a login storm.
+
+Runs the app under uvicorn in a subprocess and probes GET /health and
+GET /admin/lessons/ while concurrent clients hammer a login endpoint, first
+with the legacy inline bcrypt check and then with the pooled hasher behind
+POST /admin/auth/login. With inline hashing every probe waits behind whole
+bcrypt rounds; with the pool it should stay near the idle baseline, and
+logins beyond the queue limit are shed with 503.
+
+Usage:
+    python benchmarks/bench_login_storm.py --clients 32 --seconds 5
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+from common import BENCH_EMAIL, BENCH_PASSWORD, drop_bench_user, ensure_bench_user, report
+
+import httpx
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.admin.auth import LoginRequest
+from app.core.database import get_db
+from app.core.security import create_access_token, verify_password
+from app.models.user import User
+
+
+async def legacy_login(credentials: LoginRequest, db: AsyncSession = Depends(get_db)):
+    """The credential check of the previous admin_login, hashing inline."""
+    result = await db.execute(select(User).where(User.email == credentials.email))
+    user = result.scalar_one_or_none()
+    if not user or not verify_password(credentials.password, user.hashed_password):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return {"id": user.id}
+
+
+def serve(port: int) -> None:
+    import uvicorn
+    from app.main import app
+    
+    app.add_api_route("/bench/legacy-login", legacy_login, methods=["POST"])
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            (await client.get("/health")).raise_for_status()
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def probe(client: httpx.AsyncClient, path: str, seconds: float) -> List[float]:
+    """Sequential GETs of path for a while, returning latencies in milliseconds."""
+    samples = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        (await client.get(path)).raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def storm(client: httpx.AsyncClient, path: str, stop: asyncio.Event, outcomes: Counter) -> None:
+    """Post logins back to back until stop is set, honouring Retry-After."""
+    body = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+    while not stop.is_set():
+        response = await client.post(path, json=body)
+        outcomes[response.status_code] += 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+
+async def run_phase(
+    client: httpx.AsyncClient,
+    label: str,
+    login_path: str,
+    clients: int,
+    seconds: float,
+) -> Dict[int, int]:
+    stop = asyncio.Event()
+    outcomes: Counter = Counter()
+    stormers = [
+        asyncio.create_task(storm(client, login_path, stop, outcomes))
+        for _ in range(clients)
+    ]
+    await asyncio.sleep(0.5 if stormers else 0)  # let the storm build up
+    try:
+        report(f"{label}: /health", await probe(client, "/health", seconds))
+        report(f"{label}: list_lessons", await probe(client, "/admin/lessons/?limit=20", seconds))
+    finally:
+        stop.set()
+        await asyncio.gather(*stormers)
+    return dict(outcomes)
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    token = create_access_token({"sub": str(user_id), "role": "admin"})
+    server = subprocess.Popen([sys.executable, __file__, "--serve", str(args.port)])
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}",
+            headers={"Authorization": f"Bearer {token}"},
+            limits=httpx.Limits(max_connections=args.clients + 4),
+            timeout=120,
+        ) as client:
+            await wait_until_up(client)
+            await run_phase(client, "idle", "", 0, args.seconds)
+            
+            outcomes = await run_phase(
+                client, "inline bcrypt", "/bench/legacy-login", args.clients, args.seconds
+            )
+            print(f"  logins by status: {outcomes}")
+            
+            outcomes = await run_phase(
+                client, "hashing pool", "/admin/auth/login", args.clients, args.seconds
+            )
+            print(f"  logins by status: {outcomes}")
+            
+            metrics = (await client.get("/admin/metrics")).json()["password_hashing"]
+            print(
+                f"  pool: workers={metrics['workers']} queue_limit={metrics['queue_limit']} "
+                f"rejected={metrics['rejected']}"
+            )
+            for name in ("queue_wait", "hash_time"):
+                histogram = metrics[name]
+                print(
+                    f"  {name}: n={histogram['count']} p50<={histogram['p50_ms']}ms "
+                    f"p99<={histogram['p99_ms']}ms max={histogram['max_ms']}ms"
+                )
+    finally:
+        server.terminate()
+        server.wait()
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=5, help="probe time per endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    if parsed.serve:
+        serve(parsed.serve)
+    else:
+        asyncio.run(main(parsed))
@@ -0,0 +1,57 @@
+"""
+Benchmark the cost of a throttled login attempt.
+
+Compares a wrong-password login that runs the full path (user lookup and
+bcrypt verify) with one turned away by the login throttle, plus the cost
+of the throttle check alone for each backend.
+
+Usage:
+    python benchmarks/bench_login_throttle.py --iterations 200
+"""
+import argparse
+import asyncio
+
+from common import BENCH_EMAIL, admin_client, drop_bench_user, ensure_bench_user, report, time_async
+
+from app.services.login_throttle import (
+    DatabaseLoginThrottle,
+    MemoryLoginThrottle,
+    login_keys,
+    login_throttle,
+)
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    body = {"email": BENCH_EMAIL, "password": "not-the-password"}
+    keys = login_keys(BENCH_EMAIL, "127.0.0.1")
+    try:
+        async with admin_client(user_id) as client:
+            async def attempt(expected: int):
+                response = await client.post("/admin/auth/login", json=body)
+                assert response.status_code == expected, response.status_code
+            
+            async def full_attempt():
+                await login_throttle.reset(keys)
+                await attempt(401)
+            
+            report("failed login, full path", await time_async(full_attempt, args.iterations // 10))
+            
+            for _ in range(login_throttle.limit):
+                await client.post("/admin/auth/login", json=body)
+            report("failed login, throttled", await time_async(lambda: attempt(429), args.iterations))
+        
+        for backend in (MemoryLoginThrottle(max_keys=1000), DatabaseLoginThrottle()):
+            await backend.reset(keys)
+            samples = await time_async(lambda: backend.acquire(keys, 1, 3600), args.iterations)
+            report(f"{type(backend).__name__}.acquire (rejecting)", samples)
+            await backend.reset(keys)
+    finally:
+        await login_throttle.reset(keys)
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
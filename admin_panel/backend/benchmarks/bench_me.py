@@ -0,0 +1,48 @@
+"""
+Benchmark of GET /admin/auth/me with a real bearer token.
+
+Cold requests drop the user's cached profile first, so verify_admin_token
+and the handler load it from the database; cached requests are served
+without a query.
+
+Usage:
+    python benchmarks/bench_me.py --iterations 500
+"""
+import argparse
+import asyncio
+
+import httpx
+from common import drop_bench_user, ensure_bench_user, report, time_async
+
+from app.core.security import create_access_token
+from app.services.user_profiles import user_profiles
+
+
+async def main(args: argparse.Namespace) -> None:
+    from app.main import app
+    
+    user_id = await ensure_bench_user()
+    token = create_access_token({"sub": str(user_id), "role": "admin"})
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def me():
+                response = await client.get("/admin/auth/me", headers=headers)
+                response.raise_for_status()
+            
+            async def me_cold():
+                user_profiles.invalidate(user_id)
+                await me()
+            
+            report("/me cold profile", await time_async(me_cold, args.iterations))
+            report("/me cached profile", await time_async(me, args.iterations))
+    finally:
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of the per-statement cost of the query log.
+
+Times QueryLog.record for a statement below the slow threshold (aggregation
+only) and for one above it (aggregation plus a JSON log line), using the
+SQL of the admin lesson listing.
+
+Usage:
+    python benchmarks/bench_query_log.py --iterations 50000
+"""
+import argparse
+import logging
+
+from common import report
+from bench_decode_token import time_sync
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.query_log import QueryLog
+from app.models.lesson import Lesson
+
+
+def main(args: argparse.Namespace) -> None:
+    logging.getLogger("app.slow_query").addHandler(logging.NullHandler())
+    logging.getLogger("app.slow_query").propagate = False
+    
+    statement = str(
+        select(Lesson).where(Lesson.id.in_([1, 2, 3])).limit(50)
+        .compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True})
+    )
+    query_log = QueryLog(threshold_ms=100, sample_rate=0.0, max_fingerprints=1000)
+    
+    report(
+        "record (fast, aggregated)",
+        time_sync(lambda: query_log.record("primary", statement, (1, 2, 3, 50), False, 3, 0.4), args.iterations),
+        unit="us",
+    )
+    report(
+        "record (slow, logged)",
+        time_sync(lambda: query_log.record("primary", statement, (1, 2, 3, 50), False, 3, 150.0), args.iterations),
+        unit="us",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50000)
+    main(parser.parse_args())
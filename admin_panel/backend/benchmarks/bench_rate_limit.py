@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of the rate limiting middleware's per-request overhead.
+
+Drives RateLimitMiddleware around a no-op ASGI app and subtracts the cost of
+calling the app directly, for anonymous requests (keyed by IP) and requests
+with an already verified bearer token (keyed by subject).
+
+Usage:
+    python benchmarks/bench_rate_limit.py --requests 20000
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from common import report
+
+from app.core.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from app.core.security import create_access_token, decode_token
+
+
+BATCH = 100
+
+
+async def noop_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message) -> None:
+    pass
+
+
+def make_scope(client_ip: str, token: str = "") -> dict:
+    headers = [(b"host", b"bench"), (b"accept", b"application/json")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return {"type": "http", "path": "/admin/lessons/", "headers": headers, "client": (client_ip, 5000)}
+
+
+async def per_request_us(app, scopes: List[dict], requests: int) -> List[float]:
+    """Mean microseconds per request, one sample per batch."""
+    samples = []
+    for start in range(0, requests, BATCH):
+        began = time.perf_counter()
+        for n in range(start, start + BATCH):
+            await app(scopes[n % len(scopes)], receive, send)
+        samples.append((time.perf_counter() - began) / BATCH * 1_000_000)
+    return samples
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Large enough that no bench request is ever limited
+    limiter = TokenBucketLimiter(requests_per_minute=10**9)
+    middleware = RateLimitMiddleware(noop_app, limiter)
+    
+    token = create_access_token({"sub": "1", "role": "admin"})
+    decode_token(token)  # verified once, as the first admin request would
+    
+    cases = {
+        "anonymous, 1 IP": [make_scope("10.0.0.1")],
+        "anonymous, 10k IPs": [make_scope(f"10.{n // 256 % 256}.{n % 256}.1") for n in range(10_000)],
+        "verified bearer token": [make_scope("10.0.0.1", token)],
+    }
+    for label, scopes in cases.items():
+        baseline = await per_request_us(noop_app, scopes, args.requests)
+        limited = await per_request_us(middleware, scopes, args.requests)
+        report(f"no middleware, {label}", baseline, unit="us")
+        report(f"middleware, {label}", limited, unit="us")
+    limiter.stop_sweeping()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Benchmark read endpoints on get_read_db against the committing get_db.
+
+The baseline overrides get_read_db with get_db, which wraps each request in
+BEGIN ... COMMIT on the primary. Round trips are counted per request:
+statements from SQLAlchemy, transaction control from asyncpg's query log.
+With DATABASE_REPLICA_URL set, the read path sends nothing to the primary.
+
+Usage:
+    python benchmarks/bench_read_db.py --lessons 2000 --iterations 300
+"""
+import argparse
+import asyncio
+from collections import Counter
+
+from common import admin_client, ensure_bench_user, report, time_async
+from bench_list_lessons import SLUG_PREFIX, cleanup, seed
+
+from sqlalchemy import event, select
+
+from app.core.database import AsyncSessionLocal, engine, get_db, get_read_db, replica_engine
+from app.models.lesson import Lesson
+
+
+round_trips: Counter = Counter()
+
+
+def count_round_trips(async_engine, name: str) -> None:
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def log_transaction_control(dbapi_connection, connection_record):
+        dbapi_connection._connection.add_query_logger(
+            lambda record: round_trips.update([name])
+        )
+    
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        round_trips[name] += 1
+
+
+async def main(args: argparse.Namespace) -> None:
+    count_round_trips(engine, "primary")
+    if replica_engine is not None:
+        count_round_trips(replica_engine, "replica")
+    
+    user_id = await ensure_bench_user()
+    await seed(user_id, args.lessons, max_exercises=10)
+    async with AsyncSessionLocal() as session:
+        lesson_id = (await session.execute(
+            select(Lesson.id).where(Lesson.slug.startswith(SLUG_PREFIX)).limit(1)
+        )).scalar_one()
+    
+    paths = {
+        "list": "/admin/lessons/?limit=50",
+        "page": "/admin/lessons/page?limit=50",
+        "detail": f"/admin/lessons/{lesson_id}",
+        "changes": "/lessons/changes?limit=50",
+    }
+    
+    try:
+        async with admin_client(user_id) as client:
+            from app.main import app
+            
+            for mode in ("get_db", "get_read_db"):
+                if mode == "get_db":
+                    app.dependency_overrides[get_read_db] = get_db
+                else:
+                    app.dependency_overrides.pop(get_read_db, None)
+                
+                for name, path in paths.items():
+                    async def fetch():
+                        response = await client.get(path)
+                        response.raise_for_status()
+                    
+                    samples = await time_async(fetch, args.iterations)
+                    round_trips.clear()
+                    await fetch()
+                    trips = ", ".join(f"{key}={value}" for key, value in sorted(round_trips.items()))
+                    report(f"{name} {mode}", samples)
+                    print(f"{'':<40} round trips per request: {trips}")
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lessons", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=300)
+    asyncio.run(main(parser.parse_args()))
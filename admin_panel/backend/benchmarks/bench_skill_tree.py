@@ -0,0 +1,138 @@
+"""
+Benchmark GET /admin/skills/tree and guard its query count.
+
+Fails if building a tree takes more than the expected fixed number of
+queries, so N+1 regressions show up regardless of tree size.
+
+Usage:
+    python benchmarks/bench_skill_tree.py --skills 40 --lessons-per-skill 25
+"""
+import argparse
+import asyncio
+from contextlib import contextmanager
+
+from common import admin_client, drop_bench_user, ensure_bench_user, report, time_async
+
+from sqlalchemy import delete, event, insert, select
+
+from app.api.admin import skills
+from app.api.admin.skills import SkillTreeCache
+from app.core.database import AsyncSessionLocal, engine
+from app.models.lesson import Exercise, ExerciseType, LanguagePair, Lesson, LessonLevel, Skill
+
+
+SLUG_PREFIX = "bench-tree-"
+LANGUAGE_PAIR = LanguagePair.EN_AM
+
+# Cache check (1) + skills, lessons, exercise counts (3)
+EXPECTED_BUILD_QUERIES = 4
+EXPECTED_CACHED_QUERIES = 1
+
+
+@contextmanager
+def count_queries():
+    """Count statements sent to the database inside the block."""
+    counter = {"count": 0}
+    
+    def before_cursor_execute(*args):
+        counter["count"] += 1
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def seed(user_id: int, skill_count: int, lessons_per_skill: int, exercises: int) -> None:
+    async with AsyncSessionLocal() as session:
+        skill_ids = (await session.execute(
+            insert(Skill).returning(Skill.id),
+            [
+                {
+                    "name": f"Benchmark skill {i}",
+                    "order": i,
+                    "language_pair": LANGUAGE_PAIR,
+                    "level": LessonLevel.BEGINNER,
+                }
+                for i in range(skill_count)
+            ],
+        )).scalars().all()
+        await session.execute(insert(Lesson), [
+            {
+                "title": f"Benchmark lesson {skill_id}-{n}",
+                "slug": f"{SLUG_PREFIX}{skill_id}-{n}",
+                "language_pair": LANGUAGE_PAIR,
+                "level": LessonLevel.BEGINNER,
+                "skill_id": skill_id,
+                "lesson_number": n,
+                "created_by": user_id,
+            }
+            for skill_id in skill_ids
+            for n in range(lessons_per_skill)
+        ])
+        lesson_ids = (await session.execute(
+            select(Lesson.id).where(Lesson.slug.startswith(SLUG_PREFIX))
+        )).scalars().all()
+        await session.execute(insert(Exercise), [
+            {
+                "lesson_id": lesson_id,
+                "type": ExerciseType.MULTIPLE_CHOICE,
+                "question": f"Question {n}",
+                "answer_data": {"options": ["ሰላም", "ቡና"], "correct": 0},
+                "order": n,
+            }
+            for lesson_id in lesson_ids
+            for n in range(exercises)
+        ])
+        await session.commit()
+
+
+async def cleanup() -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Lesson).where(Lesson.slug.startswith(SLUG_PREFIX)))
+        await session.execute(delete(Skill).where(Skill.name.startswith("Benchmark skill ")))
+        await session.commit()
+    await drop_bench_user()
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    await seed(user_id, args.skills, args.lessons_per_skill, args.exercises)
+    try:
+        async with admin_client(user_id) as client:
+            params = {"language_pair": LANGUAGE_PAIR.value}
+            
+            async def cold():
+                # A fresh cache, so the tree is built again
+                skills.skill_tree_cache = SkillTreeCache()
+                (await client.get("/admin/skills/tree", params=params)).raise_for_status()
+            
+            async def cached():
+                (await client.get("/admin/skills/tree", params=params)).raise_for_status()
+            
+            with count_queries() as build_queries:
+                await cold()
+            with count_queries() as cached_queries:
+                await cached()
+            
+            print(
+                f"skills={args.skills} lessons={args.skills * args.lessons_per_skill} "
+                f"queries: build={build_queries['count']} cached={cached_queries['count']}"
+            )
+            assert build_queries["count"] == EXPECTED_BUILD_QUERIES, build_queries
+            assert cached_queries["count"] == EXPECTED_CACHED_QUERIES, cached_queries
+            
+            report("cold (build tree)", await time_async(cold, args.iterations))
+            report("cached", await time_async(cached, args.iterations))
+    finally:
+        await cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skills", type=int, default=40)
+    parser.add_argument("--lessons-per-skill", type=int, default=25)
+    parser.add_argument("--exercises", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
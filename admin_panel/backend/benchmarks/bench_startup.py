@@ -0,0 +1,99 @@
+"""
+Benchmark worker cold start, from interpreter start to the first request.
+
+Each run is a fresh interpreter that times importing the settings, creating
+the engines, importing the app, running the lifespan startup and serving a
+first database-backed request. The legacy mode starts up with create_all
+(which checks every table) in place of the Alembic revision check.
+
+The database must be migrated to head (alembic upgrade head).
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from common import report
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import asyncio, json, sys, time
+import httpx  # The benchmark's client, not part of the app's start
+phases = {}
+
+def mark(name):
+    global started
+    now = time.perf_counter()
+    phases[name] = (now - started) * 1000
+    started = now
+
+started = time.perf_counter()
+
+from app.core.config import settings
+mark("settings")
+from app.core import database
+mark("engines")
+import app.main
+mark("import app")
+if sys.argv[1] == "legacy":
+    app.main.check_schema_version = database.init_db
+
+async def main():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        mark("startup")
+        transport = httpx.ASGITransport(app=app.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/lessons/changes?limit=1")
+            response.raise_for_status()
+        mark("first request")
+
+asyncio.run(main())
+print(json.dumps(phases))
+"""
+
+
+def run(mode: str) -> Dict[str, float]:
+    wall_started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    phases = json.loads(output.strip().splitlines()[-1])
+    phases["total (process)"] = (time.perf_counter() - wall_started) * 1000
+    phases["total (in-process)"] = sum(
+        value for phase, value in phases.items() if not phase.startswith("total")
+    )
+    return phases
+
+
+def main(args: argparse.Namespace) -> None:
+    modes = ("legacy", "schema-check")
+    samples: Dict[str, Dict[str, List[float]]] = {mode: {} for mode in modes}
+    # Alternate modes so drift in machine load affects both alike
+    for _ in range(args.runs):
+        for mode in modes:
+            for phase, value in run(mode).items():
+                samples[mode].setdefault(phase, []).append(value)
+    
+    for mode in modes:
+        for phase, values in samples[mode].items():
+            report(f"{mode}: {phase}", values)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark of the revoked token check.
+
+Fills a RevocationStore with --revoked jtis, then times is_revoked for tokens
+that were never revoked (answered by the Bloom filter alone) and for revoked
+ones (confirmed against the exact set). Also reports the Bloom filter's
+observed false positive rate over the never-revoked lookups.
+
+Usage:
+    python benchmarks/bench_token_revocation.py --revoked 100000
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from common import report
+from bench_decode_token import time_sync
+
+from app.services.token_revocation import RevocationStore
+
+
+def main(args: argparse.Namespace) -> None:
+    store = RevocationStore(capacity=args.revoked, error_rate=args.error_rate, sync_interval=60)
+    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
+    revoked = [uuid4().hex for _ in range(args.revoked)]
+    for jti in revoked:
+        store._add(jti, expires_at)
+    
+    fresh = [uuid4().hex for _ in range(args.iterations)]
+    fresh_iter = iter(fresh * 2)
+    revoked_iter = iter(revoked * (args.iterations // len(revoked) + 2))
+    
+    report("is_revoked (never revoked)", time_sync(lambda: store.is_revoked(next(fresh_iter)), args.iterations), unit="us")
+    report("is_revoked (revoked)", time_sync(lambda: store.is_revoked(next(revoked_iter)), args.iterations), unit="us")
+    
+    false_positives = sum(jti in store._bloom for jti in fresh)
+    metrics = store.metrics()
+    print(f"bloom: {metrics['bloom_bits'] // 8 / 1024:.0f} KiB, {metrics['bloom_hashes']} hashes, "
+          f"false positive rate {false_positives / len(fresh):.4%}")
+    exact_bytes = sys.getsizeof(store._revoked) + sum(sys.getsizeof(jti) for jti in revoked)
+    print(f"exact set: {exact_bytes / 1024:.0f} KiB for {len(revoked)} jtis")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--revoked", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--error-rate", type=float, default=0.001)
+    main(parser.parse_args())
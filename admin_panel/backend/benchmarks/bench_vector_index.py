@@ -0,0 +1,127 @@
+"""
+Export, refresh and search latency of the in-process vector index.
+
+Loads --vectors synthetic embeddings the same way bench_vector_search does
+(without the HNSW index, which the in-process index doesn't need), exports
+them into a scratch VECTOR_INDEX_DIR, then reports:
+
+    export        first refresh, writing every vector
+    refresh       refresh after --added new vectors, and with nothing new
+    search        index.search for one query and per query in a batch of
+                  --batch-queries, unfiltered and restricted to 10% of sources
+    memory_search end to end, including the exact re-rank in Postgres
+
+with recall@k of the raw int8 ranking and of memory_search against exact
+search in Postgres.
+
+Usage:
+    python benchmarks/bench_vector_index.py --vectors 100000
+"""
+import argparse
+import asyncio
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from common import drop_bench_user, ensure_bench_user, report
+
+import numpy as np
+from sqlalchemy import delete, select
+
+from bench_vector_search import DIMENSIONS, HNSW_INDEX, load, sample
+from app.core.database import AsyncSessionLocal, engine
+from app.models.rag import KnowledgeSource
+from app.services import knowledge_search
+from app.services.knowledge_search import exact_search, memory_search
+from app.services.vector_index import VectorIndex
+
+
+def timed(fn, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((args.clusters, DIMENSIONS)).astype(np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    directory = tempfile.mkdtemp(prefix="vector-index-")
+    index = VectorIndex(directory, DIMENSIONS, refresh_interval=0)
+    knowledge_search.vector_index = index
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: HNSW_INDEX.drop(sync_conn, checkfirst=True))
+    try:
+        await load(args, user_id, centres)
+        started = time.perf_counter()
+        await index.refresh()
+        print(f"exported {index.rows} vectors in {time.perf_counter() - started:.2f}s")
+        size = sum(path.stat().st_size for path in Path(directory).iterdir())
+        print(f"index files {size / 2**20:.1f} MiB (float32 would be {index.rows * DIMENSIONS * 4 / 2**20:.1f} MiB)")
+        
+        await load(argparse.Namespace(**{**vars(args), "vectors": args.added}), user_id, centres)
+        started = time.perf_counter()
+        await index.refresh()
+        print(f"refreshed {args.added} new vectors in {(time.perf_counter() - started) * 1000:.1f}ms")
+        started = time.perf_counter()
+        await index.refresh()
+        print(f"refreshed nothing new in {(time.perf_counter() - started) * 1000:.1f}ms")
+        
+        async with AsyncSessionLocal() as db:
+            source_ids = (await db.scalars(select(KnowledgeSource.id).where(KnowledgeSource.created_by == user_id))).all()
+        narrow = source_ids[::10]
+        queries = sample(rng, centres, args.queries, args.spread)
+        batch = queries[:args.batch_queries]
+        
+        print()
+        report("search 1 query", timed(lambda: index.search(queries[0], args.k), args.iterations))
+        report("search 1 query, 10% of sources", timed(lambda: index.search(queries[0], args.k, narrow), args.iterations))
+        per_query = [
+            sample_ms / len(batch)
+            for sample_ms in timed(lambda: index.search(batch, args.k), args.iterations)
+        ]
+        report(f"search batch of {len(batch)}, per query", per_query)
+        
+        recalls, reranked, latencies = [], [], []
+        for vector in queries:
+            async with AsyncSessionLocal() as db:
+                truth = set(await exact_search(db, vector, args.k))
+            found = {embedding_id for embedding_id, _, _ in index.search(vector, args.k)[0]}
+            recalls.append(len(found & truth) / max(1, len(truth)))
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                result = await memory_search(db, vector, args.k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            reranked.append(len({hit.embedding_id for hit in result.hits} & truth) / max(1, len(truth)))
+        report("memory_search", latencies)
+        print(f"recall@{args.k}: int8 ranking {statistics.fmean(recalls):.3f}, "
+              f"memory_search {statistics.fmean(reranked):.3f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(KnowledgeSource).where(KnowledgeSource.created_by == user_id))
+            await session.commit()
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: HNSW_INDEX.create(sync_conn, checkfirst=True))
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--added", type=int, default=1000)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=0.03)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--batch-queries", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=10_000)
+    asyncio.run(main(parser.parse_args()))
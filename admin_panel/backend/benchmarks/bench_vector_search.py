@@ -0,0 +1,197 @@
+"""
+Recall vs latency of knowledge base vector search.
+
+Loads --vectors synthetic 1536-dim embeddings (unit vectors scattered
+around --clusters centres) into kb_embeddings, builds the HNSW index, and
+then for each filter scenario and each --ef value times search_chunks and
+measures its recall@k against exact search over the same filter:
+
+    all       active sources only
+    narrow    a category holding ~10% of the chunks
+    rare      a category holding ~1% of the chunks
+
+The HNSW index is dropped for the load and rebuilt afterwards, which is
+much faster than maintaining it row by row. The full 1M-vector corpus
+needs about 6 GB for the table and 8 GB of maintenance_work_mem to build
+the graph in memory; use --vectors to scale down on smaller machines.
+
+Usage:
+    python benchmarks/bench_vector_search.py --vectors 1000000 --ef 10,20,40,80,160,320
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+from common import drop_bench_user, ensure_bench_user, report
+
+import asyncpg
+import numpy as np
+from pgvector.asyncpg import register_vector
+from sqlalchemy import delete, text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.models.rag import KnowledgeEmbedding, KnowledgeSource
+from app.services.knowledge_search import exact_search, search_chunks
+
+
+DIMENSIONS = 1536
+CHUNKS_PER_SOURCE = 50
+HNSW_INDEX = next(
+    index for index in KnowledgeEmbedding.__table__.indexes
+    if index.name == "ix_kb_embeddings_embedding_hnsw"
+)
+SCENARIOS = {"all": None, "narrow": "bench-narrow", "rare": "bench-rare"}
+
+
+def category_for(source_number: int) -> str:
+    bucket = source_number % 100
+    if bucket == 0:
+        return "bench-rare"
+    if bucket <= 10:
+        return "bench-narrow"
+    return "bench-common"
+
+
+def sample(rng: np.random.Generator, centres: np.ndarray, count: int, spread: float) -> np.ndarray:
+    """Unit vectors near randomly chosen centres."""
+    chosen = centres[rng.integers(0, len(centres), count)]
+    vectors = chosen + spread * rng.standard_normal((count, DIMENSIONS)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+async def load(args: argparse.Namespace, user_id: int, centres: np.ndarray) -> None:
+    rng = np.random.default_rng(1)
+    conn = await asyncpg.connect(settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"))
+    try:
+        await register_vector(conn)
+        source_count = -(-args.vectors // CHUNKS_PER_SOURCE)
+        source_ids = await conn.fetch(
+            """
+            INSERT INTO kb_sources (title, content, category, language, source_type, is_active, is_indexed, created_by)
+            SELECT 'Benchmark source ' || n, '', ($1::text[])[n + 1], ($2::text[])[n % 2 + 1], 'manual', true, true, $3
+            FROM generate_series(0, $4 - 1) AS n
+            ORDER BY n
+            RETURNING id
+            """,
+            [category_for(n) for n in range(source_count)],
+            ["am", "en"],
+            user_id,
+            source_count,
+        )
+        ids = [row["id"] for row in source_ids]
+        
+        loaded = 0
+        while loaded < args.vectors:
+            count = min(args.batch, args.vectors - loaded)
+            vectors = sample(rng, centres, count, args.spread)
+            records = [
+                (
+                    ids[(loaded + i) // CHUNKS_PER_SOURCE],
+                    f"chunk {loaded + i}",
+                    (loaded + i) % CHUNKS_PER_SOURCE,
+                    vectors[i],
+                    "bench",
+                )
+                for i in range(count)
+            ]
+            await conn.copy_records_to_table(
+                "kb_embeddings",
+                records=records,
+                columns=["source_id", "chunk_text", "chunk_index", "embedding", "model_name"],
+            )
+            loaded += count
+    finally:
+        await conn.close()
+
+
+async def build_index(maintenance_work_mem: str) -> float:
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SET LOCAL maintenance_work_mem = '{maintenance_work_mem}'"))
+        await conn.run_sync(lambda sync_conn: HNSW_INDEX.create(sync_conn, checkfirst=True))
+        await conn.execute(text("ANALYZE kb_embeddings"))
+        await conn.execute(text("ANALYZE kb_sources"))
+    return time.perf_counter() - started
+
+
+async def ann_plan(vector: np.ndarray, category) -> str:
+    """Scan nodes of the ANN query's plan."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SET LOCAL hnsw.ef_search = 40"))
+        literal = "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+        filters = "s.is_active" + (f" AND s.category = '{category}'" if category else "")
+        rows = (await db.execute(text(
+            "EXPLAIN SELECT e.id FROM kb_embeddings e JOIN kb_sources s ON s.id = e.source_id "
+            f"WHERE {filters} ORDER BY e.embedding <=> '{literal}' LIMIT 10"
+        ))).scalars().all()
+    scans = [line.strip().lstrip("-> ").split("  ")[0] for line in rows if "Scan" in line]
+    return "; ".join(scans)
+
+
+async def run_scenarios(args: argparse.Namespace, queries: np.ndarray) -> None:
+    for scenario, category in SCENARIOS.items():
+        truth = []
+        exact_ms = []
+        for vector in queries:
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                truth.append(set(await exact_search(db, vector, args.k, category=category)))
+            exact_ms.append((time.perf_counter() - started) * 1000)
+        
+        print(f"\n{scenario}: plan {await ann_plan(queries[0], category)}")
+        report(f"{scenario} exact", exact_ms)
+        for ef in (int(value) for value in args.ef.split(",")):
+            latencies, recalls, widened, strategies = [], [], [], Counter()
+            for vector, expected in zip(queries, truth):
+                started = time.perf_counter()
+                async with AsyncSessionLocal() as db:
+                    result = await search_chunks(db, vector, args.k, category=category, ef_search=ef)
+                latencies.append((time.perf_counter() - started) * 1000)
+                found = {hit.embedding_id for hit in result.hits}
+                recalls.append(len(found & expected) / max(1, len(expected)))
+                widened.append(result.ef_search)
+                strategies[result.strategy] += 1
+            report(f"{scenario} ef_search={ef}", latencies)
+            print(f"{'':<40} recall@{args.k}={statistics.fmean(recalls):.3f}  "
+                  f"mean ef_search used={statistics.fmean(widened):.0f}  "
+                  + ", ".join(f"{name}={count}" for name, count in sorted(strategies.items())))
+
+
+async def main(args: argparse.Namespace) -> None:
+    user_id = await ensure_bench_user()
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((args.clusters, DIMENSIONS)).astype(np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: HNSW_INDEX.drop(sync_conn, checkfirst=True))
+    try:
+        started = time.perf_counter()
+        await load(args, user_id, centres)
+        print(f"loaded {args.vectors} vectors in {time.perf_counter() - started:.1f}s")
+        print(f"built HNSW index in {await build_index(args.maintenance_work_mem):.1f}s")
+        
+        await run_scenarios(args, sample(rng, centres, args.queries, args.spread))
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(KnowledgeSource).where(KnowledgeSource.created_by == user_id))
+            await session.commit()
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: HNSW_INDEX.create(sync_conn, checkfirst=True))
+        await drop_bench_user()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=0.03)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--ef", default="10,20,40,80,160,320")
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--maintenance-work-mem", default="8GB")
+    asyncio.run(main(parser.parse_args()))
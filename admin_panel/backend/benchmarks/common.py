@@ -0,0 +1,108 @@
+"""
+Shared helpers for the backend benchmarks.
+
+Benchmarks run against the database configured by DATABASE_URL and clean up
+the rows they seed. Point them at a scratch database, never production.
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, List
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Benchmarks drive many requests from one client; don't rate limit them
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+
+import httpx
+from sqlalchemy import delete, select
+
+from app.core.database import AsyncSessionLocal, init_db
+from app.core.security import hash_password, verify_admin_token
+from app.models import user, lesson, subscription, rag  # noqa: F401  Register all models
+from app.models.user import User, UserRole, UserStatus
+
+
+BENCH_EMAIL = "benchmark-admin@example.com"
+BENCH_PASSWORD = "benchmark-password"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(label: str, samples: List[float], unit: str = "ms") -> None:
+    """Print p50/p99/mean for a list of timings."""
+    print(
+        f"{label:<40} n={len(samples):<6} "
+        f"p50={percentile(samples, 50):9.3f}{unit} "
+        f"p99={percentile(samples, 99):9.3f}{unit} "
+        f"mean={statistics.fmean(samples):9.3f}{unit}"
+    )
+
+
+async def time_async(
+    fn: Callable[[], Awaitable[object]],
+    iterations: int,
+    warmup: int = 5,
+) -> List[float]:
+    """Run an async callable repeatedly and return timings in milliseconds."""
+    for _ in range(warmup):
+        await fn()
+    
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def ensure_bench_user() -> int:
+    """Create (or reuse) the admin user that owns seeded rows."""
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User).where(User.email == BENCH_EMAIL))
+        admin = result.scalar_one_or_none()
+        if admin is None:
+            admin = User(
+                email=BENCH_EMAIL,
+                hashed_password=hash_password(BENCH_PASSWORD),
+                full_name="Benchmark Admin",
+                role=UserRole.ADMIN,
+                status=UserStatus.ACTIVE,
+            )
+            session.add(admin)
+            await session.commit()
+        return admin.id
+
+
+async def drop_bench_user() -> None:
+    """Remove the benchmark admin user."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.email == BENCH_EMAIL))
+        await session.commit()
+
+
+@asynccontextmanager
+async def admin_client(user_id: int) -> AsyncIterator[httpx.AsyncClient]:
+    """In-process HTTP client with admin auth stubbed out."""
+    from app.main import app
+    
+    app.dependency_overrides[verify_admin_token] = lambda: {
+        "sub": str(user_id),
+        "role": "admin",
+    }
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(verify_admin_token, None)
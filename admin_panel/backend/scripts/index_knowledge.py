@@ -0,0 +1,34 @@
+"""
+Script to embed knowledge base sources.
+Indexes every active source not yet indexed; --all re-indexes every source,
+re-embedding only chunks whose text or model changed.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models import user, lesson, subscription, rag  # noqa: F401  Register all models
+from app.services.knowledge_indexing import create_indexer
+
+
+async def index_knowledge(args: argparse.Namespace):
+    """Run the indexer and print its counters"""
+    
+    indexer = create_indexer()
+    if args.all:
+        stats = await indexer.reindex_all()
+    else:
+        stats = await indexer.index_pending(limit=args.limit)
+    print(json.dumps(stats.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--all", action="store_true", help="re-index every active source")
+    parser.add_argument("--limit", type=int, help="index at most this many sources")
+    asyncio.run(index_knowledge(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""
+Shared fixtures for the backend tests.
+
+Tests run against the database configured by DATABASE_URL (like the
+benchmarks) and clean up the rows they seed.
+"""
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models import user, lesson, subscription, rag  # noqa: F401  Register all models
+from app.models.user import User, UserRole, UserStatus
+
+
+TEST_EMAIL = "test-admin@example.com"
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def dispose_engine():
+    """Close pooled connections, which are bound to each test's event loop."""
+    yield
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def admin_user() -> int:
+    """Id of an admin user that owns seeded rows."""
+    async with AsyncSessionLocal() as session:
+        admin = User(
+            email=TEST_EMAIL,
+            hashed_password="not-a-real-hash",
+            full_name="Test Admin",
+            role=UserRole.ADMIN,
+            status=UserStatus.ACTIVE,
+        )
+        session.add(admin)
+        await session.commit()
+        user_id = admin.id
+    yield user_id
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager counting statements sent to the database inside it."""
+    @contextmanager
+    def counting():
+        counter = {"count": 0}
+        
+        def before_cursor_execute(*args):
+            counter["count"] += 1
+        
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    
+    return counting
@@ -0,0 +1,51 @@
+"""
+Line splitting of streamed NDJSON lesson imports.
+"""
+import pytest
+
+from app.api.admin import lessons
+
+
+class StreamedRequest:
+    """Stands in for a Request whose body arrives in the given chunks"""
+    
+    def __init__(self, *chunks: bytes) -> None:
+        self.chunks = chunks
+    
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+async def read_lines(*chunks: bytes) -> list:
+    return [item async for item in lessons._iter_ndjson_lines(StreamedRequest(*chunks))]
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks():
+    assert await read_lines(b'{"a": 1}\n{"b"', b': "\xe1\x88\xb0"}\n\n{"c": 3}') == [
+        (1, '{"a": 1}', None),
+        (2, '{"b": "ሰ"}', None),
+        (4, '{"c": 3}', None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invalid_utf8_is_reported_per_line():
+    assert await read_lines(b'{"a": 1}\n{"b": "\xff"}\n{"c": 3}\n') == [
+        (1, '{"a": 1}', None),
+        (2, None, "invalid UTF-8"),
+        (3, '{"c": 3}', None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_oversize_lines_are_reported_without_buffering(monkeypatch):
+    monkeypatch.setattr(lessons, "BULK_MAX_LINE_BYTES", 16)
+    too_long = "Line longer than 16 bytes"
+    assert await read_lines(b"0123456789", b"0123456789", b"0123456789\n", b'{"a": 1}\n', b"x" * 40) == [
+        (1, None, too_long),
+        (2, '{"a": 1}', None),
+        (3, None, too_long),
+    ]
+    assert await read_lines(b"x" * 20 + b'\n{"a": 1}') == [(1, None, too_long), (2, '{"a": 1}', None)]
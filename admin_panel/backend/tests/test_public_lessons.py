@@ -0,0 +1,26 @@
+"""
+Content negotiation of the published catalog.
+"""
+import pytest
+
+from app.api.public.lessons import _accepts_gzip
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", False),
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("deflate, GZIP;q=0.5", True),
+    ("x-gzip", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    ("br, gzip;q=0", False),
+    ("*;q=0", False),
+    ("*, gzip;q=0", False),
+    ("br", False),
+    ("gzip;q=0.5, identity", False),
+    ("gzip;q=bogus", False),
+])
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
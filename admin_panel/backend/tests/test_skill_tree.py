@@ -0,0 +1,114 @@
+"""
+Query counts of the admin skill tree.
+
+Building a tree takes a fixed number of queries however large it is, so an
+N+1 regression (a lazy load per skill or lesson) fails here.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert, select, update
+
+from app.api.admin.skills import SkillTreeCache, build_skill_tree
+from app.core.database import AsyncSessionLocal
+from app.models.lesson import Exercise, ExerciseType, LanguagePair, Lesson, LessonLevel, Skill
+
+
+SLUG_PREFIX = "test-tree-"
+SKILL_PREFIX = "Test tree skill "
+LANGUAGE_PAIR = LanguagePair.EN_AM
+
+# Skills, their lessons (selectin loaded) and exercise counts
+BUILD_QUERIES = 3
+# The version check (change watermark and skill fingerprint)
+CACHED_QUERIES = 1
+
+
+@pytest_asyncio.fixture
+async def skill_tree(admin_user):
+    """Seed 3 skills of 4 lessons with 2 exercises each."""
+    async with AsyncSessionLocal() as session:
+        skill_ids = (await session.scalars(
+            insert(Skill).returning(Skill.id),
+            [
+                {
+                    "name": f"{SKILL_PREFIX}{i}",
+                    "order": i,
+                    "language_pair": LANGUAGE_PAIR,
+                    "level": LessonLevel.BEGINNER,
+                }
+                for i in range(3)
+            ],
+        )).all()
+        await session.execute(insert(Lesson), [
+            {
+                "title": f"Test lesson {skill_id}-{n}",
+                "slug": f"{SLUG_PREFIX}{skill_id}-{n}",
+                "language_pair": LANGUAGE_PAIR,
+                "level": LessonLevel.BEGINNER,
+                "skill_id": skill_id,
+                "lesson_number": n,
+                "created_by": admin_user,
+            }
+            for skill_id in skill_ids
+            for n in range(4)
+        ])
+        lesson_ids = (await session.scalars(
+            select(Lesson.id).where(Lesson.slug.startswith(SLUG_PREFIX))
+        )).all()
+        await session.execute(insert(Exercise), [
+            {
+                "lesson_id": lesson_id,
+                "type": ExerciseType.MULTIPLE_CHOICE,
+                "question": f"Question {n}",
+                "answer_data": {"options": ["ሰላም", "ቡና"], "correct": 0},
+                "order": n,
+            }
+            for lesson_id in lesson_ids
+            for n in range(2)
+        ])
+        await session.commit()
+    yield set(skill_ids)
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(Lesson).where(Lesson.slug.startswith(SLUG_PREFIX)))
+        await session.execute(delete(Skill).where(Skill.id.in_(skill_ids)))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_build_skill_tree_query_count(skill_tree, count_queries):
+    async with AsyncSessionLocal() as db:
+        with count_queries() as queries:
+            tree = await build_skill_tree(db, LANGUAGE_PAIR)
+    
+    assert queries["count"] == BUILD_QUERIES
+    seeded = [node for node in tree.skills if node.id in skill_tree]
+    assert len(seeded) == 3
+    assert all(len(node.lessons) == 4 for node in seeded)
+    assert all(lesson.exercise_count == 2 for node in seeded for lesson in node.lessons)
+
+
+@pytest.mark.asyncio
+async def test_cached_skill_tree_query_count(skill_tree, count_queries):
+    cache = SkillTreeCache()
+    async with AsyncSessionLocal() as db:
+        with count_queries() as build:
+            built = await cache.get(db, LANGUAGE_PAIR)
+        with count_queries() as cached:
+            assert await cache.get(db, LANGUAGE_PAIR) is built
+    
+    assert build["count"] == CACHED_QUERIES + BUILD_QUERIES
+    assert cached["count"] == CACHED_QUERIES
+
+
+@pytest.mark.asyncio
+async def test_skill_edit_rebuilds_cached_tree(skill_tree):
+    cache = SkillTreeCache()
+    skill_id = min(skill_tree)
+    async with AsyncSessionLocal() as db:
+        await cache.get(db, LANGUAGE_PAIR)
+        # Skill writes aren't in the change log, e.g. an edit made in SQL
+        await db.execute(update(Skill).where(Skill.id == skill_id).values(name=f"{SKILL_PREFIX}renamed"))
+        await db.commit()
+        tree = await cache.get(db, LANGUAGE_PAIR)
+    
+    assert {node.id: node.name for node in tree.skills}[skill_id] == f"{SKILL_PREFIX}renamed"